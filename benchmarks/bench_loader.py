@@ -0,0 +1,98 @@
+"""Compare ``tmuxp load`` with the native loader on a throwaway tmux server.
+
+Usage, from the repository root (so ``muxdantic`` is importable)::
+
+    python -m benchmarks.bench_loader --windows 4 --panes 2 --repeat 5
+
+Each round writes a workspace with ``--windows`` windows of ``--panes`` panes,
+builds its session with both loaders on a private ``-L`` socket and kills it
+again. Prints one JSON object with the per-loader timings in seconds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from muxdantic.models import TmuxServerArgs
+from muxdantic.native_loader import load_native, plan_session
+from muxdantic.tmux import tmux, tmuxp
+from muxdantic.workspace import load_tmuxp_config
+
+
+def _workspace(directory: Path, windows: int, panes: int) -> Path:
+    cfg = {
+        "session_name": "bench",
+        "start_directory": str(directory),
+        "windows": [
+            {
+                "window_name": f"w{index}",
+                "layout": "tiled",
+                "panes": [f"echo pane {pane}" for pane in range(panes)],
+            }
+            for index in range(windows)
+        ],
+    }
+    path = directory / ".tmuxp.json"
+    path.write_text(json.dumps(cfg), encoding="utf-8")
+    return path
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--windows", type=int, default=4)
+    parser.add_argument("--panes", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--socket-name", default=f"muxdantic-bench-{os.getpid()}")
+    args = parser.parse_args(argv)
+
+    server = TmuxServerArgs(socket_name=args.socket_name)
+    # Running inside tmux must not make either loader talk to the outer server.
+    os.environ.pop("TMUX", None)
+
+    timings: dict[str, list[float]] = {"tmuxp": [], "native": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        workspace = _workspace(Path(tmp), args.windows, args.panes)
+        cfg = load_tmuxp_config(workspace)
+        if plan_session(cfg, workspace) is None:
+            print("native loader cannot plan the benchmark workspace", file=sys.stderr)
+            return 1
+
+        # A holder session keeps the server up between rounds, so neither loader pays server startup.
+        tmux(["new-session", "-d", "-s", "holder"], server)
+        try:
+            for _ in range(args.repeat):
+                for loader in ("tmuxp", "native"):
+                    started = time.perf_counter()
+                    if loader == "native":
+                        load_native(cfg, workspace, server)
+                    else:
+                        tmuxp(["load", "-d", "--yes", str(workspace)], server)
+                    timings[loader].append(time.perf_counter() - started)
+                    tmux(["kill-session", "-t", "=bench"], server)
+        finally:
+            subprocess.run(["tmux", *server.to_tmux_args(), "kill-server"], capture_output=True)
+
+    report = {
+        "windows": args.windows,
+        "panes": args.panes,
+        "repeat": args.repeat,
+        **{
+            loader: {"median_s": round(statistics.median(values), 4), "min_s": round(min(values), 4)}
+            for loader, values in timings.items()
+        },
+    }
+    report["speedup"] = round(report["tmuxp"]["median_s"] / report["native"]["median_s"], 1)
+    print(json.dumps(report))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,61 @@
+"""Small JSON state files kept under the muxdantic cache directory."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+_CACHE_ROOT = Path("~/.cache/muxdantic").expanduser()
+
+
+def cache_dir(namespace: str, *, cache_root: Path | None = None) -> Path:
+    """Return the directory holding one namespace of cached state."""
+
+    root = (cache_root or _CACHE_ROOT).expanduser()
+    return root / namespace
+
+
+def state_path_for(namespace: str, key: str, *, cache_root: Path | None = None) -> Path:
+    """Return a state file path whose name is a SHA1 of ``key``."""
+
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return cache_dir(namespace, cache_root=cache_root) / f"{digest}.json"
+
+
+def read_json(path: Path) -> dict[str, Any] | None:
+    """Read a JSON object, treating missing or corrupt files as absent."""
+
+    try:
+        loaded = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(loaded, dict):
+        return None
+    return loaded
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Write a text file so concurrent readers never see a partial file."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def write_json_atomic(path: Path, payload: dict[str, Any]) -> None:
+    """Write a JSON object so concurrent readers never see a partial file."""
+
+    write_text_atomic(path, json.dumps(payload))
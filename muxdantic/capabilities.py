@@ -0,0 +1,86 @@
+"""Feature flags derived from the installed tmux version.
+
+``tmux -V`` is run once per tmux binary: the answer is kept in memory and in
+the muxdantic cache directory, keyed by the binary's path and mtime, so an
+upgrade is picked up on the next call. Callers use the flags to pick the
+fastest strategy up front instead of trying it and falling back on an error.
+
+A version that cannot be determined (no tmux on ``PATH``, a ``master`` or
+distribution build without a release number) enables every flag; callers
+keep their error fallback for that case.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import subprocess
+from pathlib import Path
+from typing import NamedTuple
+
+from muxdantic.cache import read_json, state_path_for, write_json_atomic
+
+_VERSION_RE = re.compile(r"^(?:next-)?(\d+)\.(\d+)")
+_MEMO: dict[str, TmuxCapabilities] = {}
+
+
+class TmuxCapabilities(NamedTuple):
+    version: str
+
+    def at_least(self, major: int, minor: int) -> bool:
+        match = _VERSION_RE.match(self.version)
+        if match is None:
+            return True
+        return (int(match.group(1)), int(match.group(2))) >= (major, minor)
+
+    @property
+    def format_filters(self) -> bool:
+        """``list-panes``/``list-windows -f`` and the ``#{&&:}``/``#{||:}`` operators."""
+        return self.at_least(3, 1)
+
+    @property
+    def spawn_environment(self) -> bool:
+        """``-e KEY=VALUE`` on ``new-window`` and ``new-session``."""
+        return self.at_least(3, 0)
+
+
+def probe_version(binary: str) -> str:
+    """Return the version ``binary -V`` reports (``3.3a``), or ``""`` if it cannot be run."""
+    try:
+        completed = subprocess.run([binary, "-V"], capture_output=True, text=True)
+    except OSError:
+        return ""
+    if completed.returncode != 0:
+        return ""
+    _, _, version = completed.stdout.strip().partition(" ")
+    return version
+
+
+def tmux_capabilities(*, cache_root: Path | None = None) -> TmuxCapabilities:
+    """Return the capabilities of the ``tmux`` found on ``PATH``."""
+    binary = shutil.which("tmux")
+    if binary is None:
+        return TmuxCapabilities("")
+    try:
+        mtime_ns = os.stat(binary).st_mtime_ns
+    except OSError:
+        return TmuxCapabilities("")
+
+    key = f"{binary};mtime={mtime_ns}"
+    if key in _MEMO:
+        return _MEMO[key]
+
+    path = state_path_for("capabilities", key, cache_root=cache_root)
+    cached = read_json(path)
+    if cached is not None and isinstance(cached.get("version"), str):
+        capabilities = TmuxCapabilities(cached["version"])
+    else:
+        capabilities = TmuxCapabilities(probe_version(binary))
+        if capabilities.version:
+            try:
+                write_json_atomic(path, {"binary": binary, "version": capabilities.version})
+            except OSError:
+                pass
+    _MEMO[key] = capabilities
+    return capabilities
@@ -3,14 +3,27 @@
 from __future__ import annotations
 
 import argparse
+import glob
+import json
 import sys
 from pathlib import Path
 
-from muxdantic.ensure import ensure
-from muxdantic.errors import MuxdanticSubprocessError, MuxdanticUsageError
-from muxdantic.jobs import kill, list_jobs, run
+from pydantic import ValidationError
+
+from muxdantic.cache import write_text_atomic
+from muxdantic.ensure import ensure, ensure_many
+from muxdantic.errors import MuxdanticSubprocessError, MuxdanticTimeoutError, MuxdanticUsageError
+from muxdantic.fanout import DEFAULT_MAX_PARALLEL, fan_out, select_servers
+from muxdantic.graph import load_graph_file
+from muxdantic.jobs import attach_stats, capture, kill, list_jobs, run, run_graph
 from muxdantic.jsonio import print_error, print_json
-from muxdantic.models import EnsureRequest, RunRequest, TmuxServerArgs
+from muxdantic.logging import log_segments, raw_to_jsonl_records, tail_records
+from muxdantic.logsearch import grep_logs, merge_logs, parse_age, parse_since
+from muxdantic.metrics import build_report, read_sink_stats, render_prometheus
+from muxdantic.models import EnsureRequest, EnsureResult, JobInfo, KillResult, RunRequest, TmuxServerArgs
+from muxdantic.results import read_result
+from muxdantic.serverpool import gather_jobs, kill_pool_jobs, pool_servers, run_in_pool
+from muxdantic.workspace import expand_workspaces
 
 
 def _add_server_args(parser: argparse.ArgumentParser) -> None:
@@ -18,13 +31,45 @@ def _add_server_args(parser: argparse.ArgumentParser) -> None:
     parser.add_argument("-S", "--socket-path", dest="socket_path")
 
 
+def _add_fanout_server_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("-L", "--socket-name", dest="socket_name", action="append", default=[])
+    parser.add_argument("-S", "--socket-path", dest="socket_path", action="append", default=[])
+    parser.add_argument("--socket-glob")
+    parser.add_argument("--server-file")
+    parser.add_argument("--max-parallel", type=int, default=DEFAULT_MAX_PARALLEL)
+
+
+def _age_seconds(value: str, flag: str) -> float:
+    seconds = parse_age(value)
+    if seconds is None:
+        raise MuxdanticUsageError(f"{flag} expects an age like 30s/15m/2h/1d, got: {value}")
+    return seconds
+
+
+def _job_filters(args: argparse.Namespace) -> dict[str, object]:
+    filters: dict[str, object] = {}
+    if args.tag:
+        filters["tag"] = args.tag
+    if args.state:
+        filters["state"] = args.state
+    if args.older_than:
+        filters["older_than"] = _age_seconds(args.older_than, "--older-than")
+    if args.newer_than:
+        filters["newer_than"] = _age_seconds(args.newer_than, "--newer-than")
+    return filters
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="muxdantic")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     ensure_parser = subparsers.add_parser("ensure")
     _add_server_args(ensure_parser)
-    ensure_parser.add_argument("workspace")
+    ensure_parser.add_argument("workspace", nargs="+")
+    ensure_parser.add_argument("--pool-size", type=int, default=0)
+    ensure_parser.add_argument("--max-parallel", type=int, default=DEFAULT_MAX_PARALLEL)
+    ensure_parser.add_argument("--loader", choices=["tmuxp", "native"], default="tmuxp")
+    ensure_parser.add_argument("--session-cache", action="store_true")
 
     run_parser = subparsers.add_parser("run")
     _add_server_args(run_parser)
@@ -42,23 +87,149 @@ def _build_parser() -> argparse.ArgumentParser:
     log_group = run_parser.add_mutually_exclusive_group()
     log_group.add_argument("--log-dir")
     log_group.add_argument("--log-file")
+    run_parser.add_argument("--log-format", choices=["jsonl", "raw"], default="jsonl")
+    run_parser.add_argument("--log-strip-ansi", action="store_true")
+    run_parser.add_argument("--log-collapse-cr", action="store_true")
+    run_parser.add_argument("--log-rate-limit", type=float, metavar="LINES_PER_SEC")
+    run_parser.add_argument("--log-buffer", dest="log_buffer_lines", type=int, metavar="LINES")
+    run_parser.add_argument("--log-overflow", choices=["drop-oldest", "drop-newest", "block"], default="drop-oldest")
+    run_parser.add_argument("--record-result", action="store_true")
+    run_parser.add_argument("--wait", action="store_true")
+    run_parser.add_argument("--timeout", type=float)
+    run_parser.add_argument("--launch", choices=["send-keys", "direct"], default="send-keys")
+    run_parser.add_argument("--cwd")
+    run_parser.add_argument("-e", "--env", action="append", default=[], metavar="KEY=VALUE")
+    run_parser.add_argument("--pool-size", type=int, default=0)
+    run_parser.add_argument("--no-pool-replenish", dest="pool_replenish", action="store_false")
+    run_parser.add_argument("--shard-cap", type=int, metavar="WINDOWS")
+    run_parser.add_argument("--server-pool", type=int, metavar="N")
+    run_parser.add_argument("--unique", nargs="?", const="", metavar="KEY")
+    run_parser.add_argument("--placement", choices=["least-loaded", "hash"], default="least-loaded")
+    run_parser.add_argument("--session-cache", action="store_true")
 
+    graph_parser = subparsers.add_parser("run-graph")
+    _add_server_args(graph_parser)
+    graph_parser.add_argument("workspace")
+    graph_parser.add_argument("graph_file")
+    graph_parser.add_argument("--max-parallel", type=int)
 
     ls_jobs_parser = subparsers.add_parser("ls-jobs")
-    _add_server_args(ls_jobs_parser)
+    _add_fanout_server_args(ls_jobs_parser)
     ls_jobs_parser.add_argument("workspace")
+    ls_jobs_parser.add_argument("--stats", action="store_true")
+    ls_jobs_parser.add_argument("--stats-interval", type=float, default=0.5)
+    ls_jobs_parser.add_argument("--tag")
+    ls_jobs_parser.add_argument("--state", choices=["running", "exited"])
+    ls_jobs_parser.add_argument("--older-than", metavar="AGE")
+    ls_jobs_parser.add_argument("--newer-than", metavar="AGE")
+    ls_jobs_parser.add_argument("--server-pool", type=int, metavar="N")
 
     kill_parser = subparsers.add_parser("kill")
-    _add_server_args(kill_parser)
+    _add_fanout_server_args(kill_parser)
     kill_parser.add_argument("workspace")
     selectors = kill_parser.add_mutually_exclusive_group(required=True)
     selectors.add_argument("--job-id")
     selectors.add_argument("--tag")
     selectors.add_argument("--all-jobs", action="store_true")
+    kill_parser.add_argument("--server-pool", type=int, metavar="N")
+
+    capture_parser = subparsers.add_parser("capture")
+    _add_server_args(capture_parser)
+    capture_parser.add_argument("workspace")
+    capture_parser.add_argument("--job-id", required=True)
+    capture_parser.add_argument("--start")
+    capture_parser.add_argument("--end")
+    capture_parser.add_argument("--since-last", action="store_true")
+
+    result_parser = subparsers.add_parser("result")
+    result_parser.add_argument("job_id")
+
+    stats_parser = subparsers.add_parser("stats")
+    _add_server_args(stats_parser)
+    stats_parser.add_argument("workspace", nargs="?")
+    stats_parser.add_argument("--format", choices=["json", "prometheus"], default="json")
+    stats_parser.add_argument("--output")
+    stats_parser.add_argument("--max-age", type=float, default=3600.0)
+
+    logs_parser = subparsers.add_parser("logs")
+    logs_parser.add_argument("--to-jsonl", metavar="RAW_LOG")
+    logs_parser.add_argument("--job-id")
+    logs_parser.add_argument("--log-dir")
+    logs_parser.add_argument("--tag")
+    logs_parser.add_argument("--since")
+    logs_parser.add_argument("--merge", action="store_true")
+    logs_parser.add_argument("--tail", type=int, metavar="N")
+    logs_parser.add_argument("--log-file")
+    logs_subparsers = logs_parser.add_subparsers(dest="logs_command")
+
+    logs_grep_parser = logs_subparsers.add_parser("grep")
+    logs_grep_parser.add_argument("pattern")
+    logs_grep_parser.add_argument("--log-dir", required=True)
+    logs_grep_parser.add_argument("--tag")
+    logs_grep_parser.add_argument("--since")
+    logs_grep_parser.add_argument("--workers", type=int)
 
     return parser
 
 
+def _parse_env(assignments: list[str]) -> dict[str, str]:
+    env: dict[str, str] = {}
+    for assignment in assignments:
+        key, sep, value = assignment.partition("=")
+        if not sep or not key:
+            raise MuxdanticUsageError(f"--env expects KEY=VALUE, got: {assignment}")
+        env[key] = value
+    return env
+
+
+def _parse_line_offset(value: str | None, *, flag: str) -> int | str | None:
+    if value is None or value == "-":
+        return value
+    try:
+        return int(value)
+    except ValueError as exc:
+        raise MuxdanticUsageError(f"{flag} must be an integer or '-', got: {value}") from exc
+
+
+def _server_from_args(args: argparse.Namespace) -> TmuxServerArgs:
+    socket_name = getattr(args, "socket_name", None)
+    socket_path = getattr(args, "socket_path", None)
+    # Fan-out commands collect repeated flags; a single value targets one server as before.
+    if isinstance(socket_name, list):
+        socket_name = socket_name[0] if socket_name else None
+    if isinstance(socket_path, list):
+        socket_path = socket_path[0] if socket_path else None
+    return TmuxServerArgs(socket_name=socket_name, socket_path=socket_path)
+
+
+def _fanout_servers(args: argparse.Namespace) -> list[TmuxServerArgs] | None:
+    """Return the selected servers when a command should fan out, or None for a single server."""
+    socket_names = getattr(args, "socket_name", None)
+    socket_paths = getattr(args, "socket_path", None)
+    if not isinstance(socket_names, list) or not isinstance(socket_paths, list):
+        return None
+    if (
+        len(socket_names) <= 1
+        and len(socket_paths) <= 1
+        and args.socket_glob is None
+        and args.server_file is None
+    ):
+        return None
+    return select_servers(
+        socket_names=socket_names,
+        socket_paths=socket_paths,
+        socket_glob=args.socket_glob,
+        server_file=Path(args.server_file) if args.server_file else None,
+    )
+
+
+def _pool_base(args: argparse.Namespace) -> TmuxServerArgs:
+    """Return the single server a ``--server-pool`` is derived from."""
+    if len(args.socket_name) > 1 or len(args.socket_path) > 1 or args.socket_glob or args.server_file:
+        raise MuxdanticUsageError("--server-pool derives its servers from at most one -L or -S")
+    return _server_from_args(args)
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = _build_parser()
     raw_argv = list(argv) if argv is not None else sys.argv[1:]
@@ -67,13 +238,39 @@ def main(argv: list[str] | None = None) -> int:
     except SystemExit as exc:
         return int(exc.code)
 
-    server = TmuxServerArgs(socket_name=args.socket_name, socket_path=args.socket_path)
+    server = _server_from_args(args)
 
     try:
         if args.command == "ensure":
-            req = EnsureRequest(workspace=Path(args.workspace), server=server)
-            print_json(ensure(req))
-            return 0
+            if len(args.workspace) == 1 and not glob.has_magic(args.workspace[0]):
+                req = EnsureRequest(
+                    workspace=Path(args.workspace[0]),
+                    server=server,
+                    pool_size=args.pool_size,
+                    loader=args.loader,
+                    session_cache=args.session_cache,
+                )
+                print_json(ensure(req))
+                return 0
+
+            # Several workspaces (or a glob): one JSON line per workspace as it finishes.
+            failed = False
+            for workspace, outcome in ensure_many(
+                expand_workspaces(args.workspace),
+                server,
+                pool_size=args.pool_size,
+                max_parallel=args.max_parallel,
+                loader=args.loader,
+                session_cache=args.session_cache,
+            ):
+                if isinstance(outcome, EnsureResult):
+                    record = outcome.model_dump(mode="json")
+                else:
+                    failed = True
+                    record = {"workspace": str(workspace), "error": str(outcome)}
+                sys.stdout.write(json.dumps(record) + "\n")
+                sys.stdout.flush()
+            return 1 if failed else 0
 
         if args.command == "run":
             if not extras or extras[0] != "--" or len(extras) == 1:
@@ -88,32 +285,198 @@ def main(argv: list[str] | None = None) -> int:
                 keep_on_fail=args.keep_on_fail,
                 log_dir=Path(args.log_dir) if args.log_dir else None,
                 log_file=Path(args.log_file) if args.log_file else None,
+                log_format=args.log_format,
+                log_strip_ansi=args.log_strip_ansi,
+                log_collapse_cr=args.log_collapse_cr,
+                log_rate_limit=args.log_rate_limit,
+                log_buffer_lines=args.log_buffer_lines,
+                log_overflow=args.log_overflow,
+                record_result=args.record_result,
+                wait=args.wait,
+                timeout=args.timeout,
+                launch=args.launch,
+                cwd=Path(args.cwd) if args.cwd else None,
+                env=_parse_env(args.env),
+                pool_size=args.pool_size,
+                pool_replenish=args.pool_replenish,
+                shard_cap=args.shard_cap,
+                unique=args.unique is not None,
+                unique_key=args.unique or None,
+                session_cache=args.session_cache,
                 cmd=extras[1:],
             )
-            print_json(run(req))
-            return 0
+            if args.server_pool:
+                job_ref = run_in_pool(req, args.server_pool, placement=args.placement)
+            else:
+                job_ref = run(req)
+            print_json(job_ref)
+            return job_ref.exit_status if job_ref.exit_status is not None else 0
 
         if args.command != "run" and extras:
             raise MuxdanticUsageError(f"Unexpected extra arguments: {' '.join(extras)}")
 
+        if args.command == "run-graph":
+            graph = load_graph_file(
+                Path(args.graph_file),
+                Path(args.workspace),
+                server,
+                max_parallel=args.max_parallel,
+            )
+            graph_result = run_graph(graph)
+            print_json(graph_result)
+            return 0 if graph_result.succeeded else 1
+
         if args.command == "ls-jobs":
-            jobs = list_jobs(Path(args.workspace), server)
-            print_json([job.model_dump(mode="json") for job in jobs])
+            workspace = Path(args.workspace)
+            filters = _job_filters(args)
+
+            def _ls_jobs(target: TmuxServerArgs) -> list[JobInfo]:
+                jobs = list_jobs(workspace, target, **filters)
+                if args.stats:
+                    jobs = attach_stats(jobs, interval=args.stats_interval)
+                return jobs
+
+            if args.server_pool:
+                pooled, pool_errors = gather_jobs(
+                    pool_servers(_pool_base(args), args.server_pool),
+                    _ls_jobs,
+                    max_parallel=args.max_parallel,
+                )
+                print_json([job.model_dump(mode="json") for job in pooled])
+                for label, message in pool_errors.items():
+                    print_error(f"{label}: {message}")
+                return 1 if pool_errors else 0
+
+            servers = _fanout_servers(args)
+            if servers is not None:
+                fanned = fan_out(servers, _ls_jobs, max_parallel=args.max_parallel)
+                print_json(fanned)
+                return 1 if fanned.errors else 0
+
+            print_json([job.model_dump(mode="json") for job in _ls_jobs(server)])
             return 0
 
         if args.command == "kill":
-            result = kill(
+            workspace = Path(args.workspace)
+
+            def _kill(target: TmuxServerArgs) -> KillResult:
+                return kill(
+                    workspace,
+                    target,
+                    job_id=args.job_id,
+                    tag=args.tag,
+                    all_jobs=args.all_jobs,
+                )
+
+            if args.server_pool:
+                fanned = kill_pool_jobs(
+                    workspace,
+                    _pool_base(args),
+                    args.server_pool,
+                    job_id=args.job_id,
+                    tag=args.tag,
+                    all_jobs=args.all_jobs,
+                    max_parallel=args.max_parallel,
+                )
+                print_json(fanned)
+                return 1 if fanned.errors else 0
+
+            servers = _fanout_servers(args)
+            if servers is not None:
+                fanned = fan_out(servers, _kill, max_parallel=args.max_parallel)
+                print_json(fanned)
+                return 1 if fanned.errors else 0
+
+            print_json(_kill(server))
+            return 0
+
+        if args.command == "capture":
+            result = capture(
                 Path(args.workspace),
                 server,
                 job_id=args.job_id,
-                tag=args.tag,
-                all_jobs=args.all_jobs,
+                start=_parse_line_offset(args.start, flag="--start"),
+                end=_parse_line_offset(args.end, flag="--end"),
+                since_last=args.since_last,
             )
             print_json(result)
             return 0
 
+        if args.command == "result":
+            job_result = read_result(args.job_id)
+            if job_result is None:
+                raise MuxdanticUsageError(f"No result recorded for job {args.job_id}")
+            print_json(job_result)
+            return 0
+
+        if args.command == "stats":
+            jobs = list_jobs(Path(args.workspace), server) if args.workspace else []
+            report = build_report(jobs, read_sink_stats(max_age=args.max_age))
+            if args.format == "prometheus":
+                text = render_prometheus(report)
+            else:
+                text = json.dumps(report.model_dump(mode="json")) + "\n"
+            if args.output:
+                write_text_atomic(Path(args.output), text)
+            else:
+                sys.stdout.write(text)
+            return 0
+
+        if args.command == "logs" and args.logs_command == "grep":
+            for record in grep_logs(
+                Path(args.log_dir),
+                args.pattern,
+                tag=args.tag,
+                since=parse_since(args.since) if args.since else None,
+                workers=args.workers,
+            ):
+                sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+                sys.stdout.flush()
+            return 0
+
+        if args.command == "logs" and args.tail is not None:
+            if args.tail < 1:
+                raise MuxdanticUsageError("--tail must be at least 1")
+            if args.log_file:
+                log_file = Path(args.log_file)
+            elif args.log_dir and args.job_id:
+                log_file = Path(args.log_dir) / f"{args.job_id}.jsonl"
+            else:
+                raise MuxdanticUsageError("logs --tail requires --log-file or --log-dir with --job-id")
+            if not log_segments(log_file):
+                raise MuxdanticUsageError(f"Log not found: {log_file}")
+            for record in tail_records(log_file, args.tail):
+                sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+            return 0
+
+        if args.command == "logs" and args.merge:
+            if args.log_dir is None:
+                raise MuxdanticUsageError("logs --merge requires --log-dir")
+            for record in merge_logs(
+                Path(args.log_dir),
+                tag=args.tag,
+                since=parse_since(args.since) if args.since else None,
+            ):
+                sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+            return 0
+
+        if args.command == "logs":
+            if args.to_jsonl is None:
+                raise MuxdanticUsageError("logs requires --to-jsonl RAW_LOG or --merge")
+            raw_log = Path(args.to_jsonl)
+            if not raw_log.is_file():
+                raise MuxdanticUsageError(f"Raw log not found: {raw_log}")
+            for record in raw_to_jsonl_records(raw_log, job_id=args.job_id):
+                sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+            return 0
+
         raise MuxdanticUsageError(f"Unknown command: {args.command}")
-    except MuxdanticUsageError as exc:
+    except MuxdanticTimeoutError as exc:
+        if exc.job_ref is not None:
+            print_json(exc.job_ref)
+        print_error(str(exc))
+        return exc.exit_code
+    except (MuxdanticUsageError, ValidationError) as exc:
         print_error(str(exc))
         return 2
     except MuxdanticSubprocessError as exc:
@@ -0,0 +1,127 @@
+"""Long-lived client that pays workspace and session setup once.
+
+The free functions in ``muxdantic.jobs`` re-resolve the workspace, re-read its
+config and re-check the session on every call. ``Muxdantic`` does that once
+and then only revalidates the session with a single ``has-session`` call when
+its last check is older than ``revalidate_after`` seconds, or after a tmux
+command failed.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, TypeVar
+
+from muxdantic.ensure import ensure
+from muxdantic.errors import MuxdanticSubprocessError, MuxdanticUsageError
+from muxdantic.jobs import kill, list_jobs, run, wait_job
+from muxdantic.models import EnsureRequest, JobInfo, JobRef, JobResult, KillResult, RunRequest, TmuxServerArgs
+from muxdantic.tmux import has_session
+from muxdantic.workspace import extract_session_name, load_tmuxp_config, resolve_workspace
+
+T = TypeVar("T")
+
+DEFAULT_REVALIDATE_AFTER_S = 5.0
+
+
+class Muxdantic:
+    """Client bound to one workspace and tmux server.
+
+    Example::
+
+        mux = Muxdantic(Path(".tmuxp.yaml"), TmuxServerArgs(socket_name="ci"))
+        ref = mux.run(["make", "test"], tag="test", record_result=True, notify=True)
+        result = mux.wait(ref.job_id, timeout=600)
+    """
+
+    def __init__(
+        self,
+        workspace: Path,
+        server: TmuxServerArgs | None = None,
+        *,
+        revalidate_after: float = DEFAULT_REVALIDATE_AFTER_S,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.workspace = resolve_workspace(workspace)
+        self.server = server or TmuxServerArgs()
+        self.session_name = extract_session_name(load_tmuxp_config(self.workspace))
+        self.revalidate_after = revalidate_after
+        self._clock = clock
+        self._session_checked_at: float | None = None
+
+    def ensure_session(self) -> None:
+        """Make sure the session exists, re-checking tmux only when the cached answer is stale."""
+        now = self._clock()
+        if self._session_checked_at is not None and now - self._session_checked_at < self.revalidate_after:
+            return
+        if self._session_checked_at is None or not has_session(self.session_name, self.server):
+            ensure(EnsureRequest(workspace=self.workspace, server=self.server))
+        self._session_checked_at = now
+
+    def invalidate(self) -> None:
+        """Forget the cached session check; the next call re-checks tmux."""
+        self._session_checked_at = None
+
+    def _call(self, operation: Callable[[], T]) -> T:
+        try:
+            return operation()
+        except MuxdanticSubprocessError:
+            # The session (or server) may have gone away under us.
+            self.invalidate()
+            raise
+
+    def _request(self, cmd: list[str], tag: str, options: dict[str, Any]) -> RunRequest:
+        return RunRequest(workspace=self.workspace, server=self.server, tag=tag, cmd=cmd, **options)
+
+    def run(self, cmd: list[str], *, tag: str, **options: Any) -> JobRef:
+        """Start one job; ``options`` are the remaining ``RunRequest`` fields."""
+        req = self._request(cmd, tag, options)
+        self.ensure_session()
+        return self._call(lambda: run(req, session_name=self.session_name))
+
+    def run_many(
+        self,
+        cmds: Iterable[list[str]],
+        *,
+        tag: str,
+        max_parallel: int = 1,
+        **options: Any,
+    ) -> list[JobRef]:
+        """Start one job per command, at most ``max_parallel`` at a time; refs keep input order."""
+        if max_parallel < 1:
+            raise MuxdanticUsageError("max_parallel must be at least 1")
+        reqs = [self._request(cmd, tag, options) for cmd in cmds]
+        if not reqs:
+            return []
+        self.ensure_session()
+
+        def _start(req: RunRequest) -> JobRef:
+            return run(req, session_name=self.session_name)
+
+        if max_parallel == 1:
+            return self._call(lambda: [_start(req) for req in reqs])
+        with ThreadPoolExecutor(max_workers=min(max_parallel, len(reqs))) as executor:
+            return self._call(lambda: list(executor.map(_start, reqs)))
+
+    def list_jobs(self, **filters: Any) -> list[JobInfo]:
+        """List this workspace's jobs; ``filters`` are the ``jobs.list_jobs`` predicates."""
+        return self._call(lambda: list_jobs(self.workspace, self.server, session_name=self.session_name, **filters))
+
+    def kill(self, *, job_id: str | None = None, tag: str | None = None, all_jobs: bool = False) -> KillResult:
+        return self._call(
+            lambda: kill(
+                self.workspace,
+                self.server,
+                job_id=job_id,
+                tag=tag,
+                all_jobs=all_jobs,
+                session_name=self.session_name,
+            )
+        )
+
+    def wait(self, job_id: str, *, timeout: float | None = None) -> JobResult | None:
+        """Block until a job started with ``notify`` (or ``wait``) exits and return its result."""
+        return wait_job(job_id, self.server, timeout=timeout)
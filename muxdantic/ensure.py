@@ -2,9 +2,19 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Literal
+
+from muxdantic.errors import MuxdanticUsageError
+from muxdantic.fanout import DEFAULT_MAX_PARALLEL
 from muxdantic.locking import session_lock
-from muxdantic.models import EnsureRequest, EnsureResult
-from muxdantic.tmux import has_session, tmuxp
+from muxdantic.models import EnsureRequest, EnsureResult, TmuxServerArgs
+from muxdantic.native_loader import load_native
+from muxdantic.pool import fill_pool
+from muxdantic.session_cache import remember_session, session_cached
+from muxdantic.tmux import has_session, session_server_pid, tmuxp
 from muxdantic.workspace import extract_session_name, load_tmuxp_config, resolve_workspace
 
 
@@ -14,9 +24,67 @@ def ensure(req: EnsureRequest) -> EnsureResult:
     session_name = extract_session_name(cfg)
 
     created = False
-    with session_lock(req.server, session_name):
-        if not has_session(session_name, req.server):
-            tmuxp(["load", "-d", "--yes", str(workspace)], req.server)
-            created = True
+    # A cache hit skips both the lock and the has-session fork.
+    if not (req.session_cache and session_cached(req.server, session_name)):
+        with session_lock(req.server, session_name):
+            # With the cache, the existence check also returns the pid the entry is keyed by.
+            if req.session_cache:
+                pid = session_server_pid(session_name, req.server)
+                exists = pid is not None
+            else:
+                exists = has_session(session_name, req.server)
+            if not exists:
+                if req.loader == "native":
+                    load_native(cfg, workspace, req.server)
+                else:
+                    tmuxp(["load", "-d", "--yes", str(workspace)], req.server)
+                created = True
+                if req.session_cache:
+                    pid = session_server_pid(session_name, req.server)
+        if req.session_cache and pid is not None:
+            remember_session(req.server, session_name, pid)
+
+    if req.pool_size:
+        fill_pool(session_name, req.pool_size, req.server)
 
     return EnsureResult(workspace=workspace, session_name=session_name, created=created)
+
+
+def ensure_many(
+    workspaces: list[Path],
+    server: TmuxServerArgs,
+    *,
+    pool_size: int = 0,
+    max_parallel: int = DEFAULT_MAX_PARALLEL,
+    loader: Literal["tmuxp", "native"] = "tmuxp",
+    session_cache: bool = False,
+) -> Iterator[tuple[Path, EnsureResult | Exception]]:
+    """Ensure every workspace on a pool of ``max_parallel`` threads, yielding each as it finishes.
+
+    Yields ``(workspace, result)``; a failing workspace yields its exception
+    (a tmux error, a malformed config, ...) instead of stopping the others. Each load still runs under its session's
+    ``session_lock``, so workspaces sharing a session name are loaded once.
+    """
+    if max_parallel < 1:
+        raise MuxdanticUsageError("max_parallel must be at least 1")
+    if not workspaces:
+        return
+
+    def _ensure(workspace: Path) -> EnsureResult | Exception:
+        try:
+            return ensure(
+                EnsureRequest(
+                    workspace=workspace,
+                    server=server,
+                    pool_size=pool_size,
+                    loader=loader,
+                    session_cache=session_cache,
+                )
+            )
+        except Exception as exc:  # noqa: BLE001
+            return exc
+
+    with ThreadPoolExecutor(max_workers=min(max_parallel, len(workspaces))) as executor:
+        futures = {executor.submit(_ensure, workspace): workspace for workspace in workspaces}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
@@ -13,6 +13,16 @@ class MuxdanticUsageError(MuxdanticError):
     exit_code: int = 2
 
 
+class MuxdanticTimeoutError(MuxdanticError):
+    """Represents a wait that exceeded its timeout (CLI exit code 124)."""
+
+    exit_code: int = 124
+
+    def __init__(self, message: str, *, job_ref: object | None = None) -> None:
+        self.job_ref = job_ref
+        super().__init__(message)
+
+
 class MuxdanticSubprocessError(MuxdanticError):
     """Represents operational subprocess failures (CLI exit code 1)."""
 
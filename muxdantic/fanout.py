@@ -0,0 +1,144 @@
+"""Run one operation against many tmux servers in parallel.
+
+Servers are selected by repeated ``-L``/``-S`` values, a glob over the
+sockets in tmux's per-user socket directory, or a server list file. Each
+server runs in its own worker thread; a failure on one server is recorded
+under its key and never aborts the others.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import stat
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, TypeVar
+
+from muxdantic.errors import MuxdanticUsageError
+from muxdantic.models import FanOutResult, TmuxServerArgs
+
+T = TypeVar("T")
+
+DEFAULT_MAX_PARALLEL = 8
+
+
+def server_label(server: TmuxServerArgs) -> str:
+    """Return the key a server's results are reported under."""
+    # tmux prefers -S over -L when both are given.
+    return server.socket_path or server.socket_name or "default"
+
+
+def socket_dir() -> Path:
+    """Return the directory tmux creates ``-L`` sockets in for this user."""
+    return Path(os.environ.get("TMUX_TMPDIR") or "/tmp") / f"tmux-{os.getuid()}"
+
+
+def socket_file(server: TmuxServerArgs) -> Path:
+    """Return the socket path tmux uses for ``server``."""
+    if server.socket_path:
+        return Path(server.socket_path)
+    return socket_dir() / (server.socket_name or "default")
+
+
+def glob_servers(pattern: str, *, directory: Path | None = None) -> list[TmuxServerArgs]:
+    """Return a server for every socket in the socket directory whose name matches ``pattern``."""
+    root = directory or socket_dir()
+    try:
+        entries = sorted(os.scandir(root), key=lambda entry: entry.name)
+    except FileNotFoundError:
+        return []
+
+    servers: list[TmuxServerArgs] = []
+    for entry in entries:
+        if not fnmatch.fnmatchcase(entry.name, pattern):
+            continue
+        try:
+            is_socket = stat.S_ISSOCK(entry.stat().st_mode)
+        except OSError:
+            continue
+        if not is_socket:
+            continue
+        if directory is None:
+            servers.append(TmuxServerArgs(socket_name=entry.name))
+        else:
+            servers.append(TmuxServerArgs(socket_path=entry.path))
+    return servers
+
+
+def read_server_file(path: Path) -> list[TmuxServerArgs]:
+    """Read one server per line: a socket path if it contains ``/``, otherwise a ``-L`` name.
+
+    Blank lines and ``#`` comments are ignored.
+    """
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError as exc:
+        raise MuxdanticUsageError(f"Unable to read server file {path}: {exc.strerror}") from exc
+
+    servers: list[TmuxServerArgs] = []
+    for raw_line in text.splitlines():
+        line = raw_line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if "/" in line:
+            servers.append(TmuxServerArgs(socket_path=line))
+        else:
+            servers.append(TmuxServerArgs(socket_name=line))
+    return servers
+
+
+def select_servers(
+    *,
+    socket_names: Iterable[str] = (),
+    socket_paths: Iterable[str] = (),
+    socket_glob: str | None = None,
+    server_file: Path | None = None,
+) -> list[TmuxServerArgs]:
+    """Combine every server selector into one de-duplicated list, in selector order."""
+    candidates = [TmuxServerArgs(socket_name=name) for name in socket_names]
+    candidates.extend(TmuxServerArgs(socket_path=path) for path in socket_paths)
+    if socket_glob is not None:
+        candidates.extend(glob_servers(socket_glob))
+    if server_file is not None:
+        candidates.extend(read_server_file(server_file))
+
+    servers: dict[str, TmuxServerArgs] = {}
+    for server in candidates:
+        servers.setdefault(server_label(server), server)
+    return list(servers.values())
+
+
+def fan_out(
+    servers: list[TmuxServerArgs],
+    operation: Callable[[TmuxServerArgs], T],
+    *,
+    max_parallel: int = DEFAULT_MAX_PARALLEL,
+) -> FanOutResult:
+    """Call ``operation(server)`` for every server with at most ``max_parallel`` in flight.
+
+    Results and error messages are keyed by ``server_label``.
+    """
+    if max_parallel < 1:
+        raise MuxdanticUsageError("max_parallel must be at least 1")
+
+    def _call(server: TmuxServerArgs) -> tuple[bool, Any]:
+        try:
+            return True, operation(server)
+        except Exception as exc:  # noqa: BLE001
+            return False, str(exc) or type(exc).__name__
+
+    results: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+    if not servers:
+        return FanOutResult(results=results, errors=errors)
+
+    with ThreadPoolExecutor(max_workers=min(max_parallel, len(servers))) as executor:
+        outcomes = executor.map(_call, servers)
+        for server, (ok, value) in zip(servers, outcomes):
+            if ok:
+                results[server_label(server)] = value
+            else:
+                errors[server_label(server)] = value
+    return FanOutResult(results=results, errors=errors)
@@ -0,0 +1,92 @@
+"""Job dependency graph loading and timing helpers for ``run-graph``."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from pydantic import ValidationError
+
+from muxdantic.errors import MuxdanticUsageError
+from muxdantic.models import GraphRequest, TmuxServerArgs
+
+try:
+    import yaml  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover - exercised in minimal environments
+    yaml = None
+
+
+def load_graph_file(
+    path: Path,
+    workspace: Path,
+    server: TmuxServerArgs,
+    *,
+    max_parallel: int | None = None,
+) -> GraphRequest:
+    """Load a YAML/JSON job graph.
+
+    The file holds ``nodes`` as a list of node mappings (each with ``name``) or
+    as a mapping of name -> node, plus an optional ``max_parallel``.
+    """
+
+    try:
+        raw = path.read_text(encoding="utf-8")
+    except OSError as exc:
+        raise MuxdanticUsageError(f"Unable to read graph file {path}: {exc}") from exc
+
+    try:
+        if path.suffix == ".json":
+            loaded = json.loads(raw)
+        elif yaml is not None:
+            loaded = yaml.safe_load(raw)
+        else:
+            raise MuxdanticUsageError("PyYAML is required to read YAML graph files")
+    except MuxdanticUsageError:
+        raise
+    except Exception as exc:  # noqa: BLE001
+        raise MuxdanticUsageError(f"Invalid graph file format in {path}: {exc}") from exc
+
+    if not isinstance(loaded, dict) or "nodes" not in loaded:
+        raise MuxdanticUsageError(f"Graph file must be a mapping with a 'nodes' key in {path}")
+
+    nodes: Any = loaded["nodes"]
+    if isinstance(nodes, dict):
+        nodes = [{"name": name, **(spec or {})} for name, spec in nodes.items()]
+
+    payload: dict[str, Any] = {"workspace": workspace, "server": server, "nodes": nodes}
+    if max_parallel is not None:
+        payload["max_parallel"] = max_parallel
+    elif "max_parallel" in loaded:
+        payload["max_parallel"] = loaded["max_parallel"]
+
+    try:
+        return GraphRequest.model_validate(payload)
+    except ValidationError as exc:
+        raise MuxdanticUsageError(f"Invalid graph in {path}: {exc}") from exc
+
+
+def critical_path(
+    depends_on: dict[str, list[str]],
+    spans: dict[str, tuple[float, float]],
+) -> tuple[list[str], float]:
+    """Return the chain of nodes that gated the graph's completion and its length in seconds.
+
+    ``spans`` maps each executed node to its ``(start, end)`` monotonic times.
+    Starting from the node that finished last, each step follows the
+    dependency that finished last, i.e. the one the node was waiting on.
+    """
+
+    if not spans:
+        return [], 0.0
+
+    current = max(spans, key=lambda name: spans[name][1])
+    path = [current]
+    while True:
+        deps = [dep for dep in depends_on.get(current, []) if dep in spans]
+        if not deps:
+            break
+        current = max(deps, key=lambda name: spans[name][1])
+        path.append(current)
+    path.reverse()
+    return path, spans[path[-1]][1] - spans[path[0]][0]
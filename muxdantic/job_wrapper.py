@@ -0,0 +1,132 @@
+"""Job wrapper process that records exit status and rusage to JSON sidecars."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from muxdantic.cache import write_json_atomic
+
+_FORWARDED_SIGNALS = (signal.SIGTERM, signal.SIGHUP)
+
+
+def _ts_utc(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _max_rss_kb(ru_maxrss: int) -> int:
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere.
+    if sys.platform == "darwin":
+        return ru_maxrss // 1024
+    return ru_maxrss
+
+
+def _signal_channel(channel: str, tmux_args: list[str]) -> None:
+    completed = subprocess.run(["tmux", *tmux_args, "wait-for", "-S", channel], capture_output=True, text=True)
+    if completed.returncode != 0:
+        sys.stderr.write(f"muxdantic: unable to signal wait channel {channel}: {completed.stderr}")
+
+
+def run_wrapped(
+    *,
+    job_id: str,
+    cmd: list[str],
+    result_files: list[Path],
+    notify_channel: str | None = None,
+    tmux_args: list[str] | None = None,
+) -> int:
+    """Run ``cmd`` to completion, write its result sidecars, and return its exit code.
+
+    When ``notify_channel`` is set, ``tmux wait-for -S`` is signalled after the
+    sidecars are written so waiters can read the result immediately.
+    """
+    started = time.time()
+    t0 = time.monotonic()
+
+    try:
+        proc = subprocess.Popen(cmd)
+    except OSError as exc:
+        sys.stderr.write(f"{cmd[0]}: {exc.strerror}\n")
+        code = 127
+        user_cpu = sys_cpu = 0.0
+        max_rss_kb = 0
+    else:
+        def _forward(signum: int, _frame: object) -> None:
+            try:
+                os.kill(proc.pid, signum)
+            except ProcessLookupError:
+                pass
+
+        for signum in _FORWARDED_SIGNALS:
+            signal.signal(signum, _forward)
+        # Terminal ^C already reaches the whole foreground process group.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+        _, status, rusage = os.wait4(proc.pid, 0)
+        code = os.waitstatus_to_exitcode(status)
+        user_cpu = rusage.ru_utime
+        sys_cpu = rusage.ru_stime
+        max_rss_kb = _max_rss_kb(rusage.ru_maxrss)
+
+    ended = time.time()
+    record = {
+        "job_id": job_id,
+        "cmd": cmd,
+        "exit_status": code if code >= 0 else None,
+        "signal": -code if code < 0 else None,
+        "started_at": _ts_utc(started),
+        "ended_at": _ts_utc(ended),
+        "wall_time_s": round(time.monotonic() - t0, 6),
+        "user_cpu_s": round(user_cpu, 6),
+        "sys_cpu_s": round(sys_cpu, 6),
+        "max_rss_kb": max_rss_kb,
+    }
+    for result_file in result_files:
+        try:
+            write_json_atomic(result_file, record)
+        except OSError as exc:
+            sys.stderr.write(f"muxdantic: unable to write result file {result_file}: {exc}\n")
+
+    if notify_channel:
+        _signal_channel(notify_channel, tmux_args or [])
+
+    return code if code >= 0 else 128 - code
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="muxdantic job wrapper")
+    parser.add_argument("--job-id", required=True)
+    parser.add_argument("--result-file", action="append", default=[])
+    parser.add_argument("--notify-channel")
+    parser.add_argument("-L", "--socket-name", dest="socket_name")
+    parser.add_argument("-S", "--socket-path", dest="socket_path")
+    parser.add_argument("cmd", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    cmd = args.cmd[1:] if args.cmd[:1] == ["--"] else args.cmd
+    if not cmd:
+        parser.error("a command is required after '--'")
+
+    tmux_args: list[str] = []
+    if args.socket_name:
+        tmux_args.extend(["-L", args.socket_name])
+    if args.socket_path:
+        tmux_args.extend(["-S", args.socket_path])
+
+    return run_wrapped(
+        job_id=args.job_id,
+        cmd=cmd,
+        result_files=[Path(result_file) for result_file in args.result_file],
+        notify_channel=args.notify_channel,
+        tmux_args=tmux_args,
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
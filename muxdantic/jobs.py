@@ -2,18 +2,64 @@
 
 from __future__ import annotations
 
+import getpass
+import json
+import queue
 import shlex
+import threading
+import time
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from pathlib import Path
 from uuid import uuid4
 
+from muxdantic.cache import read_json, state_path_for, write_json_atomic
+from muxdantic.capabilities import tmux_capabilities
 from muxdantic.ensure import ensure
-from muxdantic.errors import MuxdanticUsageError
-from muxdantic.models import EnsureRequest, JobInfo, JobRef, KillResult, RunRequest, TmuxServerArgs
-from muxdantic.tags import build_job_window_name, parse_job_window_name, sanitize_tag
-from muxdantic.tmux import kill_window, list_panes, list_windows, new_window, send_keys, set_window_option
+from muxdantic.errors import MuxdanticSubprocessError, MuxdanticTimeoutError, MuxdanticUsageError
+from muxdantic.graph import critical_path
+from muxdantic.locking import server_selector, unique_lock
+from muxdantic.models import (
+    CaptureResult,
+    EnsureRequest,
+    EnsureResult,
+    GraphNodeResult,
+    GraphRequest,
+    GraphResult,
+    JobInfo,
+    JobRef,
+    JobResult,
+    KillResult,
+    RunRequest,
+    TmuxServerArgs,
+)
+from muxdantic.pool import claim_pool_window, fill_pool
+from muxdantic.procstats import proc_available, scan_proc, tree_stats
+from muxdantic.results import build_wrapper_argv, log_sidecar_path_for, read_result, result_path_for
+from muxdantic.session_cache import forget_on_stale, forget_server
+from muxdantic.shards import ensure_shard, job_sessions_filter, shard_index, shard_lock
+from muxdantic.tags import build_job_window_name, job_wait_channel, parse_job_window_name, sanitize_tag
+from muxdantic.tmux import (
+    capture_pane,
+    escape_format,
+    filter_unsupported,
+    kill_window,
+    JobPaneRow,
+    list_job_panes,
+    new_job_window,
+    new_window,
+    pane_history,
+    send_keys,
+    set_window_options,
+    wait_for,
+)
 from muxdantic.workspace import extract_session_name, load_tmuxp_config, resolve_workspace
 
+_CAPTURE_ATTEMPTS = 3
+_STATS_INTERVAL_S = 0.5
+_WAIT_POLL_S = 2.0
+_STATUS_SETTLE_S = 1.0
+
 
 def _generate_job_id() -> str:
     return uuid4().hex[:12]
@@ -33,16 +79,153 @@ def _remain_on_exit_value(req: RunRequest) -> str:
     return "failed"
 
 
-def run(req: RunRequest) -> JobRef:
-    ensured = ensure(EnsureRequest(workspace=req.workspace, server=req.server))
+def _window_spawn_options(req: RunRequest, *, spawn_environment: bool = True) -> dict[str, object]:
+    options: dict[str, object] = {}
+    if req.cwd is not None:
+        options["start_directory"] = str(req.cwd)
+    if req.env and spawn_environment:
+        options["environment"] = dict(req.env)
+    return options
+
+
+def _sink_options(req: RunRequest) -> dict[str, object]:
+    options: dict[str, object] = {}
+    if req.log_format != "jsonl":
+        options["log_format"] = req.log_format
+    if req.log_strip_ansi:
+        options["strip_ansi"] = True
+    if req.log_collapse_cr:
+        options["collapse_cr"] = True
+    if req.log_rate_limit is not None:
+        options["rate_limit"] = req.log_rate_limit
+    if req.log_buffer_lines is not None:
+        options["buffer_lines"] = req.log_buffer_lines
+        options["overflow"] = req.log_overflow
+    return options
+
+
+def _requester() -> str:
+    try:
+        return getpass.getuser()
+    except (KeyError, OSError):
+        return ""
+
+
+def _job_options(req: RunRequest, *, job_id: str, ts_utc: str, log_file: Path | None) -> dict[str, str]:
+    """Window user options describing a job, read back by ``list_jobs`` via the format string."""
+    return {
+        "@mux_job_id": job_id,
+        "@mux_tag": req.tag,
+        "@mux_ts": ts_utc,
+        "@mux_log": str(log_file) if log_file is not None else "",
+        "@mux_cmd": json.dumps(req.cmd),
+        "@mux_workspace": str(req.workspace.expanduser().resolve()),
+        "@mux_requester": _requester(),
+        "@mux_key": req.unique_key or "",
+    }
+
+
+def _typed_command(argv: list[str], *, cwd: Path | None, env: dict[str, str]) -> str:
+    """Build the line typed into an already-running shell (e.g. a pool window)."""
+    command = f"exec {shlex.join(argv)}"
+    if env:
+        assignments = [f"{key}={value}" for key, value in env.items()]
+        command = f"exec env {shlex.join([*assignments, *argv])}"
+    if cwd is not None:
+        command = f"cd {shlex.quote(str(cwd))} && {command}"
+    return command
+
+
+def _env_argv(argv: list[str], env: dict[str, str]) -> list[str]:
+    return ["env", *(f"{key}={value}" for key, value in env.items()), *argv] if env else argv
+
+
+def run(req: RunRequest, *, session_name: str | None = None) -> JobRef:
+    """Start a job window in the workspace's session.
+
+    Callers that already know the session exists (such as ``client.Muxdantic``)
+    pass ``session_name`` to skip ``ensure``.
+
+    With ``session_cache``, a session killed behind the cache's back makes the
+    first tmux command fail. The server's entry is then dropped and, if a fresh
+    ``ensure`` has to recreate the session, the job is started once more.
+    """
+    if session_name is None:
+        ensure_req = EnsureRequest(workspace=req.workspace, server=req.server, session_cache=req.session_cache)
+        ensured = ensure(ensure_req)
+    else:
+        ensured = EnsureResult(workspace=req.workspace, session_name=session_name, created=False)
+
+    try:
+        job_ref = _launch(req, ensured)
+    except MuxdanticSubprocessError:
+        if not (req.session_cache and session_name is None and not ensured.created):
+            raise
+        forget_server(req.server)
+        ensured = ensure(ensure_req)
+        if not ensured.created:
+            # The session was there all along; the failure has another cause.
+            raise
+        job_ref = _launch(req, ensured)
+
+    if not req.wait:
+        return job_ref
 
+    try:
+        result = wait_job(job_ref.job_id, req.server, timeout=req.timeout)
+    except MuxdanticTimeoutError as exc:
+        raise MuxdanticTimeoutError(
+            f"Timed out after {req.timeout:g}s waiting for job {job_ref.job_id}", job_ref=job_ref
+        ) from exc
+    exit_status = _job_exit_status(result) if result is not None else _pane_exit_status(job_ref.job_id, req.server)
+    return job_ref.model_copy(update={"exit_status": exit_status})
+
+
+def _launch(req: RunRequest, ensured: EnsureResult) -> JobRef:
+    if not req.unique:
+        return _start_job(req, ensured)
+    # The lock is held until the new window carries its tag/key options, so a
+    # concurrent run with the same key always sees either nothing or this job.
+    with unique_lock(req.server, ensured.session_name, _unique_lock_key(req)):
+        existing = _find_unique(req, ensured.session_name)
+        return existing if existing is not None else _start_job(req, ensured)
+
+
+def _unique_lock_key(req: RunRequest) -> str:
+    return f"key={req.unique_key}" if req.unique_key is not None else f"tag={req.tag}"
+
+
+def _find_unique(req: RunRequest, session_name: str) -> JobRef | None:
+    """Return a ref to a running job with the request's dedupe key (or tag, without one)."""
+    if req.unique_key is not None:
+        match = {"key": req.unique_key}
+    else:
+        match = {"tag": req.tag}
+    running = list_jobs(req.workspace, req.server, state="running", session_name=session_name, **match)
+    if not running:
+        return None
+    job = running[0]
+    return JobRef(
+        job_id=job.job_id,
+        tag=job.tag,
+        ts_utc=job.ts_utc,
+        session_name=job.session_name,
+        window_id=job.window_id,
+        window_name=job.window_name,
+        pane_id=job.pane_id,
+        log_file=job.log_file,
+        deduplicated=True,
+    )
+
+
+def _start_job(req: RunRequest, ensured: EnsureResult) -> JobRef:
     job_id = _generate_job_id()
     ts_utc = _now_utc_ts()
     window_name = build_job_window_name(req.tag, ts_utc, job_id)
-
-    window_id, resolved_window_name, pane_id = new_window(ensured.session_name, window_name, req.server)
-
-    set_window_option(window_id, "remain-on-exit", _remain_on_exit_value(req), req.server)
+    # A tmux without ``-e`` gets the environment on the command line instead.
+    spawn_environment = tmux_capabilities().spawn_environment
+    spawn_options = _window_spawn_options(req, spawn_environment=spawn_environment)
+    command_env = {} if spawn_environment else req.env
 
     from muxdantic import logging as mux_logging
 
@@ -59,62 +242,490 @@ def run(req: RunRequest) -> JobRef:
     else:
         log_file = None
 
-    if callable(attach_pipe_pane):
-        attach_pipe_pane(req.server, pane_id, job_id, log_file)
+    window_options = {
+        "remain-on-exit": _remain_on_exit_value(req),
+        **_job_options(req, job_id=job_id, ts_utc=ts_utc, log_file=log_file),
+    }
 
-    send_keys(pane_id, f"exec {shlex.join(req.cmd)}", req.server)
+    result_file: Path | None = None
+    argv = req.cmd
+    notify = req.notify or req.wait
+    if req.record_result or notify:
+        result_file = result_path_for(job_id)
+        result_files = [result_file]
+        if log_file is not None:
+            result_files.append(log_sidecar_path_for(log_file))
+        argv = build_wrapper_argv(
+            job_id,
+            req.cmd,
+            result_files,
+            notify_channel=job_wait_channel(job_id) if notify else None,
+            server=req.server,
+        )
+
+    write_log_meta = getattr(mux_logging, "write_log_meta", None)
+
+    # With sharding, the shard is chosen and its window created under one lock
+    # so concurrent runs cannot overfill it.
+    with shard_lock(req.server, ensured.session_name) if req.shard_cap else nullcontext():
+        placement: dict[str, str] = {}
+        if req.shard_cap:
+            job_session = ensure_shard(ensured.session_name, req.shard_cap, req.server)
+            placement["target_session"] = job_session
+        else:
+            job_session = ensured.session_name
+
+        if log_file is not None and callable(write_log_meta):
+            write_log_meta(
+                log_file,
+                {
+                    "job_id": job_id,
+                    "tag": req.tag,
+                    "ts_utc": ts_utc,
+                    "session_name": job_session,
+                    "cmd": req.cmd,
+                    "log_format": req.log_format,
+                },
+            )
+
+        claimed = claim_pool_window(ensured.session_name, window_name, req.server, **placement) if req.pool_size else None
+        if claimed is not None:
+            window_id, pane_id = claimed
+        elif req.launch == "direct":
+            # argv is the pane's own process; options and the log pipe are set in the same tmux call.
+            window_id, pane_id = new_job_window(
+                job_session,
+                window_name,
+                req.server,
+                command=_env_argv(argv, command_env),
+                options=window_options,
+                pipe_command=(
+                    mux_logging.build_sink_command(job_id, log_file, **_sink_options(req))
+                    if log_file is not None
+                    else None
+                ),
+                **spawn_options,
+            )
+        else:
+            window_id, window_name, pane_id = new_window(
+                job_session,
+                window_name,
+                req.server,
+                **spawn_options,
+            )
+
+    if req.launch != "direct" or claimed is not None:
+        set_window_options(window_id, window_options, req.server)
+        if callable(attach_pipe_pane):
+            attach_pipe_pane(req.server, pane_id, job_id, log_file, **_sink_options(req))
+        if claimed is not None:
+            send_keys(pane_id, _typed_command(argv, cwd=req.cwd, env=req.env), req.server)
+        else:
+            send_keys(pane_id, _typed_command(argv, cwd=None, env=command_env), req.server)
+
+    if req.pool_size and req.pool_replenish:
+        fill_pool(ensured.session_name, req.pool_size, req.server)
 
     return JobRef(
         job_id=job_id,
         tag=req.tag,
         ts_utc=ts_utc,
-        session_name=ensured.session_name,
+        session_name=job_session,
         window_id=window_id,
-        window_name=resolved_window_name,
+        window_name=window_name,
         pane_id=pane_id,
         log_file=log_file,
+        result_file=result_file,
     )
 
 
-def list_jobs(workspace: Path, server: TmuxServerArgs) -> list[JobInfo]:
-    resolved_workspace = resolve_workspace(workspace)
-    cfg = load_tmuxp_config(resolved_workspace)
-    session_name = extract_session_name(cfg)
+def _job_exit_status(result: JobResult | None) -> int:
+    """Map a recorded result to a shell-style exit status (128+N for signal N)."""
+    if result is None:
+        return 1
+    if result.signal is not None:
+        return 128 + result.signal
+    return result.exit_status if result.exit_status is not None else 1
 
-    jobs: list[JobInfo] = []
-    for window_id, window_name in list_windows(session_name, server):
-        if not window_name.startswith("job:"):
-            continue
+
+def _job_row(job_id: str, server: TmuxServerArgs) -> JobPaneRow | None:
+    """Return the first pane row of the job's window, None when the window is gone."""
+    filter_expr = _job_filter(job_id=job_id, key=None, tag=None, state=None, ts_max=None, ts_min=None)
+    with forget_on_stale(server):
         try:
-            tag, ts_utc, job_id = parse_job_window_name(window_name)
-        except ValueError:
-            continue
+            rows = list_job_panes(None, server, filter_expr=filter_expr)
+        except MuxdanticSubprocessError as exc:
+            if not filter_unsupported(exc):
+                raise
+            rows = list_job_panes(None, server)
+    for row in rows:
+        job = _job_from_row(row, row.session_name)
+        if job is not None and job.job_id == job_id:
+            return row
+    return None
+
+
+def _job_finished(job_id: str, server: TmuxServerArgs) -> bool:
+    try:
+        row = _job_row(job_id, server)
+    except MuxdanticSubprocessError:
+        return True
+    return row is None or bool(row.pane_dead)
+
+
+def _pane_exit_status(job_id: str, server: TmuxServerArgs) -> int:
+    """Return the exit status tmux kept for a job without a result (a deduplicated job), else 1."""
+    # tmux marks the pane dead when its pty closes and fills in the status once
+    # it has reaped the process, so a just-dead pane may briefly have none.
+    deadline = time.monotonic() + _STATUS_SETTLE_S
+    while True:
+        try:
+            row = _job_row(job_id, server)
+        except MuxdanticSubprocessError:
+            return 1
+        if row is None or not row.pane_dead:
+            return 1
+        if row.pane_dead_status is not None:
+            return row.pane_dead_status
+        if time.monotonic() >= deadline:
+            return 1
+        time.sleep(0.05)
+
 
-        panes = list_panes(window_id, server)
-        if not panes:
+def wait_job(
+    job_id: str,
+    server: TmuxServerArgs,
+    *,
+    timeout: float | None = None,
+    poll_interval: float = _WAIT_POLL_S,
+) -> JobResult | None:
+    """Block until a job exits and return its recorded result (None if it recorded none).
+
+    The job's ``wait-for`` channel is waited on in ``poll_interval`` slices.
+    Between slices the result sidecar and the job's pane are checked, so a
+    lost signal, a job started without ``notify`` or a killed window ends the
+    wait instead of blocking forever.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    channel = job_wait_channel(job_id)
+    while True:
+        result = read_result(job_id)
+        if result is not None:
+            return result
+        remaining = poll_interval if deadline is None else min(poll_interval, deadline - time.monotonic())
+        if remaining <= 0:
+            raise MuxdanticTimeoutError(f"Timed out after {timeout:g}s waiting for job {job_id}")
+        try:
+            with forget_on_stale(server):
+                wait_for(channel, server, timeout=remaining)
+        except MuxdanticTimeoutError:
+            if not _job_finished(job_id, server):
+                continue
+        except MuxdanticSubprocessError:
+            # The server is gone, and the job with it.
+            pass
+        return read_result(job_id)
+
+
+def run_graph(req: GraphRequest) -> GraphResult:
+    """Run a job DAG, starting each node once all of its dependencies succeeded.
+
+    Up to ``max_parallel`` nodes run at once. Each running node has a thread
+    blocked in ``tmux wait-for`` on its job channel, so completions are pushed;
+    ``wait_job`` also checks the job's pane between wait slices, so a node
+    whose signal is lost or whose window dies fails instead of hanging. A node
+    whose ``run`` raises fails with the message in ``error``. Nodes downstream
+    of a failure are skipped.
+    """
+    nodes = {node.name: node for node in req.nodes}
+    status: dict[str, str] = {}
+    refs: dict[str, JobRef] = {}
+    results: dict[str, JobResult | None] = {}
+    errors: dict[str, str] = {}
+    started: dict[str, float] = {}
+    spans: dict[str, tuple[float, float]] = {}
+    completions: queue.Queue[tuple[str, JobResult | None]] = queue.Queue()
+
+    def _wait(name: str, job_id: str) -> None:
+        try:
+            result = wait_job(job_id, req.server)
+        except MuxdanticSubprocessError:
+            result = None
+        completions.put((name, result))
+
+    t0 = time.monotonic()
+    while True:
+        skipped_any = True
+        while skipped_any:
+            skipped_any = False
+            for name, node in nodes.items():
+                if name in status or name in started:
+                    continue
+                if any(status.get(dep) in {"failed", "skipped"} for dep in node.depends_on):
+                    status[name] = "skipped"
+                    skipped_any = True
+
+        launch_failed = False
+        for name, node in nodes.items():
+            if len(started) - len(spans) >= req.max_parallel:
+                break
+            if name in status or name in started:
+                continue
+            if all(status.get(dep) == "succeeded" for dep in node.depends_on):
+                try:
+                    refs[name] = run(node.to_run_request(req.workspace, req.server))
+                except Exception as exc:  # noqa: BLE001
+                    # A node that cannot start fails like one that exits non-zero;
+                    # the jobs already running are still waited for.
+                    status[name] = "failed"
+                    errors[name] = str(exc) or type(exc).__name__
+                    launch_failed = True
+                    continue
+                started[name] = time.monotonic()
+                threading.Thread(target=_wait, args=(name, refs[name].job_id), daemon=True).start()
+
+        if launch_failed:
+            # Skip the failed node's dependents before deciding whether anything is left to wait for.
             continue
+        if len(started) == len(spans):
+            break
+
+        name, result = completions.get()
+        spans[name] = (started[name], time.monotonic())
+        results[name] = result
+        status[name] = "succeeded" if result is not None and result.exit_status == 0 else "failed"
 
-        pane_id, pane_dead, pane_dead_status, pane_dead_time = panes[0]
-        state = "running" if pane_dead == 0 else "exited"
-        jobs.append(
-            JobInfo(
-                job_id=job_id,
-                tag=tag,
-                ts_utc=ts_utc,
-                session_name=session_name,
-                window_id=window_id,
-                window_name=window_name,
-                pane_id=pane_id,
-                pane_dead=pane_dead,
-                pane_dead_status=pane_dead_status,
-                pane_dead_time=pane_dead_time,
-                state=state,
+    node_results: list[GraphNodeResult] = []
+    for name in nodes:
+        result = results.get(name)
+        span = spans.get(name)
+        node_results.append(
+            GraphNodeResult(
+                name=name,
+                status=status[name],
+                job_id=refs[name].job_id if name in refs else None,
+                exit_status=result.exit_status if result is not None else None,
+                started_at=result.started_at if result is not None else None,
+                ended_at=result.ended_at if result is not None else None,
+                duration_s=round(span[1] - span[0], 6) if span is not None else None,
+                error=errors.get(name),
             )
         )
 
+    path, path_s = critical_path({name: node.depends_on for name, node in nodes.items()}, spans)
+    return GraphResult(
+        succeeded=all(status[name] == "succeeded" for name in nodes),
+        nodes=node_results,
+        wall_time_s=round(time.monotonic() - t0, 6),
+        critical_path=path,
+        critical_path_s=round(path_s, 6),
+    )
+
+
+def _job_from_row(row: JobPaneRow, session_name: str) -> JobInfo | None:
+    options = row.options
+    if options.get("@mux_job_id"):
+        job_id, tag, ts_utc = options["@mux_job_id"], options["@mux_tag"], options["@mux_ts"]
+    elif row.window_name.startswith("job:"):
+        # Jobs started before user options existed only carry the window name.
+        try:
+            tag, ts_utc, job_id = parse_job_window_name(row.window_name)
+        except ValueError:
+            return None
+    else:
+        return None
+
+    try:
+        cmd = json.loads(options["@mux_cmd"]) if options.get("@mux_cmd") else None
+    except ValueError:
+        cmd = None
+
+    return JobInfo(
+        job_id=job_id,
+        tag=tag,
+        ts_utc=ts_utc,
+        session_name=row.session_name or session_name,
+        window_id=row.window_id,
+        window_name=row.window_name,
+        pane_id=row.pane_id,
+        pane_dead=row.pane_dead,
+        pane_dead_status=row.pane_dead_status,
+        pane_dead_time=row.pane_dead_time,
+        pane_pid=row.pane_pid,
+        state="running" if row.pane_dead == 0 else "exited",
+        cmd=cmd,
+        log_file=options.get("@mux_log") or None,
+        workspace=options.get("@mux_workspace") or None,
+        requester=options.get("@mux_requester") or None,
+        key=options.get("@mux_key") or None,
+        result=read_result(job_id),
+    )
+
+
+def _fmt(operator: str, *operands: str) -> str:
+    return "#{" + operator + ":" + ",".join(operands) + "}"
+
+
+def _either_or_unset(option: str, expr: str) -> str:
+    # Windows started before user options existed only match through their name,
+    # and are re-checked in Python.
+    return _fmt("||", _fmt("==", f"#{{{option}}}", ""), expr)
+
+
+def _job_filter(
+    *,
+    job_id: str | None,
+    key: str | None,
+    tag: str | None,
+    state: str | None,
+    ts_max: str | None,
+    ts_min: str | None,
+) -> str:
+    """Build a ``list-panes -f`` expression matching job windows and the given predicates."""
+    clauses = [_fmt("||", "#{@mux_job_id}", _fmt("m", "job:*", "#{window_name}"))]
+    # Job ids are generated hex; anything else is left to the Python check
+    # rather than spliced into the format.
+    if job_id is not None and job_id.isalnum():
+        clauses.append(_fmt("||", _fmt("==", "#{@mux_job_id}", job_id), _fmt("m", f"job:*:{job_id}", "#{window_name}")))
+    if key is not None:
+        clauses.append(_fmt("==", "#{@mux_key}", escape_format(key)))
+    if tag is not None:
+        clauses.append(_fmt("||", _fmt("==", "#{@mux_tag}", tag), _fmt("m", f"job:{tag}:*", "#{window_name}")))
+    if state is not None:
+        clauses.append(_fmt("==", "#{pane_dead}", "0" if state == "running" else "1"))
+    # ts_utc is fixed-width YYYYmmddTHHMMSSZ, so string order is time order.
+    if ts_max is not None:
+        clauses.append(_either_or_unset("@mux_ts", _fmt("<=", "#{@mux_ts}", ts_max)))
+    if ts_min is not None:
+        clauses.append(_either_or_unset("@mux_ts", _fmt(">=", "#{@mux_ts}", ts_min)))
+
+    expr = clauses[-1]
+    for clause in reversed(clauses[:-1]):
+        expr = _fmt("&&", clause, expr)
+    return expr
+
+
+def _job_matches(
+    job: JobInfo,
+    *,
+    job_id: str | None,
+    key: str | None,
+    tag: str | None,
+    state: str | None,
+    ts_max: str | None,
+    ts_min: str | None,
+) -> bool:
+    if job_id is not None and job.job_id != job_id:
+        return False
+    if key is not None and job.key != key:
+        return False
+    if tag is not None and job.tag != tag:
+        return False
+    if state is not None and job.state != state:
+        return False
+    if ts_max is not None and job.ts_utc > ts_max:
+        return False
+    if ts_min is not None and job.ts_utc < ts_min:
+        return False
+    return True
+
+
+def _workspace_session(workspace: Path) -> str:
+    return extract_session_name(load_tmuxp_config(resolve_workspace(workspace)))
+
+
+def _ts_before(seconds: float) -> str:
+    return datetime.fromtimestamp(time.time() - seconds, timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def list_jobs(
+    workspace: Path,
+    server: TmuxServerArgs,
+    *,
+    job_id: str | None = None,
+    key: str | None = None,
+    tag: str | None = None,
+    state: str | None = None,
+    older_than: float | None = None,
+    newer_than: float | None = None,
+    session_name: str | None = None,
+) -> list[JobInfo]:
+    """List job windows in a workspace's session and its shards with one ``list-panes -a`` call.
+
+    The job prefix and the optional predicates are sent to tmux as a ``-f``
+    filter so non-matching windows never reach Python; on a tmux without
+    ``-f`` the listing is unfiltered and the predicates are applied here.
+    ``older_than``/``newer_than`` are ages in seconds. A known
+    ``session_name`` skips loading the workspace file.
+    """
+    if state is not None and state not in ("running", "exited"):
+        raise MuxdanticUsageError(f"state must be 'running' or 'exited', got: {state}")
+
+    if session_name is None:
+        session_name = _workspace_session(workspace)
+
+    predicates = {
+        "job_id": job_id,
+        "key": key,
+        "tag": sanitize_tag(tag) if tag is not None else None,
+        "state": state,
+        "ts_max": _ts_before(older_than) if older_than is not None else None,
+        "ts_min": _ts_before(newer_than) if newer_than is not None else None,
+    }
+    # One server-wide listing covers the job session and all of its shards.
+    filter_expr = _fmt("&&", job_sessions_filter(session_name), _job_filter(**predicates))
+    with forget_on_stale(server):
+        try:
+            rows = list_job_panes(None, server, filter_expr=filter_expr)
+        except MuxdanticSubprocessError as exc:
+            if not filter_unsupported(exc):
+                raise
+            rows = list_job_panes(None, server)
+
+    jobs: list[JobInfo] = []
+    seen_windows: set[str] = set()
+    for row in rows:
+        if row.session_name and row.session_name != session_name and shard_index(row.session_name, session_name) is None:
+            continue
+        # A job's command runs in its window's first pane.
+        if row.window_id in seen_windows:
+            continue
+        seen_windows.add(row.window_id)
+        job = _job_from_row(row, session_name)
+        if job is not None and _job_matches(job, **predicates):
+            jobs.append(job)
     return jobs
 
 
+def attach_stats(
+    jobs: list[JobInfo],
+    *,
+    interval: float = _STATS_INTERVAL_S,
+) -> list[JobInfo]:
+    """Return copies of ``jobs`` with live CPU/memory stats for each job's process tree.
+
+    Pane pids come with the job listing itself; CPU% is measured between two
+    full ``/proc`` scans ``interval`` seconds apart.
+    """
+    if not jobs:
+        return jobs
+
+    if not proc_available():
+        raise MuxdanticUsageError("Job stats require a /proc filesystem")
+
+    before = scan_proc()
+    time.sleep(interval)
+    after = scan_proc()
+
+    with_stats: list[JobInfo] = []
+    for job in jobs:
+        stats = None
+        if job.pane_pid is not None and job.pane_dead == 0:
+            stats = tree_stats(before, after, job.pane_pid)
+        with_stats.append(job.model_copy(update={"stats": stats}))
+    return with_stats
+
+
 def kill(
     workspace: Path,
     server: TmuxServerArgs,
@@ -122,22 +733,117 @@ def kill(
     job_id: str | None,
     tag: str | None,
     all_jobs: bool,
+    session_name: str | None = None,
 ) -> KillResult:
-    jobs = list_jobs(workspace, server)
-
     selected: list[JobInfo]
     if job_id:
-        selected = [job for job in jobs if job.job_id == job_id]
+        selected = list_jobs(workspace, server, job_id=job_id, session_name=session_name)
     elif tag:
-        selected = [job for job in jobs if job.tag == sanitize_tag(tag)]
+        selected = list_jobs(workspace, server, tag=tag, session_name=session_name)
     elif all_jobs:
-        selected = jobs
+        selected = list_jobs(workspace, server, session_name=session_name)
     else:
         raise MuxdanticUsageError("Select one of: job_id, tag, or all_jobs")
 
     killed: list[str] = []
-    for job in selected:
-        kill_window(job.window_id, server)
-        killed.append(job.window_id)
+    with forget_on_stale(server):
+        for job in selected:
+            kill_window(job.window_id, server)
+            killed.append(job.window_id)
 
     return KillResult(killed=killed)
+
+
+def _find_job(workspace: Path, server: TmuxServerArgs, job_id: str) -> JobInfo:
+    jobs = list_jobs(workspace, server, job_id=job_id)
+    if jobs:
+        return jobs[0]
+    raise MuxdanticUsageError(f"No job found with id {job_id}")
+
+
+def _capture_state_path(server: TmuxServerArgs, job: JobInfo, cache_root: Path | None) -> Path:
+    key = f"{server_selector(server)};job={job.job_id};pane={job.pane_id}"
+    return state_path_for("capture", key, cache_root=cache_root)
+
+
+def capture(
+    workspace: Path,
+    server: TmuxServerArgs,
+    *,
+    job_id: str,
+    start: int | str | None = None,
+    end: int | str | None = None,
+    since_last: bool = False,
+    cache_root: Path | None = None,
+) -> CaptureResult:
+    """Capture a job pane, optionally returning only lines not seen by the previous capture.
+
+    With ``since_last`` the absolute line position reached by the previous
+    capture (``history_size + cursor_y``) is kept in a per-pane state file, and
+    only rows above the cursor that were completed since then are transferred.
+    Offsets stop being exact once the pane reaches its ``history-limit``.
+    """
+    if since_last and (start is not None or end is not None):
+        raise MuxdanticUsageError("since_last cannot be combined with start/end")
+
+    job = _find_job(workspace, server, job_id)
+    with forget_on_stale(server):
+        return _capture_job(job, server, start=start, end=end, since_last=since_last, cache_root=cache_root)
+
+
+def _capture_job(
+    job: JobInfo,
+    server: TmuxServerArgs,
+    *,
+    start: int | str | None,
+    end: int | str | None,
+    since_last: bool,
+    cache_root: Path | None,
+) -> CaptureResult:
+    if not since_last:
+        history_size, _, lines = capture_pane(job.pane_id, server, start=start, end=end)
+        return CaptureResult(job_id=job.job_id, pane_id=job.pane_id, lines=lines, history_size=history_size)
+
+    state_file = _capture_state_path(server, job, cache_root)
+    state = read_json(state_file) or {}
+    done = int(state.get("next_line", 0))
+
+    history_size, cursor_y = pane_history(job.pane_id, server)
+    if done > history_size + cursor_y:
+        # The pane was cleared or reset; resume from the current cursor row.
+        done = history_size + cursor_y
+
+    slack = 0
+    for _ in range(_CAPTURE_ATTEMPTS):
+        rel_start = done - history_size - slack
+        start_arg: int | str = "-" if rel_start <= -history_size else rel_start
+        captured_history, cursor_y, captured = capture_pane(job.pane_id, server, start=start_arg)
+        first_abs = 0 if start_arg == "-" else max(rel_start + captured_history, 0)
+        if first_abs <= done:
+            break
+        # Output scrolled between the two tmux calls; widen the window and retry.
+        slack += 2 * (captured_history - history_size)
+        history_size = captured_history
+
+    next_line = captured_history + cursor_y
+    first_line = max(first_abs, done)
+    lines = captured[first_line - first_abs : max(next_line - first_abs, 0)]
+
+    write_json_atomic(
+        state_file,
+        {
+            "job_id": job.job_id,
+            "pane_id": job.pane_id,
+            "history_size": captured_history,
+            "cursor_y": cursor_y,
+            "next_line": next_line,
+        },
+    )
+    return CaptureResult(
+        job_id=job.job_id,
+        pane_id=job.pane_id,
+        lines=lines,
+        history_size=captured_history,
+        first_line=first_line,
+        next_line=next_line,
+    )
@@ -13,14 +13,16 @@ from muxdantic.models import TmuxServerArgs
 _LOCK_ROOT = Path("~/.cache/muxdantic/lock").expanduser()
 
 
-def _server_selector(server: TmuxServerArgs) -> str:
+def server_selector(server: TmuxServerArgs) -> str:
+    """Render the tmux server selector used in lock and cache keys."""
+
     return f"L={server.socket_name or ''};S={server.socket_path or ''}"
 
 
 def lock_key(server: TmuxServerArgs, session_name: str) -> str:
     """Build the stable lock key from tmux server selector + session name."""
 
-    return f"{_server_selector(server)};session={session_name}"
+    return f"{server_selector(server)};session={session_name}"
 
 
 def lock_filename(server: TmuxServerArgs, session_name: str) -> str:
@@ -59,3 +61,15 @@ def session_lock(
             yield path
         finally:
             fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def unique_lock(
+    server: TmuxServerArgs,
+    session_name: str,
+    key: str,
+    *,
+    lock_root: Path | None = None,
+):
+    """Acquire the per-key lock that serializes ``run --unique`` for one dedupe key."""
+
+    return session_lock(server, f"{session_name};unique={key}", lock_root=lock_root)
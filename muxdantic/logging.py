@@ -2,32 +2,203 @@
 
 from __future__ import annotations
 
+import bisect
+import gzip
+import json
+import os
+import re
 import shlex
 import sys
+from collections import deque
+from collections.abc import Iterator
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any
 
+from muxdantic.cache import cache_dir, read_json, write_json_atomic
 from muxdantic.models import RunRequest, TmuxServerArgs
 from muxdantic.tmux import pipe_pane
 
+_ROTATED_RE = re.compile(r"^\.(?P<index>\d+)(?P<gz>\.gz)?$")
+_TAIL_BLOCK_SIZE = 64 * 1024
+
 
 def resolve_log_file(req: RunRequest, job_id: str) -> Path | None:
     """Resolve the effective JSONL log path for a run request."""
     if req.log_file is not None:
         return req.log_file
     if req.log_dir is not None:
-        return req.log_dir / f"{job_id}.jsonl"
+        suffix = "log" if req.log_format == "raw" else "jsonl"
+        return req.log_dir / f"{job_id}.{suffix}"
     return None
 
 
-def build_sink_command(job_id: str, path: Path) -> str:
-    """Build a shell-safe command for the JSONL logging sink."""
+def log_meta_path_for(log_file: Path) -> Path:
+    """Return the job-metadata sidecar kept next to a log."""
+    return log_file.with_name(f"{log_file.stem}.meta.json")
+
+
+def write_log_meta(log_file: Path, meta: dict[str, Any]) -> None:
+    """Record which job writes ``log_file`` so logs can be selected without reading them."""
+    write_json_atomic(log_meta_path_for(log_file), meta)
+
+
+def read_log_meta(log_file: Path) -> dict[str, Any] | None:
+    return read_json(log_meta_path_for(log_file))
+
+
+def log_segments(log_file: Path) -> list[Path]:
+    """Return a log's rotated segments oldest first, followed by the live file if present.
+
+    Rotated segments follow the logrotate convention: ``<name>.1`` is the most
+    recent, higher numbers are older, and any of them may be gzip-compressed
+    (``<name>.2.gz``).
+    """
+    rotated: list[tuple[int, Path]] = []
+    prefix = log_file.name
+    try:
+        siblings = list(log_file.parent.iterdir())
+    except FileNotFoundError:
+        return []
+    for sibling in siblings:
+        if not sibling.name.startswith(prefix):
+            continue
+        match = _ROTATED_RE.match(sibling.name[len(prefix) :])
+        if match:
+            rotated.append((int(match.group("index")), sibling))
+    segments = [path for _, path in sorted(rotated, reverse=True)]
+    if log_file.is_file():
+        segments.append(log_file)
+    return segments
+
+
+def iter_log_records(log_file: Path) -> Iterator[dict[str, Any]]:
+    """Lazily yield the JSONL records of a log, oldest rotated segment first."""
+    for segment in log_segments(log_file):
+        opener = gzip.open if segment.suffix == ".gz" else open
+        with opener(segment, "rt", encoding="utf-8", errors="replace") as handle:
+            for raw_line in handle:
+                try:
+                    record = json.loads(raw_line)
+                except json.JSONDecodeError:
+                    # A sink killed mid-write leaves a truncated last line.
+                    continue
+                if isinstance(record, dict):
+                    yield record
+
+
+def _parse_record(raw: bytes) -> dict[str, Any] | None:
+    try:
+        record = json.loads(raw.decode("utf-8", errors="replace"))
+    except json.JSONDecodeError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def _lines_backwards(segment: Path, block_size: int) -> Iterator[bytes]:
+    """Yield a segment's lines last first, reading fixed-size blocks from the end of the file."""
+    with segment.open("rb") as handle:
+        position = handle.seek(0, os.SEEK_END)
+        carry = b""
+        while position > 0:
+            size = min(block_size, position)
+            position -= size
+            handle.seek(position)
+            lines = (handle.read(size) + carry).split(b"\n")
+            # The first piece may continue in the previous block.
+            carry = lines.pop(0)
+            yield from reversed(lines)
+        yield carry
+
+
+def _records_backwards(segment: Path, wanted: int, block_size: int) -> Iterator[dict[str, Any]]:
+    if segment.suffix == ".gz":
+        # gzip cannot be read backwards; rotated segments are bounded, so stream
+        # this one and keep only its last ``wanted`` records.
+        last: deque[dict[str, Any]] = deque(maxlen=wanted)
+        with gzip.open(segment, "rb") as handle:
+            for raw_line in handle:
+                record = _parse_record(raw_line)
+                if record is not None:
+                    last.append(record)
+        yield from reversed(last)
+        return
+    for raw_line in _lines_backwards(segment, block_size):
+        # Blank and truncated lines (a sink killed mid-write) are skipped.
+        record = _parse_record(raw_line)
+        if record is not None:
+            yield record
+
+
+def tail_records(log_file: Path, n: int, *, block_size: int = _TAIL_BLOCK_SIZE) -> list[dict[str, Any]]:
+    """Return the last ``n`` JSONL records of a log, oldest first.
+
+    The live file and uncompressed rotated segments are read backwards in
+    ``block_size`` blocks until ``n`` records are found, so the cost depends
+    on ``n`` rather than on the log's size.
+    """
+    newest_first: list[dict[str, Any]] = []
+    if n <= 0:
+        return newest_first
+    for segment in reversed(log_segments(log_file)):
+        for record in _records_backwards(segment, n - len(newest_first), block_size):
+            newest_first.append(record)
+            if len(newest_first) == n:
+                return newest_first[::-1]
+    return newest_first[::-1]
+
+
+def parse_ts(value: str) -> datetime:
+    """Parse a record ``ts`` (ISO-8601, ``Z`` suffix) as an aware UTC datetime."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def sink_stats_path_for(job_id: str, *, cache_root: Path | None = None) -> Path:
+    """Return the stats file a job's logging sink keeps rewriting while it runs."""
+    return cache_dir("sink-stats", cache_root=cache_root) / f"{job_id}.json"
+
+
+def marks_path_for(log_file: Path) -> Path:
+    """Return the timestamp-marks sidecar kept next to a raw log."""
+    return log_file.with_name(f"{log_file.stem}.marks.jsonl")
+
+
+def build_sink_command(
+    job_id: str,
+    path: Path,
+    *,
+    log_format: str = "jsonl",
+    strip_ansi: bool = False,
+    collapse_cr: bool = False,
+    rate_limit: float | None = None,
+    buffer_lines: int | None = None,
+    overflow: str | None = None,
+) -> str:
+    """Build a shell-safe command for the logging sink."""
     python_exe = shlex.quote(sys.executable)
     quoted_job_id = shlex.quote(job_id)
     quoted_path = shlex.quote(str(path))
-    return (
+    quoted_stats = shlex.quote(str(sink_stats_path_for(job_id)))
+    command = (
         f"{python_exe} -m muxdantic.logging_sink "
-        f"--job-id {quoted_job_id} --file {quoted_path}"
+        f"--job-id {quoted_job_id} --file {quoted_path} --stats-file {quoted_stats}"
     )
+    if log_format == "raw":
+        command += f" --format raw --marks-file {shlex.quote(str(marks_path_for(path)))}"
+    if strip_ansi:
+        command += " --strip-ansi"
+    if collapse_cr:
+        command += " --collapse-cr"
+    if rate_limit is not None:
+        command += f" --rate-limit {rate_limit:g}"
+    if buffer_lines is not None:
+        command += f" --buffer-lines {buffer_lines}"
+    if overflow is not None:
+        command += f" --overflow {shlex.quote(overflow)}"
+    return command
 
 
 def pipe_pane_to_jsonl(server: TmuxServerArgs, pane_id: str, job_id: str, path: Path) -> None:
@@ -36,8 +207,58 @@ def pipe_pane_to_jsonl(server: TmuxServerArgs, pane_id: str, job_id: str, path:
     pipe_pane(pane_id, cmd, server)
 
 
-def attach_pipe_pane(server: TmuxServerArgs, pane_id: str, job_id: str, log_file: Path | None) -> None:
-    """Compatibility wrapper used by jobs.run to conditionally attach logging."""
+def attach_pipe_pane(
+    server: TmuxServerArgs,
+    pane_id: str,
+    job_id: str,
+    log_file: Path | None,
+    **sink_options: object,
+) -> None:
+    """Compatibility wrapper used by jobs.run to conditionally attach logging.
+
+    ``sink_options`` are passed through to ``build_sink_command``.
+    """
     if log_file is None:
         return
+    if sink_options:
+        pipe_pane(pane_id, build_sink_command(job_id, log_file, **sink_options), server)
+        return
     pipe_pane_to_jsonl(server, pane_id, job_id, log_file)
+
+
+def _read_marks(marks_file: Path) -> list[dict]:
+    marks: list[dict] = []
+    try:
+        with marks_file.open(encoding="utf-8") as handle:
+            for raw_line in handle:
+                try:
+                    marks.append(json.loads(raw_line))
+                except json.JSONDecodeError:
+                    # A sink killed mid-write leaves a truncated last mark.
+                    continue
+    except FileNotFoundError:
+        pass
+    return marks
+
+
+def raw_to_jsonl_records(log_file: Path, *, job_id: str | None = None) -> Iterator[dict]:
+    """Yield ``logging_sink`` JSONL records for a raw log.
+
+    Lines are split on ``\\n`` exactly as the JSONL sink splits them, and each
+    line gets the ``ts`` of the latest mark at or before the byte offset where
+    it starts.
+    """
+    marks = _read_marks(marks_path_for(log_file))
+    offsets = [mark["offset"] for mark in marks]
+    if job_id is None:
+        job_id = marks[0]["job_id"] if marks else log_file.stem
+
+    offset = 0
+    with log_file.open("rb") as handle:
+        for raw_line in handle:
+            index = bisect.bisect_right(offsets, offset) - 1
+            ts = marks[max(index, 0)]["ts"] if marks else None
+            offset += len(raw_line)
+
+            line = raw_line.decode("utf-8", errors="replace")
+            yield {"ts": ts, "job_id": job_id, "line": line[:-1] if line.endswith("\n") else line}
@@ -1,37 +1,478 @@
-"""JSONL sink process used by tmux pipe-pane."""
+"""JSONL and raw sink processes used by tmux pipe-pane."""
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
+import re
 import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import TextIO
+from typing import Any, BinaryIO, TextIO
+
+from muxdantic.cache import write_json_atomic
+
+OVERFLOW_POLICIES = ("drop-oldest", "drop-newest", "block")
+
+_RAW_CHUNK = 1 << 16
+_MARK_INTERVAL_S = 1.0
+_STATS_INTERVAL_S = 1.0
+
+# CSI sequences (colours, cursor moves, erase), OSC strings (titles, hyperlinks),
+# charset selection and the remaining two-byte escapes.
+_ANSI_RE = re.compile(
+    r"\x1b\[[0-?]*[ -/]*[@-~]"
+    r"|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)"
+    r"|\x1b[()][0-9A-Za-z]"
+    r"|\x1b[@-Z\\-_]"
+)
+# Erase in line: to the end (``K``/``0K``), to the start (``1K``) or all of it (``2K``).
+_ERASE_LINE_RE = re.compile(r"\x1b\[([012]?)K")
+# C0 controls other than tab and carriage return, plus DEL.
+_CONTROL_RE = re.compile(r"[\x00-\x08\x0b-\x0c\x0e-\x1f\x7f]")
+_CONTROL_KEEP_ERASE_RE = re.compile(r"(?!\x1b\[[012]?K)[\x00-\x08\x0b-\x0c\x0e-\x1f\x7f]")
 
 
 def _ts_utc() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
-def stream_jsonl(*, job_id: str, output_file: Path, stdin: TextIO) -> None:
-    """Read lines from stdin and write JSONL records to output_file."""
+def _keep_erase_line(match: re.Match[str]) -> str:
+    return match.group() if _ERASE_LINE_RE.fullmatch(match.group()) else ""
+
+
+def strip_ansi(line: str, *, keep_erase_line: bool = False) -> str:
+    """Remove ANSI escape sequences and stray control characters from ``line``.
+
+    With ``keep_erase_line``, erase-in-line sequences survive for ``collapse_cr``.
+    """
+    if "\x1b" in line:
+        line = _ANSI_RE.sub(_keep_erase_line if keep_erase_line else "", line)
+    return (_CONTROL_KEEP_ERASE_RE if keep_erase_line else _CONTROL_RE).sub("", line)
+
+
+def collapse_cr(line: str) -> str:
+    """Return what a terminal shows after ``line``'s ``\\r``-separated frames overwrite each other.
+
+    Erase-in-line sequences (``\\x1b[K``, ``\\x1b[2K``, ...) clear what earlier
+    frames left behind, so ``"long text\\r\\x1b[2K10%"`` shows ``"10%"``.
+    """
+    if "\r" not in line and "\x1b[" not in line:
+        return line
+    shown = ""
+    for frame in line.split("\r"):
+        cursor = 0
+        pieces = _ERASE_LINE_RE.split(frame)
+        for index in range(0, len(pieces), 2):
+            text = pieces[index]
+            shown = shown[:cursor] + text + shown[cursor + len(text) :]
+            cursor += len(text)
+            if index + 1 < len(pieces):
+                mode = pieces[index + 1]
+                if mode == "2":
+                    shown = " " * cursor
+                elif mode == "1":
+                    shown = " " * cursor + shown[cursor:]
+                else:
+                    shown = shown[:cursor]
+    return shown
+
+
+class _RateLimiter:
+    """Token bucket allowing ``rate`` lines per second with a one-second burst."""
+
+    def __init__(self, rate: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate
+        self.clock = clock
+        self.tokens = rate
+        self.updated = clock()
+
+    def allow(self) -> bool:
+        now = self.clock()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class RingBuffer:
+    """Bounded record queue between the sink's reader and its writer thread.
+
+    Each record is queued with its ``time.perf_counter()`` read time, so the
+    writer can report lag without parsing timestamps.
+    """
+
+    def __init__(self, capacity: int, overflow: str) -> None:
+        self.capacity = capacity
+        self.overflow = overflow
+        self.items: deque[tuple[float, dict[str, Any]]] = deque()
+        self.cond = threading.Condition()
+        self.closed = False
+        self.dropped_lines = 0
+        self.dropped_bytes = 0
+
+    def _drop(self, record: dict[str, Any]) -> None:
+        self.dropped_lines += 1
+        self.dropped_bytes += len(record["line"].encode("utf-8", errors="replace")) + 1
+
+    def count_dropped(self, records: list[dict[str, Any]]) -> None:
+        with self.cond:
+            for record in records:
+                self._drop(record)
+
+    def put(self, record: dict[str, Any]) -> None:
+        with self.cond:
+            if len(self.items) >= self.capacity:
+                if self.overflow == "block":
+                    while len(self.items) >= self.capacity:
+                        self.cond.wait()
+                elif self.overflow == "drop-newest":
+                    self._drop(record)
+                    return
+                else:
+                    self._drop(self.items.popleft()[1])
+            self.items.append((time.perf_counter(), record))
+            self.cond.notify_all()
+
+    def take_all(self) -> list[tuple[float, dict[str, Any]]] | None:
+        """Wait for ``(read_at, record)`` pairs and return all of them, or None once closed and drained."""
+        with self.cond:
+            while not self.items and not self.closed:
+                self.cond.wait()
+            if not self.items:
+                return None
+            batch = list(self.items)
+            self.items.clear()
+            self.cond.notify_all()
+            return batch
+
+    def close(self) -> None:
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+class SinkMeter:
+    """Throughput, flush-latency and lag counters a sink publishes to a stats file.
+
+    The file is rewritten atomically at most once per ``interval`` seconds and
+    a final time, with ``closed`` set, when the sink exits.
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        log_file: Path,
+        stats_file: Path | None,
+        *,
+        interval: float = _STATS_INTERVAL_S,
+    ) -> None:
+        self.job_id = job_id
+        self.log_file = log_file
+        self.stats_file = stats_file
+        self.interval = interval
+        self.started_at = _ts_utc()
+        self.started = time.monotonic()
+        self.next_publish = 0.0
+        self.lines_read = 0
+        self.lines_written = 0
+        self.bytes_written = 0
+        self.skipped_lines = 0
+        self.flush_count = 0
+        self.flush_total_s = 0.0
+        self.flush_max_s = 0.0
+        self.lag_s = 0.0
+        self.buffer: RingBuffer | None = None
+
+    def wrote(self, lines: int, nbytes: int, flush_s: float, lag_s: float) -> None:
+        self.lines_written += lines
+        self.bytes_written += nbytes
+        self.flush_count += 1
+        self.flush_total_s += flush_s
+        self.flush_max_s = max(self.flush_max_s, flush_s)
+        self.lag_s = lag_s
+        self.maybe_publish()
+
+    def maybe_publish(self) -> None:
+        if self.stats_file is not None and time.monotonic() >= self.next_publish:
+            self.publish()
+
+    def publish(self, *, closed: bool = False) -> None:
+        if self.stats_file is None:
+            return
+        self.next_publish = time.monotonic() + self.interval
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        buffer = self.buffer
+        payload = {
+            "job_id": self.job_id,
+            "log_file": str(self.log_file),
+            "pid": os.getpid(),
+            "started_at": self.started_at,
+            "updated_at": _ts_utc(),
+            "closed": closed,
+            "lines_read": self.lines_read,
+            "lines_written": self.lines_written,
+            "bytes_written": self.bytes_written,
+            "lines_per_sec": round(self.lines_written / elapsed, 3),
+            "flush_count": self.flush_count,
+            "flush_latency_avg_ms": round(1000 * self.flush_total_s / self.flush_count, 3) if self.flush_count else 0.0,
+            "flush_latency_max_ms": round(1000 * self.flush_max_s, 3),
+            "lag_s": round(self.lag_s, 6),
+            "buffered_lines": len(buffer.items) if buffer is not None else 0,
+            "dropped_lines": buffer.dropped_lines if buffer is not None else 0,
+            "dropped_bytes": buffer.dropped_bytes if buffer is not None else 0,
+            "skipped_lines": self.skipped_lines,
+        }
+        try:
+            write_json_atomic(self.stats_file, payload)
+        except OSError:
+            # Stats are best-effort; never let them stop the log.
+            pass
+
+
+def _encode_records(records: list[dict[str, Any]]) -> bytes:
+    payload = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    return payload.encode("utf-8", errors="surrogateescape")
+
+
+def _write_batch(fh: BinaryIO, batch: list[tuple[float, dict[str, Any]]], meter: SinkMeter) -> None:
+    """Write a writer-thread batch and record its flush time and the lag of its oldest line."""
+    data = _encode_records([record for _, record in batch])
+    t0 = time.perf_counter()
+    fh.write(data)
+    fh.flush()
+    t1 = time.perf_counter()
+    meter.wrote(len(batch), len(data), t1 - t0, t1 - batch[0][0])
+
+
+def stream_jsonl(
+    *,
+    job_id: str,
+    output_file: Path,
+    stdin: TextIO,
+    strip_ansi_codes: bool = False,
+    collapse_carriage_returns: bool = False,
+    rate_limit: float | None = None,
+    buffer_lines: int | None = None,
+    overflow: str = "drop-oldest",
+    stats_file: Path | None = None,
+) -> None:
+    """Read lines from stdin and write JSONL records to output_file.
+
+    With ``rate_limit`` (lines per second) excess lines are dropped and the
+    next written record carries the number dropped before it as ``skipped``;
+    lines dropped after the last written one are reported in a final
+    ``{"ts", "job_id", "skipped"}`` record.
+
+    With ``buffer_lines``, records pass through a bounded buffer drained by a
+    writer thread, so a slow disk never stalls reading (and therefore the
+    pane). ``overflow`` decides what happens when the buffer is full:
+    ``drop-oldest``, ``drop-newest`` or ``block``. A final
+    ``{"ts", "job_id", "summary"}`` record reports lines and bytes dropped.
+
+    With ``stats_file``, a ``SinkMeter`` publishes live counters there. Flush
+    latency and lag are measured per batch by the writer thread; the
+    unbuffered path only counts lines and bytes.
+    """
+    if overflow not in OVERFLOW_POLICIES:
+        raise ValueError(f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}")
+
+    limiter = _RateLimiter(rate_limit) if rate_limit else None
+    skipped = 0
+    meter = SinkMeter(job_id, output_file, stats_file)
+    # The per-line path only bumps these locals; the meter gets them when it may publish.
+    read_lines = skipped_lines = written_lines = written_bytes = 0
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    with output_file.open("a", encoding="utf-8", buffering=1) as fh:
-        for raw_line in stdin:
-            line = raw_line.rstrip("\n")
-            record = {"ts": _ts_utc(), "job_id": job_id, "line": line}
-            fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+    with output_file.open("ab") as fh:
+        buffer: RingBuffer | None = None
+        writer: threading.Thread | None = None
+        if buffer_lines:
+            buffer = RingBuffer(buffer_lines, overflow)
+            meter.buffer = buffer
+
+            def _drain() -> None:
+                while (batch := buffer.take_all()) is not None:
+                    try:
+                        _write_batch(fh, batch, meter)
+                    except OSError:
+                        # Disk full or gone: keep draining so the reader never backs up.
+                        buffer.count_dropped([record for _, record in batch])
+
+            writer = threading.Thread(target=_drain, name="muxdantic-sink-writer", daemon=True)
+            writer.start()
+
+        def _sync_meter() -> None:
+            meter.lines_read = read_lines
+            meter.skipped_lines = skipped_lines
+            if buffer is None:
+                # Every unbuffered record is flushed on its own; its latency is not timed.
+                meter.lines_written = meter.flush_count = written_lines
+                meter.bytes_written = written_bytes
+
+        def _write(record: dict[str, Any]) -> None:
+            nonlocal written_lines, written_bytes
+            data = _encode_records([record])
+            fh.write(data)
             fh.flush()
+            written_lines += 1
+            written_bytes += len(data)
+
+        try:
+            meter.publish()
+            for raw_line in stdin:
+                read_lines += 1
+                if stats_file is not None and time.monotonic() >= meter.next_publish:
+                    _sync_meter()
+                    if buffer is None:
+                        meter.publish()
+                if limiter is not None and not limiter.allow():
+                    skipped += 1
+                    skipped_lines += 1
+                    continue
+                line = raw_line.rstrip("\n")
+                if strip_ansi_codes:
+                    line = strip_ansi(line, keep_erase_line=collapse_carriage_returns)
+                if collapse_carriage_returns:
+                    line = collapse_cr(line)
+                record: dict[str, Any] = {"ts": _ts_utc(), "job_id": job_id, "line": line}
+                if skipped:
+                    record["skipped"] = skipped
+                    skipped = 0
+                if buffer is not None:
+                    buffer.put(record)
+                else:
+                    _write(record)
+            if skipped:
+                # Lines dropped at the very end have no later record to report them.
+                tail = {"ts": _ts_utc(), "job_id": job_id, "skipped": skipped}
+                if buffer is not None:
+                    buffer.put(tail)
+                else:
+                    _write(tail)
+        finally:
+            _sync_meter()
+            if buffer is not None and writer is not None:
+                buffer.close()
+                writer.join()
+                summary = {
+                    "lines": read_lines,
+                    "dropped_lines": buffer.dropped_lines,
+                    "dropped_bytes": buffer.dropped_bytes,
+                    "overflow": overflow,
+                }
+                summary_record = {"ts": _ts_utc(), "job_id": job_id, "summary": summary}
+                fh.write((json.dumps(summary_record, ensure_ascii=False) + "\n").encode("utf-8"))
+                fh.flush()
+            meter.publish(closed=True)
+
+
+def _copy_chunk(in_fd: int, out_fd: int, use_splice: bool) -> tuple[int, bool]:
+    """Move up to one chunk from ``in_fd`` to ``out_fd``; return ``(bytes, use_splice)``."""
+    if use_splice:
+        try:
+            return os.splice(in_fd, out_fd, _RAW_CHUNK), True
+        except OSError:
+            # Not a pipe, or a filesystem without splice support: copy through userspace.
+            pass
+    data = os.read(in_fd, _RAW_CHUNK)
+    view = memoryview(data)
+    while view:
+        written = os.write(out_fd, view)
+        view = view[written:]
+    return len(data), False
+
+
+def stream_raw(
+    *,
+    job_id: str,
+    output_file: Path,
+    marks_file: Path,
+    in_fd: int,
+    mark_interval: float = _MARK_INTERVAL_S,
+    stats_file: Path | None = None,
+) -> None:
+    """Copy pane bytes from ``in_fd`` to ``output_file`` untouched.
+
+    Bytes move with ``os.splice`` where available, so the sink never looks at
+    line boundaries. Every ``mark_interval`` seconds (at most once per chunk) a
+    ``{"job_id", "offset", "ts"}`` record is appended to ``marks_file``: the
+    bytes starting at ``offset`` arrived at ``ts``.
+
+    Line counters in ``stats_file`` stay at zero since raw mode never splits lines.
+    """
+    meter = SinkMeter(job_id, output_file, stats_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    # splice(2) rejects O_APPEND targets, so seek to the end instead.
+    out_fd = os.open(output_file, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        offset = os.lseek(out_fd, 0, os.SEEK_END)
+        use_splice = hasattr(os, "splice")
+        next_mark = 0.0
+        meter.publish()
+        with marks_file.open("a", encoding="utf-8") as marks:
+            while True:
+                t0 = time.monotonic()
+                copied, use_splice = _copy_chunk(in_fd, out_fd, use_splice)
+                if copied == 0:
+                    break
+                now = time.monotonic()
+                # The copy blocks on the pipe, so its time includes waiting for output.
+                meter.wrote(0, copied, now - t0, 0.0)
+                if now >= next_mark:
+                    marks.write(json.dumps({"job_id": job_id, "offset": offset, "ts": _ts_utc()}) + "\n")
+                    marks.flush()
+                    next_mark = now + mark_interval
+                offset += copied
+    finally:
+        os.close(out_fd)
+        meter.publish(closed=True)
 
 
 def main(argv: list[str] | None = None) -> int:
-    parser = argparse.ArgumentParser(description="muxdantic JSONL logging sink")
+    parser = argparse.ArgumentParser(description="muxdantic logging sink")
     parser.add_argument("--job-id", required=True)
     parser.add_argument("--file", required=True)
+    parser.add_argument("--format", choices=["jsonl", "raw"], default="jsonl")
+    parser.add_argument("--marks-file")
+    parser.add_argument("--strip-ansi", action="store_true")
+    parser.add_argument("--collapse-cr", action="store_true")
+    parser.add_argument("--rate-limit", type=float)
+    parser.add_argument("--buffer-lines", type=int)
+    parser.add_argument("--overflow", choices=OVERFLOW_POLICIES, default="drop-oldest")
+    parser.add_argument("--stats-file")
     args = parser.parse_args(argv)
+    stats_file = Path(args.stats_file) if args.stats_file else None
+
+    if args.format == "raw":
+        if not args.marks_file:
+            parser.error("--format raw requires --marks-file")
+        stream_raw(
+            job_id=args.job_id,
+            output_file=Path(args.file),
+            marks_file=Path(args.marks_file),
+            in_fd=sys.stdin.fileno(),
+            stats_file=stats_file,
+        )
+        return 0
 
-    stream_jsonl(job_id=args.job_id, output_file=Path(args.file), stdin=sys.stdin)
+    stream_jsonl(
+        job_id=args.job_id,
+        output_file=Path(args.file),
+        stdin=sys.stdin,
+        strip_ansi_codes=args.strip_ansi,
+        collapse_carriage_returns=args.collapse_cr,
+        rate_limit=args.rate_limit,
+        buffer_lines=args.buffer_lines,
+        overflow=args.overflow,
+        stats_file=stats_file,
+    )
     return 0
 
 
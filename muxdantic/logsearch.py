@@ -0,0 +1,223 @@
+"""Search and select JSONL job logs written by ``logging_sink``."""
+
+from __future__ import annotations
+
+import gzip
+import heapq
+import json
+import mmap
+import os
+import re
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from muxdantic.errors import MuxdanticUsageError
+from muxdantic.logging import iter_log_records, log_segments, parse_ts, read_log_meta
+from muxdantic.tags import sanitize_tag
+
+_RELATIVE_RE = re.compile(r"^(?P<amount>\d+(?:\.\d+)?)(?P<unit>[smhd])$")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def parse_age(value: str) -> float | None:
+    """Parse an age such as ``30s``, ``15m``, ``2h`` or ``1d`` into seconds; None if it is not one."""
+    match = _RELATIVE_RE.match(value)
+    if not match:
+        return None
+    return float(match.group("amount")) * _UNIT_SECONDS[match.group("unit")]
+
+
+def parse_since(value: str, *, now: datetime | None = None) -> datetime:
+    """Parse ``--since`` as an ISO-8601 time or a relative age such as ``15m``, ``2h`` or ``1d``."""
+    seconds = parse_age(value)
+    if seconds is not None:
+        return (now or datetime.now(timezone.utc)) - timedelta(seconds=seconds)
+    try:
+        return parse_ts(value)
+    except ValueError as exc:
+        raise MuxdanticUsageError(f"--since expects an ISO-8601 time or an age like 15m/2h/1d, got: {value}") from exc
+
+
+def _is_job_log(path: Path) -> bool:
+    return path.suffix == ".jsonl" and not path.name.endswith(".marks.jsonl")
+
+
+def select_logs(log_dir: Path, *, tag: str | None = None, since: datetime | None = None) -> list[dict[str, Any]]:
+    """Return ``{"log_file", "segments", "job_id", "tag"}`` for each JSONL log matching the filters.
+
+    ``tag`` is matched against the ``.meta.json`` sidecar written at run time,
+    so logs are selected without reading them. With ``since``, logs whose
+    newest segment was last modified earlier are skipped.
+    """
+    if not log_dir.is_dir():
+        raise MuxdanticUsageError(f"Log directory not found: {log_dir}")
+
+    wanted_tag = sanitize_tag(tag) if tag is not None else None
+    selected: list[dict[str, Any]] = []
+    for log_file in sorted(path for path in log_dir.iterdir() if _is_job_log(path)):
+        meta = read_log_meta(log_file) or {}
+        if wanted_tag is not None and meta.get("tag") != wanted_tag:
+            continue
+        segments = log_segments(log_file)
+        if not segments:
+            continue
+        if since is not None:
+            newest = max(segment.stat().st_mtime for segment in segments)
+            if datetime.fromtimestamp(newest, timezone.utc) < since:
+                continue
+        selected.append(
+            {
+                "log_file": log_file,
+                "segments": segments,
+                "job_id": meta.get("job_id", log_file.stem),
+                "tag": meta.get("tag"),
+            }
+        )
+    return selected
+
+
+def _match_record(raw: bytes, pattern: str, since: datetime | None) -> dict[str, Any] | None:
+    try:
+        record = json.loads(raw)
+    except ValueError:
+        # A sink killed mid-write leaves a truncated last line.
+        return None
+    if not isinstance(record, dict):
+        return None
+    line = record.get("line")
+    if not isinstance(line, str) or pattern not in line:
+        return None
+    if since is not None:
+        try:
+            if parse_ts(record["ts"]) < since:
+                return None
+        except (KeyError, TypeError, ValueError):
+            return None
+    return record
+
+
+def _scan_mapped(data: mmap.mmap, needle: bytes, pattern: str, since: datetime | None) -> list[dict[str, Any]]:
+    # Jump between occurrences of the encoded pattern; only lines containing it are decoded.
+    matches: list[dict[str, Any]] = []
+    position = data.find(needle)
+    while position != -1:
+        start = data.rfind(b"\n", 0, position) + 1
+        end = data.find(b"\n", position)
+        if end == -1:
+            end = len(data)
+        record = _match_record(data[start:end], pattern, since)
+        if record is not None:
+            matches.append(record)
+        position = data.find(needle, end)
+    return matches
+
+
+def _scan_stream(handle: Any, needle: bytes, pattern: str, since: datetime | None) -> list[dict[str, Any]]:
+    matches: list[dict[str, Any]] = []
+    for raw in handle:
+        if needle not in raw:
+            continue
+        record = _match_record(raw, pattern, since)
+        if record is not None:
+            matches.append(record)
+    return matches
+
+
+def grep_segment(segment: str, pattern: str, since_iso: str | None = None) -> list[dict[str, Any]]:
+    """Return the records of one log segment whose ``line`` contains ``pattern``.
+
+    Runs in a worker process, so arguments are plain strings.
+    """
+    # The sink writes json.dumps(..., ensure_ascii=False), so a line containing
+    # ``pattern`` contains its JSON-escaped UTF-8 bytes verbatim.
+    needle = json.dumps(pattern, ensure_ascii=False)[1:-1].encode("utf-8")
+    since = parse_ts(since_iso) if since_iso is not None else None
+
+    if segment.endswith(".gz"):
+        with gzip.open(segment, "rb") as handle:
+            return _scan_stream(handle, needle, pattern, since)
+
+    with open(segment, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _scan_mapped(data, needle, pattern, since)
+
+
+def grep_logs(
+    log_dir: Path,
+    pattern: str,
+    *,
+    tag: str | None = None,
+    since: datetime | None = None,
+    workers: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield matching records from every selected log segment, in completion order.
+
+    Each yielded record is the sink record plus ``file`` and ``tag``. Segments
+    are scanned on a process pool of ``workers`` processes (default: CPU count).
+    """
+    if not pattern:
+        raise MuxdanticUsageError("logs grep requires a non-empty pattern")
+    if workers is not None and workers < 1:
+        raise MuxdanticUsageError("workers must be at least 1")
+
+    since_iso = since.isoformat() if since is not None else None
+    tasks = [
+        (str(segment), selection)
+        for selection in select_logs(log_dir, tag=tag, since=since)
+        for segment in selection["segments"]
+    ]
+
+    def _annotate(segment: str, selection: dict[str, Any], record: dict[str, Any]) -> dict[str, Any]:
+        return {"file": segment, "tag": selection["tag"], **record}
+
+    if workers == 1 or len(tasks) <= 1:
+        for segment, selection in tasks:
+            for record in grep_segment(segment, pattern, since_iso):
+                yield _annotate(segment, selection, record)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(tasks))) as executor:
+        futures = {
+            executor.submit(grep_segment, segment, pattern, since_iso): (segment, selection)
+            for segment, selection in tasks
+        }
+        for future in as_completed(futures):
+            segment, selection = futures[future]
+            for record in future.result():
+                yield _annotate(segment, selection, record)
+
+
+def _timed_records(log_file: Path, since: datetime | None) -> Iterator[tuple[datetime, dict[str, Any]]]:
+    # A record with a missing or malformed ts keeps its file's previous position.
+    last = _EPOCH
+    for record in iter_log_records(log_file):
+        try:
+            last = parse_ts(record["ts"])
+        except (KeyError, TypeError, ValueError):
+            pass
+        if since is not None and last < since:
+            continue
+        yield last, record
+
+
+def merge_logs(
+    log_dir: Path,
+    *,
+    tag: str | None = None,
+    since: datetime | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield the records of every selected log interleaved in ``ts`` order.
+
+    Each log is read lazily and merged with ``heapq.merge``, so memory stays
+    proportional to the number of logs rather than their size. Records of a
+    single log keep their written order.
+    """
+    streams = [_timed_records(selection["log_file"], since) for selection in select_logs(log_dir, tag=tag, since=since)]
+    for _, record in heapq.merge(*streams, key=lambda item: item[0]):
+        yield record
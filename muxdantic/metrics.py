@@ -0,0 +1,108 @@
+"""Sink and job metrics aggregated for JSON and Prometheus text-file output."""
+
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from muxdantic.cache import cache_dir, read_json
+from muxdantic.logging import parse_ts, read_log_meta
+from muxdantic.models import JobCount, JobInfo, SinkStats, StatsReport
+
+_SINK_METRICS = (
+    # (metric suffix, type, help, SinkStats field, scale)
+    ("lines_read_total", "counter", "Lines read from the pane.", "lines_read", 1),
+    ("lines_written_total", "counter", "Records written to the log.", "lines_written", 1),
+    ("bytes_written_total", "counter", "Bytes written to the log.", "bytes_written", 1),
+    ("dropped_lines_total", "counter", "Lines dropped by a full sink buffer.", "dropped_lines", 1),
+    ("dropped_bytes_total", "counter", "Bytes dropped by a full sink buffer.", "dropped_bytes", 1),
+    ("skipped_lines_total", "counter", "Lines skipped by the sink rate limit.", "skipped_lines", 1),
+    ("lines_per_second", "gauge", "Average records written per second.", "lines_per_sec", 1),
+    ("flush_latency_avg_seconds", "gauge", "Average write+flush latency.", "flush_latency_avg_ms", 0.001),
+    ("flush_latency_max_seconds", "gauge", "Maximum write+flush latency.", "flush_latency_max_ms", 0.001),
+    ("lag_seconds", "gauge", "Age of the oldest record in the last written batch.", "lag_s", 1),
+    ("buffered_lines", "gauge", "Records waiting in the sink buffer.", "buffered_lines", 1),
+)
+
+
+def read_sink_stats(
+    *,
+    max_age: float | None = None,
+    cache_root: Path | None = None,
+    now: datetime | None = None,
+) -> list[SinkStats]:
+    """Read every sink stats file, skipping ones not updated within ``max_age`` seconds."""
+    root = cache_dir("sink-stats", cache_root=cache_root)
+    if not root.is_dir():
+        return []
+
+    current = now or datetime.now(timezone.utc)
+    sinks: list[SinkStats] = []
+    for path in sorted(root.glob("*.json")):
+        payload = read_json(path)
+        if payload is None:
+            continue
+        try:
+            stats = SinkStats.model_validate(payload)
+            updated = parse_ts(stats.updated_at)
+        except (ValidationError, ValueError):
+            continue
+        if max_age is not None and (current - updated).total_seconds() > max_age:
+            continue
+        meta = read_log_meta(Path(stats.log_file)) or {}
+        sinks.append(stats.model_copy(update={"tag": meta.get("tag")}))
+    return sinks
+
+
+def count_jobs(jobs: list[JobInfo]) -> list[JobCount]:
+    """Count jobs by state and tag."""
+    counts = Counter((job.state, job.tag) for job in jobs)
+    return [JobCount(state=state, tag=tag, count=count) for (state, tag), count in sorted(counts.items())]
+
+
+def build_report(jobs: list[JobInfo], sinks: list[SinkStats]) -> StatsReport:
+    generated_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    return StatsReport(generated_at=generated_at, jobs=count_jobs(jobs), sinks=sinks)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels.items())
+
+
+def render_prometheus(report: StatsReport) -> str:
+    """Render a report in the Prometheus text exposition format (for node_exporter's textfile collector)."""
+    lines = [
+        "# HELP muxdantic_jobs Jobs by state and tag.",
+        "# TYPE muxdantic_jobs gauge",
+    ]
+    for job_count in report.jobs:
+        lines.append(f"muxdantic_jobs{{{_labels(state=job_count.state, tag=job_count.tag)}}} {job_count.count}")
+
+    lines.extend(
+        [
+            "# HELP muxdantic_sink_up Whether the job's logging sink is still running.",
+            "# TYPE muxdantic_sink_up gauge",
+        ]
+    )
+    for sink in report.sinks:
+        lines.append(f"muxdantic_sink_up{{{_labels(job_id=sink.job_id, tag=sink.tag or '')}}} {0 if sink.closed else 1}")
+
+    for suffix, metric_type, help_text, field, scale in _SINK_METRICS:
+        name = f"muxdantic_sink_{suffix}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for sink in report.sinks:
+            value = _format_value(getattr(sink, field) * scale)
+            lines.append(f"{name}{{{_labels(job_id=sink.job_id, tag=sink.tag or '')}}} {value}")
+    return "\n".join(lines) + "\n"
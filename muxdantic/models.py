@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
@@ -29,6 +29,9 @@ class TmuxServerArgs(BaseModel):
 class EnsureRequest(BaseModel):
     workspace: Path
     server: TmuxServerArgs = Field(default_factory=TmuxServerArgs)
+    pool_size: int = Field(default=0, ge=0)
+    loader: Literal["tmuxp", "native"] = "tmuxp"
+    session_cache: bool = False
 
     model_config = ConfigDict(extra="forbid")
 
@@ -47,12 +50,34 @@ class RunRequest(BaseModel):
     tag: str
     cmd: list[str]
 
+    launch: Literal["send-keys", "direct"] = "send-keys"
+    cwd: Path | None = None
+    env: dict[str, str] = Field(default_factory=dict)
+
     keep: bool = False
     rm: bool = False
     keep_on_fail: bool = True
 
     log_dir: Path | None = None
     log_file: Path | None = None
+    log_format: Literal["jsonl", "raw"] = "jsonl"
+    log_strip_ansi: bool = False
+    log_collapse_cr: bool = False
+    log_rate_limit: float | None = Field(default=None, gt=0)
+    log_buffer_lines: int | None = Field(default=None, ge=1)
+    log_overflow: Literal["drop-oldest", "drop-newest", "block"] = "drop-oldest"
+
+    record_result: bool = False
+    notify: bool = False
+    wait: bool = False
+    timeout: float | None = Field(default=None, gt=0)
+
+    pool_size: int = Field(default=0, ge=0)
+    pool_replenish: bool = True
+    shard_cap: int | None = Field(default=None, ge=1)
+    unique: bool = False
+    unique_key: str | None = Field(default=None, min_length=1)
+    session_cache: bool = False
 
     model_config = ConfigDict(extra="forbid")
 
@@ -65,6 +90,23 @@ class RunRequest(BaseModel):
         self.tag = sanitize_tag(self.tag)
         if not self.cmd:
             raise ValueError("cmd must contain at least one argument")
+        for key in self.env:
+            if not key or "=" in key:
+                raise ValueError(f"Invalid environment variable name: {key!r}")
+        if self.timeout is not None and not self.wait:
+            raise ValueError("timeout requires wait")
+        if self.launch == "direct" and self.pool_size:
+            raise ValueError("pool_size requires launch='send-keys'")
+        if self.log_format == "raw" and (
+            self.log_strip_ansi or self.log_collapse_cr or self.log_rate_limit or self.log_buffer_lines
+        ):
+            raise ValueError(
+                "log_strip_ansi, log_collapse_cr, log_rate_limit and log_buffer_lines require log_format='jsonl'"
+            )
+        if self.log_overflow != "drop-oldest" and self.log_buffer_lines is None:
+            raise ValueError("log_overflow requires log_buffer_lines")
+        if self.unique_key is not None and not self.unique:
+            raise ValueError("unique_key requires unique")
         return self
 
 
@@ -77,6 +119,74 @@ class JobRef(BaseModel):
     window_name: str
     pane_id: str
     log_file: Path | None = None
+    result_file: Path | None = None
+    exit_status: int | None = None
+    server: str | None = None
+    deduplicated: bool = False
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class JobResult(BaseModel):
+    job_id: str
+    cmd: list[str]
+    exit_status: int | None
+    signal: int | None = None
+    started_at: str
+    ended_at: str
+    wall_time_s: float
+    user_cpu_s: float
+    sys_cpu_s: float
+    max_rss_kb: int
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class JobStats(BaseModel):
+    cpu_percent: float
+    rss_kb: int
+    threads: int
+    processes: int
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class SinkStats(BaseModel):
+    job_id: str
+    log_file: str
+    pid: int
+    started_at: str
+    updated_at: str
+    closed: bool
+    lines_read: int
+    lines_written: int
+    bytes_written: int
+    lines_per_sec: float
+    flush_count: int
+    flush_latency_avg_ms: float
+    flush_latency_max_ms: float
+    lag_s: float
+    buffered_lines: int
+    dropped_lines: int
+    dropped_bytes: int
+    skipped_lines: int
+    tag: str | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class JobCount(BaseModel):
+    state: str
+    tag: str
+    count: int
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class StatsReport(BaseModel):
+    generated_at: str
+    jobs: list[JobCount]
+    sinks: list[SinkStats]
 
     model_config = ConfigDict(extra="forbid")
 
@@ -93,7 +203,16 @@ class JobInfo(BaseModel):
     pane_dead: int
     pane_dead_status: int | None = None
     pane_dead_time: int | None = None
+    pane_pid: int | None = None
     state: Literal["running", "exited"]
+    cmd: list[str] | None = None
+    log_file: Path | None = None
+    workspace: str | None = None
+    requester: str | None = None
+    key: str | None = None
+    server: str | None = None
+    result: JobResult | None = None
+    stats: JobStats | None = None
 
     model_config = ConfigDict(extra="forbid")
 
@@ -102,3 +221,109 @@ class KillResult(BaseModel):
     killed: list[str]
 
     model_config = ConfigDict(extra="forbid")
+
+
+class FanOutResult(BaseModel):
+    """Per-server results of one operation fanned out across tmux servers."""
+
+    results: dict[str, Any]
+    errors: dict[str, str]
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class CaptureResult(BaseModel):
+    job_id: str
+    pane_id: str
+    lines: list[str]
+    history_size: int
+    first_line: int | None = None
+    next_line: int | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class GraphNode(BaseModel):
+    name: str
+    cmd: list[str]
+    tag: str | None = None
+    depends_on: list[str] = Field(default_factory=list)
+
+    launch: Literal["send-keys", "direct"] = "send-keys"
+    cwd: Path | None = None
+    env: dict[str, str] = Field(default_factory=dict)
+
+    keep: bool = False
+    rm: bool = False
+    keep_on_fail: bool = True
+
+    log_dir: Path | None = None
+    log_file: Path | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+    def to_run_request(self, workspace: Path, server: TmuxServerArgs) -> RunRequest:
+        fields = self.model_dump(exclude={"name", "tag", "depends_on"})
+        return RunRequest(
+            workspace=workspace,
+            server=server,
+            tag=self.tag or self.name,
+            notify=True,
+            **fields,
+        )
+
+
+class GraphRequest(BaseModel):
+    workspace: Path
+    server: TmuxServerArgs = Field(default_factory=TmuxServerArgs)
+    nodes: list[GraphNode]
+    max_parallel: int = Field(default=4, ge=1)
+
+    model_config = ConfigDict(extra="forbid")
+
+    @model_validator(mode="after")
+    def _validate_graph(self) -> "GraphRequest":
+        names = [node.name for node in self.nodes]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"duplicate node names: {', '.join(duplicates)}")
+        known = set(names)
+        for node in self.nodes:
+            node.to_run_request(self.workspace, self.server)
+            missing = [dep for dep in node.depends_on if dep not in known]
+            if missing:
+                raise ValueError(f"node {node.name!r} depends on unknown nodes: {', '.join(missing)}")
+
+        deps = {node.name: set(node.depends_on) for node in self.nodes}
+        while deps:
+            ready = [name for name, pending in deps.items() if not pending]
+            if not ready:
+                raise ValueError(f"dependency cycle between nodes: {', '.join(sorted(deps))}")
+            for name in ready:
+                del deps[name]
+            for pending in deps.values():
+                pending.difference_update(ready)
+        return self
+
+
+class GraphNodeResult(BaseModel):
+    name: str
+    status: Literal["succeeded", "failed", "skipped"]
+    job_id: str | None = None
+    exit_status: int | None = None
+    started_at: str | None = None
+    ended_at: str | None = None
+    duration_s: float | None = None
+    error: str | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class GraphResult(BaseModel):
+    succeeded: bool
+    nodes: list[GraphNodeResult]
+    wall_time_s: float
+    critical_path: list[str]
+    critical_path_s: float
+
+    model_config = ConfigDict(extra="forbid")
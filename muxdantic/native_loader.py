@@ -0,0 +1,170 @@
+"""Build a tmuxp workspace's session with one batched tmux invocation.
+
+``tmuxp load`` starts a second Python interpreter and drives tmux one command
+at a time. For workspaces that only use the common part of the tmuxp schema,
+``load_native`` translates the config into a single ``tmux`` command chain
+instead. Configs using anything else (options, hooks, ``before_script``,
+pane ``enter``/``sleep`` settings, ...) are loaded with ``tmuxp`` as before.
+
+Supported keys:
+
+- session: ``session_name``/``session``, ``start_directory``, ``shell_command_before``, ``windows``
+- window: ``window_name``, ``start_directory``, ``layout``, ``shell_command_before``, ``panes``
+- pane: a command string, a list of command strings, ``null``/``blank``/``pane``, or a mapping
+  with ``shell_command`` and ``start_directory``
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from muxdantic.errors import MuxdanticSubprocessError
+from muxdantic.models import TmuxServerArgs
+from muxdantic.tmux import chain, session_option, tmux, tmuxp
+from muxdantic.workspace import extract_session_name
+
+SESSION_KEYS = frozenset({"session_name", "session", "start_directory", "shell_command_before", "windows"})
+WINDOW_KEYS = frozenset({"window_name", "start_directory", "layout", "shell_command_before", "panes"})
+PANE_KEYS = frozenset({"shell_command", "start_directory"})
+_BLANK_PANES = frozenset({"blank", "pane"})
+# Set on the session right after ``new-session`` so cleanup only kills a session this load created.
+_LOADING_OPTION = "@mux_loading"
+
+
+class _Unsupported(Exception):
+    """Raised while planning when the config needs ``tmuxp``."""
+
+
+def _commands(value: Any) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return list(value)
+    raise _Unsupported
+
+
+def _directory(value: Any, parent: str | None) -> str | None:
+    if value is None:
+        return parent
+    if not isinstance(value, str):
+        raise _Unsupported
+    expanded = os.path.expandvars(os.path.expanduser(value))
+    if parent is not None and not os.path.isabs(expanded):
+        expanded = os.path.normpath(os.path.join(parent, expanded))
+    return expanded
+
+
+def _pane(value: Any, window_directory: str | None) -> tuple[list[str], str | None]:
+    if value is None or (isinstance(value, str) and value in _BLANK_PANES):
+        return [], window_directory
+    if isinstance(value, dict):
+        if not set(value) <= PANE_KEYS:
+            raise _Unsupported
+        return _commands(value.get("shell_command")), _directory(value.get("start_directory"), window_directory)
+    return _commands(value), window_directory
+
+
+def plan_session(cfg: dict[str, Any], workspace: Path) -> list[list[str]] | None:
+    """Return the tmux commands that build ``cfg``'s session, or None if ``cfg`` needs ``tmuxp``.
+
+    Commands target the session's current window and pane, which each
+    ``new-window`` and ``split-window`` moves to the one it just created.
+    """
+    try:
+        return _plan(cfg, workspace)
+    except _Unsupported:
+        return None
+
+
+def _plan(cfg: dict[str, Any], workspace: Path) -> list[list[str]]:
+    if not set(cfg) <= SESSION_KEYS:
+        raise _Unsupported
+    windows = cfg.get("windows")
+    if not isinstance(windows, list) or not windows:
+        raise _Unsupported
+
+    session_name = extract_session_name(cfg)
+    target = f"={session_name}:"
+    # Like tmuxp: a relative start_directory is relative to the workspace file, a missing one means the cwd.
+    session_directory = (
+        str(Path.cwd())
+        if cfg.get("start_directory") is None
+        else _directory(cfg["start_directory"], str(workspace.parent))
+    )
+    session_before = _commands(cfg.get("shell_command_before"))
+
+    commands: list[list[str]] = []
+    for index, window in enumerate(windows):
+        if not isinstance(window, dict) or not set(window) <= WINDOW_KEYS:
+            raise _Unsupported
+        window_name = window.get("window_name")
+        layout = window.get("layout")
+        if (window_name is not None and not isinstance(window_name, str)) or (
+            layout is not None and not isinstance(layout, str)
+        ):
+            raise _Unsupported
+        window_directory = _directory(window.get("start_directory"), session_directory)
+        before = session_before + _commands(window.get("shell_command_before"))
+        panes = window.get("panes") or [None]
+        if not isinstance(panes, list):
+            raise _Unsupported
+
+        for pane_index, pane in enumerate(panes):
+            pane_commands, pane_directory = _pane(pane, window_directory)
+            spawn = ["-c", pane_directory] if pane_directory else []
+            if pane_index > 0:
+                commands.append(["split-window", "-t", target, *spawn])
+            elif index == 0:
+                name = ["-n", window_name] if window_name else []
+                commands.append(["new-session", "-d", "-s", session_name, *name, *spawn])
+            else:
+                name = ["-n", window_name] if window_name else []
+                commands.append(["new-window", "-t", target, *name, *spawn])
+            if layout and pane_index > 0:
+                # Re-layout after every split, as tmuxp does, so later splits find room.
+                commands.append(["select-layout", "-t", target, layout])
+            for command in before + pane_commands:
+                commands.append(["send-keys", "-t", target, "-l", "--", command])
+                commands.append(["send-keys", "-t", target, "Enter"])
+
+        # The last pane created is the highest-numbered one, so '+' wraps to the first.
+        commands.append(["select-pane", "-t", f"{target}.+"])
+
+    commands.append(["select-window", "-t", f"{target}^"])
+    return commands
+
+
+def load_native(cfg: dict[str, Any], workspace: Path, server: TmuxServerArgs) -> bool:
+    """Create ``cfg``'s session with one tmux invocation; fall back to ``tmuxp load`` when unsupported.
+
+    Returns True when the native path built the session. A chain that fails
+    after ``new-session`` kills the half-built session before re-raising, so
+    the next ``ensure`` starts clean; a session that already existed (and made
+    ``new-session`` fail) is left alone.
+    """
+    commands = plan_session(cfg, workspace)
+    if commands is None:
+        tmuxp(["load", "-d", "--yes", str(workspace)], server)
+        return False
+
+    session_name = extract_session_name(cfg)
+    token = uuid4().hex
+    new_session, *rest = commands
+    marked = [
+        new_session,
+        ["set-option", "-t", f"={session_name}:", _LOADING_OPTION, token],
+        *rest,
+        ["set-option", "-u", "-t", f"={session_name}:", _LOADING_OPTION],
+    ]
+    try:
+        tmux(chain(*marked), server)
+    except MuxdanticSubprocessError:
+        if session_option(session_name, _LOADING_OPTION, server) == token:
+            tmux(["kill-session", "-t", f"={session_name}"], server)
+        raise
+    return True
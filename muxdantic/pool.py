@@ -0,0 +1,98 @@
+"""Warm pool of pre-spawned idle windows used to cut job start latency.
+
+Pool windows live in a detached companion session (``<session>-pool``) so they
+never show up next to the user's windows or in ``ls-jobs``. Each one already
+has an interactive shell past its rc-file startup; ``claim_pool_window`` moves
+one into the job session under the job's window name.
+"""
+
+from __future__ import annotations
+
+from uuid import uuid4
+
+from muxdantic.errors import MuxdanticSubprocessError
+from muxdantic.locking import session_lock
+from muxdantic.models import TmuxServerArgs
+from muxdantic.tmux import (
+    has_session,
+    kill_window,
+    list_session_panes,
+    move_window,
+    new_session,
+    new_window,
+    session_path,
+)
+
+POOL_WINDOW_PREFIX = "pool:"
+
+
+def pool_session_name(session_name: str) -> str:
+    return f"{session_name}-pool"
+
+
+def _pool_window_name() -> str:
+    return f"{POOL_WINDOW_PREFIX}{uuid4().hex[:12]}"
+
+
+def _idle_windows(pool_session: str, server: TmuxServerArgs) -> list[tuple[str, str]]:
+    """Return ``(window_id, pane_id)`` for live pool windows, killing dead ones."""
+    try:
+        panes = list_session_panes(pool_session, server)
+    except MuxdanticSubprocessError:
+        # No pool session yet (or it closed with its last window).
+        return []
+
+    idle: list[tuple[str, str]] = []
+    for window_id, window_name, pane_id, pane_dead in panes:
+        if not window_name.startswith(POOL_WINDOW_PREFIX):
+            continue
+        if pane_dead:
+            kill_window(window_id, server)
+            continue
+        idle.append((window_id, pane_id))
+    return idle
+
+
+def fill_pool(session_name: str, size: int, server: TmuxServerArgs) -> int:
+    """Top the pool for ``session_name`` up to ``size`` idle windows; return how many were added."""
+    if size <= 0:
+        return 0
+
+    pool_session = pool_session_name(session_name)
+    with session_lock(server, pool_session):
+        idle = _idle_windows(pool_session, server)
+        missing = size - len(idle)
+        if missing <= 0:
+            return 0
+
+        # Pool shells start where the job session's own windows would.
+        start_directory = session_path(session_name, server)
+        added = 0
+        if not idle and not has_session(pool_session, server):
+            new_session(pool_session, _pool_window_name(), server, start_directory=start_directory)
+            added += 1
+        while added < missing:
+            new_window(pool_session, _pool_window_name(), server, start_directory=start_directory)
+            added += 1
+        return added
+
+
+def claim_pool_window(
+    session_name: str,
+    window_name: str,
+    server: TmuxServerArgs,
+    *,
+    target_session: str | None = None,
+) -> tuple[str, str] | None:
+    """Move an idle pool window into ``session_name`` (or ``target_session``) as ``window_name``.
+
+    Returns ``(window_id, pane_id)``, or None when the pool is empty.
+    """
+    pool_session = pool_session_name(session_name)
+    with session_lock(server, pool_session):
+        idle = _idle_windows(pool_session, server)
+        if not idle:
+            return None
+        window_id, pane_id = idle[0]
+        move_window(window_id, target_session or session_name, window_name, server)
+        return window_id, pane_id
@@ -0,0 +1,102 @@
+"""Per-job process-tree CPU and memory stats from a single ``/proc`` scan."""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from muxdantic.models import JobStats
+
+_PROC_ROOT = Path("/proc")
+
+
+class ProcEntry(NamedTuple):
+    ppid: int
+    cpu_ticks: int
+    rss_pages: int
+    threads: int
+
+
+class ProcSnapshot(NamedTuple):
+    taken_at: float
+    entries: dict[int, ProcEntry]
+    children: dict[int, list[int]]
+
+
+def proc_available(*, proc_root: Path | None = None) -> bool:
+    """Return True when a Linux-style ``/proc`` filesystem can be scanned."""
+    return (proc_root or _PROC_ROOT).joinpath("self", "stat").is_file()
+
+
+def _parse_stat(raw: str) -> ProcEntry:
+    # ``comm`` may contain spaces and parentheses; fields resume after the last ')'.
+    fields = raw[raw.rindex(")") + 2 :].split()
+    return ProcEntry(
+        ppid=int(fields[1]),
+        cpu_ticks=int(fields[11]) + int(fields[12]),
+        rss_pages=int(fields[21]),
+        threads=int(fields[17]),
+    )
+
+
+def scan_proc(*, proc_root: Path | None = None) -> ProcSnapshot:
+    """Read every ``/proc/<pid>/stat`` once and index processes by parent."""
+    root = proc_root or _PROC_ROOT
+    entries: dict[int, ProcEntry] = {}
+    children: dict[int, list[int]] = {}
+    taken_at = time.monotonic()
+    with os.scandir(root) as it:
+        for dirent in it:
+            if not dirent.name.isdigit():
+                continue
+            try:
+                with open(os.path.join(dirent.path, "stat"), encoding="utf-8", errors="replace") as handle:
+                    entry = _parse_stat(handle.read())
+            except (OSError, ValueError, IndexError):
+                # The process exited mid-scan or its stat line is unreadable.
+                continue
+            pid = int(dirent.name)
+            entries[pid] = entry
+            children.setdefault(entry.ppid, []).append(pid)
+    return ProcSnapshot(taken_at=taken_at, entries=entries, children=children)
+
+
+def process_tree(snapshot: ProcSnapshot, root_pid: int) -> list[int]:
+    """Return ``root_pid`` and all of its descendants present in ``snapshot``."""
+    if root_pid not in snapshot.entries:
+        return []
+    tree: list[int] = []
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(snapshot.children.get(pid, ()))
+    return tree
+
+
+def tree_stats(before: ProcSnapshot, after: ProcSnapshot, root_pid: int) -> JobStats | None:
+    """Compute CPU%, RSS and thread totals for one process tree between two scans."""
+    pids = process_tree(after, root_pid)
+    if not pids:
+        return None
+
+    elapsed = max(after.taken_at - before.taken_at, 1e-6)
+    ticks = 0
+    rss_pages = 0
+    threads = 0
+    for pid in pids:
+        entry = after.entries[pid]
+        previous = before.entries.get(pid)
+        # Processes born between the scans count all of their CPU time.
+        ticks += entry.cpu_ticks - (previous.cpu_ticks if previous is not None else 0)
+        rss_pages += entry.rss_pages
+        threads += entry.threads
+
+    return JobStats(
+        cpu_percent=round(100.0 * ticks / os.sysconf("SC_CLK_TCK") / elapsed, 1),
+        rss_kb=rss_pages * os.sysconf("SC_PAGE_SIZE") // 1024,
+        threads=threads,
+        processes=len(pids),
+    )
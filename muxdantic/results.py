@@ -0,0 +1,52 @@
+"""Exit-status/runtime sidecars recorded by the job wrapper."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from muxdantic.cache import cache_dir, read_json
+from muxdantic.models import JobResult, TmuxServerArgs
+
+
+def result_path_for(job_id: str, *, cache_root: Path | None = None) -> Path:
+    """Return the canonical result sidecar path for a job."""
+    return cache_dir("results", cache_root=cache_root) / f"{job_id}.json"
+
+
+def log_sidecar_path_for(log_file: Path) -> Path:
+    """Return the result sidecar path kept next to a job log."""
+    return log_file.with_name(f"{log_file.stem}.result.json")
+
+
+def build_wrapper_argv(
+    job_id: str,
+    cmd: list[str],
+    result_files: list[Path],
+    *,
+    notify_channel: str | None = None,
+    server: TmuxServerArgs | None = None,
+) -> list[str]:
+    """Build the argv that runs ``cmd`` under the job wrapper."""
+    argv = [sys.executable, "-m", "muxdantic.job_wrapper", "--job-id", job_id]
+    for result_file in result_files:
+        argv.extend(["--result-file", str(result_file)])
+    if notify_channel:
+        argv.extend(["--notify-channel", notify_channel])
+        if server is not None:
+            argv.extend(server.to_tmux_args())
+    argv.extend(["--", *cmd])
+    return argv
+
+
+def read_result(job_id: str, *, cache_root: Path | None = None) -> JobResult | None:
+    """Read a job's recorded result without querying tmux."""
+    payload = read_json(result_path_for(job_id, cache_root=cache_root))
+    if payload is None:
+        return None
+    try:
+        return JobResult.model_validate(payload)
+    except ValidationError:
+        return None
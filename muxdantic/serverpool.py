@@ -0,0 +1,135 @@
+"""Spread one workspace's jobs over a pool of tmux servers.
+
+A tmux server is a single-threaded event loop, so many busy jobs on one server
+slow down every command sent to it. A server pool of size ``N`` derives ``N``
+servers from one ``TmuxServerArgs`` (``-L build`` becomes ``build-0`` ...
+``build-N-1``); each member runs its own copy of the workspace session. ``run``
+places a job on one member, and listing and kill aggregate over the members
+that are running.
+"""
+
+from __future__ import annotations
+
+import os
+import stat
+import zlib
+from collections.abc import Callable
+from pathlib import Path
+from typing import Literal
+
+from muxdantic.errors import MuxdanticUsageError
+from muxdantic.fanout import DEFAULT_MAX_PARALLEL, fan_out, server_label, socket_file
+from muxdantic.jobs import kill, list_jobs, run
+from muxdantic.models import FanOutResult, JobInfo, JobRef, RunRequest, TmuxServerArgs
+from muxdantic.tags import sanitize_tag
+
+Placement = Literal["least-loaded", "hash"]
+
+
+def pool_servers(server: TmuxServerArgs, size: int) -> list[TmuxServerArgs]:
+    """Return the ``size`` servers derived from ``server``, in pool order."""
+    if size < 1:
+        raise MuxdanticUsageError("server pool size must be at least 1")
+    if server.socket_path:
+        return [TmuxServerArgs(socket_path=f"{server.socket_path}-{index}") for index in range(size)]
+    base = server.socket_name or "default"
+    return [TmuxServerArgs(socket_name=f"{base}-{index}") for index in range(size)]
+
+
+def is_running(server: TmuxServerArgs) -> bool:
+    """Return True when the server's socket exists; pool members start on their first job."""
+    try:
+        return stat.S_ISSOCK(os.stat(socket_file(server)).st_mode)
+    except OSError:
+        return False
+
+
+def gather_jobs(
+    servers: list[TmuxServerArgs],
+    lister: Callable[[TmuxServerArgs], list[JobInfo]],
+    *,
+    max_parallel: int = DEFAULT_MAX_PARALLEL,
+) -> tuple[list[JobInfo], dict[str, str]]:
+    """Call ``lister`` on every running server in parallel and return one flat list.
+
+    Each job carries its server's label in ``server``; jobs keep pool order.
+    A member that fails (a stale socket, a server that stopped answering) is
+    left out of the list and reported in the returned errors, keyed by label.
+    """
+    running = [server for server in servers if is_running(server)]
+    listed = fan_out(running, lister, max_parallel=max_parallel)
+    jobs = [
+        job.model_copy(update={"server": server_label(server)})
+        for server in running
+        for job in listed.results.get(server_label(server), [])
+    ]
+    return jobs, listed.errors
+
+
+def kill_pool_jobs(
+    workspace: Path,
+    server: TmuxServerArgs,
+    size: int,
+    *,
+    job_id: str | None,
+    tag: str | None,
+    all_jobs: bool,
+    max_parallel: int = DEFAULT_MAX_PARALLEL,
+) -> FanOutResult:
+    """Kill matching jobs on every running member of the pool; results are keyed by server."""
+    running = [member for member in pool_servers(server, size) if is_running(member)]
+    return fan_out(
+        running,
+        lambda member: kill(workspace, member, job_id=job_id, tag=tag, all_jobs=all_jobs),
+        max_parallel=max_parallel,
+    )
+
+
+def choose_server(
+    servers: list[TmuxServerArgs],
+    *,
+    placement: Placement,
+    tag: str,
+    loads: Callable[[], dict[str, int]],
+) -> TmuxServerArgs:
+    """Pick the pool member for a new job.
+
+    ``hash`` maps a tag to the same member every time; ``least-loaded`` picks
+    the member with the fewest jobs (from ``loads()``), lowest index on ties.
+    """
+    if placement == "hash":
+        # crc32 rather than hash(): str hashes are salted per process.
+        return servers[zlib.crc32(sanitize_tag(tag).encode("utf-8")) % len(servers)]
+    counts = loads()
+    return min(servers, key=lambda server: counts.get(server_label(server), 0))
+
+
+def job_counts(workspace: Path, servers: list[TmuxServerArgs]) -> dict[str, int]:
+    """Return the number of the workspace's running jobs on each server, keyed by label.
+
+    Exited windows kept by ``--keep`` are not load, so they are not counted.
+    """
+    counts = {server_label(server): 0 for server in servers}
+    jobs, _ = gather_jobs(servers, lambda member: list_jobs(workspace, member, state="running"))
+    for job in jobs:
+        counts[job.server] += 1
+    return counts
+
+
+def run_in_pool(req: RunRequest, size: int, *, placement: Placement = "least-loaded") -> JobRef:
+    """Start a job on the pool member chosen by ``placement`` and report that member in ``server``.
+
+    ``unique`` runs are rejected: the dedupe check and its lock only see the
+    chosen member, so a duplicate on another member would go unnoticed.
+    """
+    if req.unique:
+        raise MuxdanticUsageError("--unique cannot be combined with --server-pool")
+    servers = pool_servers(req.server, size)
+    target = choose_server(
+        servers,
+        placement=placement,
+        tag=req.tag,
+        loads=lambda: job_counts(req.workspace, servers),
+    )
+    job_ref = run(req.model_copy(update={"server": target}))
+    return job_ref.model_copy(update={"server": server_label(target)})
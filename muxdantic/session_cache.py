@@ -0,0 +1,128 @@
+"""Remember which sessions exist on a tmux server without asking tmux again.
+
+An entry records the server's socket inode and the server process's pid and
+start time alongside the session names seen on it. ``session_cached`` checks
+those with a ``stat`` and a ``/proc`` read, so a restarted server (new socket,
+new process) never satisfies an old entry. It cannot see a session killed
+while its server keeps running, so job commands run their tmux calls under
+``forget_on_stale``, which drops the entry when tmux reports the server or a
+session gone; ``jobs.run`` also ensures the session again and retries once.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from muxdantic.cache import read_json, state_path_for, write_json_atomic
+from muxdantic.errors import MuxdanticSubprocessError
+from muxdantic.fanout import socket_file
+from muxdantic.locking import server_selector
+from muxdantic.models import TmuxServerArgs
+
+_PROC_ROOT = Path("/proc")
+# tmux errors meaning the server or a session no longer exists.
+_STALE_MARKERS = ("no server running", "error connecting to", "server exited", "can't find session", "no such session")
+
+
+def session_cache_path(server: TmuxServerArgs, *, cache_root: Path | None = None) -> Path:
+    return state_path_for("sessions", server_selector(server), cache_root=cache_root)
+
+
+def _process_start(pid: int, proc_root: Path) -> int | None:
+    """Return the process start time in clock ticks since boot, None if ``/proc`` cannot say."""
+    try:
+        raw = (proc_root / str(pid) / "stat").read_text(encoding="utf-8", errors="replace")
+        # Fields resume after ``comm``'s last ')'; starttime is field 22 of stat(5).
+        return int(raw[raw.rindex(")") + 2 :].split()[19])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _server_identity(server: TmuxServerArgs, pid: int, proc_root: Path) -> dict[str, Any] | None:
+    try:
+        st = os.stat(socket_file(server))
+    except OSError:
+        return None
+    return {"socket_dev": st.st_dev, "socket_ino": st.st_ino, "pid": pid, "pid_start": _process_start(pid, proc_root)}
+
+
+def _valid_entry(server: TmuxServerArgs, entry: dict[str, Any] | None, proc_root: Path) -> bool:
+    if entry is None or not isinstance(entry.get("pid"), int) or not isinstance(entry.get("sessions"), list):
+        return False
+    identity = _server_identity(server, entry["pid"], proc_root)
+    if identity is None or any(entry.get(key) != value for key, value in identity.items()):
+        return False
+    # Without /proc both start times are None; at least require the pid to be running.
+    return identity["pid_start"] is not None or _pid_alive(entry["pid"])
+
+
+def session_cached(
+    server: TmuxServerArgs,
+    session_name: str,
+    *,
+    cache_root: Path | None = None,
+    proc_root: Path | None = None,
+) -> bool:
+    """Return True if ``session_name`` was recorded on this very server process."""
+    entry = read_json(session_cache_path(server, cache_root=cache_root))
+    return _valid_entry(server, entry, proc_root or _PROC_ROOT) and session_name in entry["sessions"]
+
+
+def remember_session(
+    server: TmuxServerArgs,
+    session_name: str,
+    server_pid: int,
+    *,
+    cache_root: Path | None = None,
+    proc_root: Path | None = None,
+) -> None:
+    """Record that ``session_name`` exists on the server whose process is ``server_pid``."""
+    root = proc_root or _PROC_ROOT
+    identity = _server_identity(server, server_pid, root)
+    if identity is None:
+        return
+    path = session_cache_path(server, cache_root=cache_root)
+    entry = read_json(path)
+    sessions = entry["sessions"] if _valid_entry(server, entry, root) and entry["pid"] == server_pid else []
+    if session_name not in sessions:
+        sessions = [*sessions, session_name]
+    write_json_atomic(path, {**identity, "sessions": sessions})
+
+
+def forget_server(server: TmuxServerArgs, *, cache_root: Path | None = None) -> None:
+    """Drop every cached session of ``server``."""
+    try:
+        os.unlink(session_cache_path(server, cache_root=cache_root))
+    except OSError:
+        pass
+
+
+def stale_session_error(exc: MuxdanticSubprocessError) -> bool:
+    """Return True when tmux failed because the server or a session is gone."""
+    stderr = exc.stderr or ""
+    return any(marker in stderr for marker in _STALE_MARKERS)
+
+
+@contextmanager
+def forget_on_stale(server: TmuxServerArgs, *, cache_root: Path | None = None) -> Iterator[None]:
+    """Drop ``server``'s cached sessions if a tmux call in the block finds the server or a session gone."""
+    try:
+        yield
+    except MuxdanticSubprocessError as exc:
+        if stale_session_error(exc):
+            forget_server(server, cache_root=cache_root)
+        raise
@@ -0,0 +1,88 @@
+"""Overflow sessions that hold job windows away from the user's own session.
+
+With sharding enabled, jobs for ``<session>`` go into companion sessions named
+``<session>-jobs-0``, ``<session>-jobs-1``, ... each holding at most a fixed
+number of job windows. Shards are created on demand by ``ensure_shard`` and
+keep an idle holder window so they survive their last job being killed.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from muxdantic.errors import MuxdanticSubprocessError
+from muxdantic.locking import session_lock
+from muxdantic.models import TmuxServerArgs
+from muxdantic.tmux import (
+    escape_format,
+    filter_unsupported,
+    list_all_windows,
+    new_session,
+    session_path,
+)
+
+SHARD_HOLDER_WINDOW = "shard"
+
+
+def shard_session_name(session_name: str, index: int) -> str:
+    return f"{session_name}-jobs-{index}"
+
+
+def shard_index(shard_name: str, session_name: str) -> int | None:
+    """Return the shard number of ``shard_name`` if it is a shard of ``session_name``."""
+    match = re.fullmatch(re.escape(session_name) + r"-jobs-(\d+)", shard_name)
+    return int(match.group(1)) if match else None
+
+
+def job_sessions_filter(session_name: str) -> str:
+    """Return a tmux format condition true for ``session_name`` and its shards."""
+    literal = escape_format(session_name)
+    return f"#{{||:#{{==:#{{session_name}},{literal}}},#{{m:{literal}-jobs-*,#{{session_name}}}}}}"
+
+
+@contextmanager
+def shard_lock(server: TmuxServerArgs, session_name: str) -> Iterator[None]:
+    """Serialize shard selection and window creation for one session's shards."""
+    with session_lock(server, f"{session_name}-jobs"):
+        yield
+
+
+def shard_window_counts(session_name: str, server: TmuxServerArgs) -> dict[int, int]:
+    """Return ``{shard index: window count}`` for every existing shard, holder windows excluded."""
+    literal = escape_format(session_name)
+    try:
+        windows = list_all_windows(server, filter_expr=f"#{{m:{literal}-jobs-*,#{{session_name}}}}")
+    except MuxdanticSubprocessError as exc:
+        if not filter_unsupported(exc):
+            raise
+        windows = list_all_windows(server)
+
+    counts: dict[int, int] = {}
+    for shard_name, _window_id, window_name in windows:
+        index = shard_index(shard_name, session_name)
+        if index is None:
+            continue
+        counts.setdefault(index, 0)
+        if window_name != SHARD_HOLDER_WINDOW:
+            counts[index] += 1
+    return counts
+
+
+def ensure_shard(session_name: str, cap: int, server: TmuxServerArgs) -> str:
+    """Return the lowest-numbered shard with room for another job, creating one if all are full.
+
+    Callers hold ``shard_lock`` until the job window exists so concurrent runs
+    cannot overfill a shard.
+    """
+    counts = shard_window_counts(session_name, server)
+    for index in sorted(counts):
+        if counts[index] < cap:
+            return shard_session_name(session_name, index)
+
+    index = next(candidate for candidate in range(len(counts) + 1) if candidate not in counts)
+    shard = shard_session_name(session_name, index)
+    # Shard windows start where the job session's own windows would.
+    new_session(shard, SHARD_HOLDER_WINDOW, server, start_directory=session_path(session_name, server))
+    return shard
@@ -30,3 +30,8 @@ def parse_job_window_name(window_name: str) -> tuple[str, str, str]:
     if not match:
         raise ValueError(f"Invalid job window name: {window_name!r}")
     return match.group("tag"), match.group("ts_utc"), match.group("job_id")
+
+
+def job_wait_channel(job_id: str) -> str:
+    """Return the ``tmux wait-for`` channel a job signals when it exits."""
+    return f"muxdantic-job-{job_id}"
@@ -2,14 +2,56 @@
 
 from __future__ import annotations
 
+import shlex
 import subprocess
-from typing import Any
+from typing import Any, NamedTuple
+from uuid import uuid4
 
-from muxdantic.errors import MuxdanticSubprocessError
+from muxdantic.capabilities import tmux_capabilities
+from muxdantic.errors import MuxdanticSubprocessError, MuxdanticTimeoutError
 from muxdantic.models import TmuxServerArgs
 
 WINDOW_FORMAT = "#{window_id}\t#{window_name}"
 PANE_FORMAT = "#{pane_id}\t#{pane_dead}\t#{pane_dead_status}\t#{pane_dead_time}"
+SESSION_PANE_FORMAT = "#{window_id}\t#{window_name}\t#{pane_id}\t#{pane_dead}"
+HISTORY_FORMAT = "#{history_size}\t#{cursor_y}"
+SESSION_WINDOW_FORMAT = "#{session_name}\t#{window_id}\t#{window_name}"
+# Window user options set by ``run``; listed through the format string so they cost no extra calls.
+JOB_OPTIONS = (
+    "@mux_job_id",
+    "@mux_tag",
+    "@mux_ts",
+    "@mux_log",
+    "@mux_cmd",
+    "@mux_workspace",
+    "@mux_requester",
+    "@mux_key",
+)
+JOB_PANE_FORMAT = "\t".join(
+    [
+        "#{window_id}",
+        "#{window_name}",
+        "#{pane_id}",
+        "#{pane_dead}",
+        "#{pane_dead_status}",
+        "#{pane_dead_time}",
+        "#{session_name}",
+        "#{pane_pid}",
+        *(f"#{{{option}}}" for option in JOB_OPTIONS),
+    ]
+)
+
+
+class JobPaneRow(NamedTuple):
+    window_id: str
+    window_name: str
+    pane_id: str
+    pane_dead: int
+    pane_dead_status: int | None
+    pane_dead_time: int | None
+    options: dict[str, str]
+    session_name: str = ""
+    pane_pid: int | None = None
 
 
 def _run_program(program: str, args: list[str], server: TmuxServerArgs) -> str:
@@ -17,8 +59,8 @@ def _run_program(program: str, args: list[str], server: TmuxServerArgs) -> str:
     return _run_command(program, cmd, [*server.to_tmux_args(), *args])
 
 
-def _run_command(program: str, cmd: list[str], error_args: list[str]) -> str:
-    completed = subprocess.run(cmd, capture_output=True, text=True)
+def _run_command(program: str, cmd: list[str], error_args: list[str], *, timeout: float | None = None) -> str:
+    completed = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
     if completed.returncode != 0:
         raise MuxdanticSubprocessError(
             program=program,
@@ -33,6 +75,21 @@ def tmux(args: list[str], server: TmuxServerArgs) -> str:
     return _run_program("tmux", args, server)
 
 
+def chain_arg(value: str) -> str:
+    """Escape an argument so tmux does not read a trailing ``;`` as the end of its command."""
+    return value[:-1] + "\\;" if value.endswith(";") else value
+
+
+def chain(*commands: list[str]) -> list[str]:
+    """Join tmux commands into one argv so they run in a single tmux invocation."""
+    args: list[str] = []
+    for command in commands:
+        if args:
+            args.append(";")
+        args.extend(chain_arg(arg) for arg in command)
+    return args
+
+
 def tmuxp(args: list[str], server: TmuxServerArgs) -> str:
     if not args:
         raise ValueError("tmuxp args must include a subcommand")
@@ -54,24 +111,123 @@ def has_session(session_name: str, server: TmuxServerArgs) -> bool:
         return False
 
 
-def new_window(session_name: str, window_name: str, server: TmuxServerArgs) -> tuple[str, str, str]:
-    out = tmux(
+def session_option(session_name: str, option: str, server: TmuxServerArgs) -> str | None:
+    """Return a session option's value, None when the option or the session does not exist."""
+    try:
+        value = tmux(["show-options", "-qv", "-t", f"={session_name}:", option], server).rstrip("\n")
+    except MuxdanticSubprocessError:
+        return None
+    return value or None
+
+
+def session_server_pid(session_name: str, server: TmuxServerArgs) -> int | None:
+    """Return the server's pid if ``session_name`` exists on it, else None; one fork answers both."""
+    # display-message alone prints even for a missing target; has-session fails and ends the chain.
+    try:
+        out = tmux(chain(["has-session", "-t", f"={session_name}"], ["display-message", "-p", "#{pid}"]), server)
+    except MuxdanticSubprocessError:
+        return None
+    return _parse_int(out.strip(), field="pid")
+
+
+def new_window(
+    session_name: str,
+    window_name: str,
+    server: TmuxServerArgs,
+    *,
+    start_directory: str | None = None,
+    environment: dict[str, str] | None = None,
+    command: list[str] | None = None,
+) -> tuple[str, str, str]:
+    args = [
+        "new-window",
+        "-d",
+        "-P",
+        "-F",
+        "#{window_id}\t#{window_name}\t#{pane_id}",
+        "-t",
+        session_name,
+        "-n",
+        window_name,
+        *_spawn_args(start_directory=start_directory, environment=environment, command=command),
+    ]
+    out = tmux(args, server)
+    rows = _parse_tabular_output(out, expected_columns=3, label="new-window output")
+    window_id, resolved_window_name, pane_id = rows[0]
+    return window_id, resolved_window_name, pane_id
+
+
+def new_job_window(
+    session_name: str,
+    window_name: str,
+    server: TmuxServerArgs,
+    *,
+    command: list[str],
+    options: dict[str, str],
+    pipe_command: str | None = None,
+    start_directory: str | None = None,
+    environment: dict[str, str] | None = None,
+) -> tuple[str, str]:
+    """Create a detached window running ``command`` and configure it in the same tmux invocation.
+
+    tmux handles a pane's output and exit only after the whole chain has run,
+    so ``options`` (such as ``remain-on-exit``) and the ``pipe-pane`` log are in
+    place before the command can print or exit. Later commands in the chain
+    cannot use the new window's id, so it is created under a temporary
+    dot-free name (a ``.`` in a target starts a pane) and renamed last.
+    Returns ``(window_id, pane_id)``.
+    """
+    temporary = f"mux-{uuid4().hex}"
+    target = f"{session_name}:={temporary}"
+    commands = [
         [
             "new-window",
             "-d",
             "-P",
             "-F",
-            "#{window_id}\t#{window_name}\t#{pane_id}",
+            "#{window_id}\t#{pane_id}",
             "-t",
             session_name,
             "-n",
-            window_name,
+            temporary,
+            *_spawn_args(start_directory=start_directory, environment=environment, command=command),
         ],
-        server,
-    )
-    rows = _parse_tabular_output(out, expected_columns=3, label="new-window output")
-    window_id, resolved_window_name, pane_id = rows[0]
-    return window_id, resolved_window_name, pane_id
+        *(["set-option", "-w", "-t", target, name, value] for name, value in options.items()),
+    ]
+    if pipe_command is not None:
+        commands.append(["pipe-pane", "-o", "-t", target, pipe_command])
+    commands.append(["rename-window", "-t", target, window_name])
+    rows = _parse_tabular_output(tmux(chain(*commands), server), expected_columns=2, label="new-window output")
+    window_id, pane_id = rows[0]
+    return window_id, pane_id
+
+
+def new_session(
+    session_name: str,
+    window_name: str,
+    server: TmuxServerArgs,
+    *,
+    start_directory: str | None = None,
+) -> tuple[str, str]:
+    args = [
+        "new-session",
+        "-d",
+        "-P",
+        "-F",
+        "#{window_id}\t#{pane_id}",
+        "-s",
+        session_name,
+        "-n",
+        window_name,
+        *_spawn_args(start_directory=start_directory, environment=None, command=None),
+    ]
+    rows = _parse_tabular_output(tmux(args, server), expected_columns=2, label="new-session output")
+    window_id, pane_id = rows[0]
+    return window_id, pane_id
+
+
+def session_path(session_name: str, server: TmuxServerArgs) -> str:
+    return tmux(["display-message", "-p", "-t", session_name, "#{session_path}"], server).rstrip("\n")
 
 
 def list_windows(session_name: str, server: TmuxServerArgs) -> list[tuple[str, str]]:
@@ -96,10 +252,97 @@ def list_panes(target: str, server: TmuxServerArgs) -> list[tuple[str, int, int
     return parsed
 
 
+def list_session_panes(session_name: str, server: TmuxServerArgs) -> list[tuple[str, str, str, int]]:
+    """Return ``(window_id, window_name, pane_id, pane_dead)`` for every pane in a session."""
+    out = tmux(["list-panes", "-s", "-t", session_name, "-F", SESSION_PANE_FORMAT], server)
+    rows = _parse_tabular_output(out, expected_columns=4, label="list-panes output")
+    return [
+        (window_id, window_name, pane_id, _parse_int(pane_dead, field="pane_dead"))
+        for window_id, window_name, pane_id, pane_dead in rows
+    ]
+
+
+def list_job_panes(
+    session_name: str | None,
+    server: TmuxServerArgs,
+    *,
+    filter_expr: str | None = None,
+) -> list[JobPaneRow]:
+    """Return panes with their window's job user options (empty when unset).
+
+    Lists one session, or every session on the server when ``session_name`` is
+    None. ``filter_expr`` is passed to ``list-panes -f`` so tmux drops
+    non-matching rows itself; a tmux known to predate ``-f`` gets no filter, so
+    callers must not rely on it alone.
+    """
+    args = ["list-panes", "-a"] if session_name is None else ["list-panes", "-s", "-t", session_name]
+    args.extend(["-F", JOB_PANE_FORMAT])
+    if filter_expr is not None and tmux_capabilities().format_filters:
+        args.extend(["-f", filter_expr])
+    out = tmux(args, server)
+    rows = _parse_tabular_output(out, expected_columns=8 + len(JOB_OPTIONS), label="list-panes output")
+    return [
+        JobPaneRow(
+            window_id=window_id,
+            window_name=window_name,
+            pane_id=pane_id,
+            pane_dead=_parse_int(pane_dead, field="pane_dead"),
+            pane_dead_status=_parse_optional_int(pane_dead_status, field="pane_dead_status"),
+            pane_dead_time=_parse_optional_int(pane_dead_time, field="pane_dead_time"),
+            options=dict(zip(JOB_OPTIONS, option_values)),
+            session_name=row_session,
+            pane_pid=_parse_optional_int(pane_pid, field="pane_pid"),
+        )
+        for (
+            window_id,
+            window_name,
+            pane_id,
+            pane_dead,
+            pane_dead_status,
+            pane_dead_time,
+            row_session,
+            pane_pid,
+            *option_values,
+        ) in rows
+    ]
+
+
+def list_all_windows(server: TmuxServerArgs, *, filter_expr: str | None = None) -> list[tuple[str, str, str]]:
+    """Return ``(session_name, window_id, window_name)`` for windows in every session.
+
+    Like ``list_job_panes``, ``filter_expr`` is only sent to a tmux with ``-f``.
+    """
+    args = ["list-windows", "-a", "-F", SESSION_WINDOW_FORMAT]
+    if filter_expr is not None and tmux_capabilities().format_filters:
+        args.extend(["-f", filter_expr])
+    rows = _parse_tabular_output(tmux(args, server), expected_columns=3, label="list-windows output")
+    return [(session_name, window_id, window_name) for session_name, window_id, window_name in rows]
+
+
+def escape_format(value: str) -> str:
+    """Escape a literal for use inside a tmux format expression."""
+    return value.replace("#", "##").replace(",", "#,").replace("}", "#}")
+
+
+def filter_unsupported(exc: MuxdanticSubprocessError) -> bool:
+    """Return True when tmux rejected a command because it predates the ``-f`` filter flag.
+
+    ``capabilities`` normally keeps ``-f`` away from such a tmux; this covers
+    builds whose version could not be determined.
+    """
+    stderr = exc.stderr or ""
+    return "unknown option" in stderr or "unknown flag" in stderr
+
+
 def set_window_option(window_id: str, option: str, value: str, server: TmuxServerArgs) -> None:
     tmux(["set-window-option", "-t", window_id, option, value], server)
 
 
+def set_window_options(window_id: str, options: dict[str, str], server: TmuxServerArgs) -> None:
+    """Set several window options (including ``@user`` options) in one tmux invocation."""
+    tmux(chain(*(["set-option", "-w", "-t", window_id, name, value] for name, value in options.items())), server)
+
+
 def pipe_pane(pane_id: str, cmd: str, server: TmuxServerArgs) -> None:
     tmux(["pipe-pane", "-o", "-t", pane_id, cmd], server)
 
@@ -108,10 +351,87 @@ def send_keys(pane_id: str, string: str, server: TmuxServerArgs) -> None:
     tmux(["send-keys", "-t", pane_id, string, "C-m"], server)
 
 
+def wait_for(channel: str, server: TmuxServerArgs, *, timeout: float | None = None) -> None:
+    """Block until ``channel`` is signalled (returns at once if it already was)."""
+    args = [*server.to_tmux_args(), "wait-for", channel]
+    try:
+        _run_command("tmux", ["tmux", *args], args, timeout=timeout)
+    except subprocess.TimeoutExpired as exc:
+        raise MuxdanticTimeoutError(f"Timed out after {timeout:g}s waiting for tmux channel {channel}") from exc
+
+
+def pane_history(pane_id: str, server: TmuxServerArgs) -> tuple[int, int]:
+    """Return ``(history_size, cursor_y)`` for a pane."""
+    out = tmux(["display-message", "-p", "-t", pane_id, HISTORY_FORMAT], server)
+    rows = _parse_tabular_output(out, expected_columns=2, label="display-message output")
+    if not rows:
+        raise ValueError("Malformed display-message output: no rows")
+    history_size, cursor_y = rows[0]
+    return _parse_int(history_size, field="history_size"), _parse_int(cursor_y, field="cursor_y")
+
+
+def capture_pane(
+    pane_id: str,
+    server: TmuxServerArgs,
+    *,
+    start: int | str | None = None,
+    end: int | str | None = None,
+) -> tuple[int, int, list[str]]:
+    """Capture pane lines and the history position they are relative to.
+
+    Both commands run in one tmux command chain, so the returned
+    ``(history_size, cursor_y)`` describe exactly the captured screen.
+    """
+    capture_args = ["capture-pane", "-p", "-t", pane_id]
+    if start is not None:
+        capture_args.extend(["-S", str(start)])
+    if end is not None:
+        capture_args.extend(["-E", str(end)])
+    out = tmux(chain(["display-message", "-p", "-t", pane_id, HISTORY_FORMAT], capture_args), server)
+    header, _, body = out.partition("\n")
+    rows = _parse_tabular_output(header, expected_columns=2, label="display-message output")
+    if not rows:
+        raise ValueError("Malformed display-message output: no rows")
+    history_size, cursor_y = rows[0]
+    return (
+        _parse_int(history_size, field="history_size"),
+        _parse_int(cursor_y, field="cursor_y"),
+        body.splitlines(),
+    )
+
+
+def move_window(window_id: str, target_session: str, window_name: str, server: TmuxServerArgs) -> None:
+    """Move a window into ``target_session`` and rename it in one tmux invocation."""
+    tmux(
+        chain(
+            ["move-window", "-d", "-s", window_id, "-t", f"{target_session}:"],
+            ["rename-window", "-t", window_id, window_name],
+        ),
+        server,
+    )
+
+
 def kill_window(window_id: str, server: TmuxServerArgs) -> None:
     tmux(["kill-window", "-t", window_id], server)
 
 
+def _spawn_args(
+    *,
+    start_directory: str | None,
+    environment: dict[str, str] | None,
+    command: list[str] | None,
+) -> list[str]:
+    args: list[str] = []
+    if start_directory:
+        args.extend(["-c", start_directory])
+    for key, value in (environment or {}).items():
+        args.extend(["-e", f"{key}={value}"])
+    if command:
+        # tmux runs a single argument through ``sh -c``; quote it so it stays one argv word.
+        args.extend(["--", *(command if len(command) > 1 else [shlex.quote(command[0])])])
+    return args
+
+
 def _parse_int(value: str, *, field: str) -> int:
     try:
         return int(value)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import glob
 import json
 from pathlib import Path
 from typing import Any
@@ -52,6 +53,29 @@ def resolve_workspace(path: Path) -> Path:
     raise MuxdanticUsageError(f"Workspace path does not exist: {target}")
 
 
+def expand_workspaces(patterns: list[str]) -> list[Path]:
+    """Expand workspace arguments that may be glob patterns, keeping order and dropping duplicates.
+
+    A pattern keeps the directories and workspace files it matches; one that
+    matches neither is a usage error.
+    """
+    workspaces: list[Path] = []
+    for pattern in patterns:
+        expanded = str(Path(pattern).expanduser())
+        if not glob.has_magic(expanded):
+            workspaces.append(Path(expanded))
+            continue
+        matches = [
+            Path(match)
+            for match in sorted(glob.glob(expanded))
+            if Path(match).is_dir() or Path(match).name in _WORKSPACE_FILENAMES
+        ]
+        if not matches:
+            raise MuxdanticUsageError(f"No workspaces match: {pattern}")
+        workspaces.extend(matches)
+    return list(dict.fromkeys(workspaces))
+
+
 def _fallback_yaml_load(raw: str) -> dict[str, Any]:
     """Minimal YAML mapping parser for constrained test environments.
 
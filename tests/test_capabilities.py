@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from muxdantic import capabilities
+from muxdantic.capabilities import TmuxCapabilities, probe_version, tmux_capabilities
+from muxdantic.models import TmuxServerArgs
+from muxdantic.tmux import list_all_windows
+
+
+@pytest.mark.parametrize(
+    ("version", "filters", "spawn_env"),
+    [
+        ("3.3a", True, True),
+        ("3.1", True, True),
+        ("3.0a", False, True),
+        ("2.9", False, False),
+        ("next-3.5", True, True),
+        ("master", True, True),
+        ("", True, True),
+    ],
+)
+def test_feature_flags_follow_version(version: str, filters: bool, spawn_env: bool) -> None:
+    caps = TmuxCapabilities(version)
+
+    assert caps.format_filters is filters
+    assert caps.spawn_environment is spawn_env
+
+
+@pytest.fixture
+def fake_tmux(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    binary = tmp_path / "bin" / "tmux"
+    binary.parent.mkdir()
+    binary.write_text(f'#!/bin/sh\necho probed >> "{binary.parent}/calls"\necho "tmux 3.0a"\n', encoding="utf-8")
+    binary.chmod(0o755)
+    monkeypatch.setenv("PATH", str(binary.parent))
+    monkeypatch.setattr(capabilities, "_MEMO", {})
+    return binary
+
+
+def _probe_count(binary: Path) -> int:
+    calls = binary.parent / "calls"
+    return len(calls.read_text(encoding="utf-8").splitlines()) if calls.exists() else 0
+
+
+def test_probe_version_reads_tmux_dash_v(fake_tmux: Path, tmp_path: Path) -> None:
+    assert probe_version(str(fake_tmux)) == "3.0a"
+    assert probe_version(str(tmp_path / "missing")) == ""
+
+
+def test_capabilities_are_probed_once_per_binary_and_mtime(
+    fake_tmux: Path, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    cache_root = tmp_path / "cache"
+
+    assert tmux_capabilities(cache_root=cache_root) == TmuxCapabilities("3.0a")
+    assert tmux_capabilities(cache_root=cache_root).version == "3.0a"
+    assert _probe_count(fake_tmux) == 1
+
+    # A new process reads the persisted answer instead of running tmux -V.
+    monkeypatch.setattr(capabilities, "_MEMO", {})
+    assert tmux_capabilities(cache_root=cache_root).version == "3.0a"
+    assert _probe_count(fake_tmux) == 1
+
+    # An upgraded binary has a new mtime and is probed again.
+    stat = fake_tmux.stat()
+    os.utime(fake_tmux, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    tmux_capabilities(cache_root=cache_root)
+    assert _probe_count(fake_tmux) == 2
+
+
+def test_filter_is_not_sent_to_tmux_without_format_filters(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[list[str]] = []
+    monkeypatch.setattr("muxdantic.tmux.tmux_capabilities", lambda: TmuxCapabilities("3.0a"))
+    monkeypatch.setattr("muxdantic.tmux.tmux", lambda args, server: calls.append(args) or "dev\t@1\tshell\n")
+
+    assert list_all_windows(TmuxServerArgs(), filter_expr="#{m:dev-jobs-*,#{session_name}}") == [("dev", "@1", "shell")]
+    assert "-f" not in calls[0]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from muxdantic.errors import MuxdanticUsageError
+from muxdantic.jobs import capture
+from muxdantic.models import JobInfo, TmuxServerArgs
+from muxdantic.tmux import capture_pane
+
+
+def _job() -> JobInfo:
+    return JobInfo(
+        job_id="abc123",
+        tag="build",
+        ts_utc="20260211T143012Z",
+        session_name="dev",
+        window_id="@9",
+        window_name="job:build:20260211T143012Z:abc123",
+        pane_id="%11",
+        pane_dead=0,
+        state="running",
+    )
+
+
+def test_capture_pane_chains_history_and_capture(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen: dict[str, list[str]] = {}
+
+    def fake_run(cmd: list[str], *, capture_output: bool, text: bool, timeout: float | None = None) -> subprocess.CompletedProcess[str]:
+        seen["cmd"] = cmd
+        return subprocess.CompletedProcess(cmd, 0, stdout="12\t3\nfirst\n\nthird\n", stderr="")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    history_size, cursor_y, lines = capture_pane("%11", TmuxServerArgs(), start=-5, end="-")
+
+    assert (history_size, cursor_y, lines) == (12, 3, ["first", "", "third"])
+    assert seen["cmd"] == [
+        "tmux",
+        "display-message",
+        "-p",
+        "-t",
+        "%11",
+        "#{history_size}\t#{cursor_y}",
+        ";",
+        "capture-pane",
+        "-p",
+        "-t",
+        "%11",
+        "-S",
+        "-5",
+        "-E",
+        "-",
+    ]
+
+
+def test_capture_since_last_returns_only_new_lines(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    # Simulated pane: 10 rows of history, cursor on the 3rd visible row.
+    screen = {"history": 10, "cursor": 2}
+    content = [f"line{i}" for i in range(40)]
+    starts: list[object] = []
+
+    def fake_capture(pane_id: str, server: TmuxServerArgs, *, start=None, end=None):
+        starts.append(start)
+        first = 0 if start == "-" else screen["history"] + int(start)
+        return screen["history"], screen["cursor"], content[first : screen["history"] + 24]
+
+    lookups: list[str] = []
+
+    def fake_list_jobs(workspace: Path, server: TmuxServerArgs, *, job_id: str) -> list[JobInfo]:
+        lookups.append(job_id)
+        return [_job()]
+
+    monkeypatch.setattr("muxdantic.jobs.list_jobs", fake_list_jobs)
+    monkeypatch.setattr("muxdantic.jobs.pane_history", lambda pane_id, server: (screen["history"], screen["cursor"]))
+    monkeypatch.setattr("muxdantic.jobs.capture_pane", fake_capture)
+
+    first = capture(tmp_path, TmuxServerArgs(), job_id="abc123", since_last=True, cache_root=tmp_path)
+    assert first.lines == content[:12]
+    assert (first.first_line, first.next_line) == (0, 12)
+
+    screen.update(history=15, cursor=4)
+    second = capture(tmp_path, TmuxServerArgs(), job_id="abc123", since_last=True, cache_root=tmp_path)
+    assert second.lines == content[12:19]
+    assert (second.first_line, second.next_line) == (12, 19)
+    assert starts == ["-", -3]
+
+    third = capture(tmp_path, TmuxServerArgs(), job_id="abc123", since_last=True, cache_root=tmp_path)
+    assert third.lines == []
+    assert lookups == ["abc123"] * 3
+
+
+def test_capture_rejects_range_with_since_last(tmp_path: Path) -> None:
+    with pytest.raises(MuxdanticUsageError, match="since_last"):
+        capture(tmp_path, TmuxServerArgs(), job_id="abc123", start=0, since_last=True)
+
+
+def test_capture_unknown_job_is_usage_error(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr("muxdantic.jobs.list_jobs", lambda workspace, server, job_id: [])
+
+    with pytest.raises(MuxdanticUsageError, match="No job found"):
+        capture(tmp_path, TmuxServerArgs(), job_id="missing")
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 import pytest
 
 from muxdantic import cli
-from muxdantic.errors import MuxdanticSubprocessError
-from muxdantic.models import EnsureResult, JobInfo, JobRef, KillResult
+from muxdantic.errors import MuxdanticSubprocessError, MuxdanticTimeoutError, MuxdanticUsageError
+from muxdantic.models import CaptureResult, EnsureResult, GraphResult, JobInfo, JobRef, JobResult, KillResult, TmuxServerArgs
 
 
 def test_main_ensure_calls_ensure_and_prints_json(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
@@ -24,10 +25,45 @@ def test_main_ensure_calls_ensure_and_prints_json(monkeypatch: pytest.MonkeyPatc
     req = captured["req"]
     assert req.workspace == Path("workspace/.tmuxp.yaml")
     assert req.server.socket_name == "named"
+    assert req.loader == "tmuxp"
     out = capsys.readouterr().out
     assert '"session_name": "dev"' in out
 
 
+def test_main_ensure_passes_native_loader(monkeypatch: pytest.MonkeyPatch) -> None:
+    captured: dict[str, object] = {}
+
+    def fake_ensure(req):
+        captured["req"] = req
+        return EnsureResult(workspace=req.workspace, session_name="dev", created=True)
+
+    monkeypatch.setattr("muxdantic.cli.ensure", fake_ensure)
+
+    assert cli.main(["ensure", "workspace/.tmuxp.yaml", "--loader", "native"]) == 0
+    assert captured["req"].loader == "native"
+
+
+def test_main_ensure_many_streams_one_line_per_workspace(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str], tmp_path: Path
+) -> None:
+    seen: dict[str, object] = {}
+
+    def fake_ensure_many(workspaces, server, *, pool_size, max_parallel, loader, session_cache):
+        seen.update(workspaces=workspaces, max_parallel=max_parallel)
+        yield workspaces[0], EnsureResult(workspace=workspaces[0], session_name="a", created=True)
+        yield workspaces[1], MuxdanticUsageError("No workspace file found")
+
+    monkeypatch.setattr("muxdantic.cli.ensure_many", fake_ensure_many)
+
+    rc = cli.main(["ensure", str(tmp_path / "a"), str(tmp_path / "b"), "--max-parallel", "4"])
+
+    assert rc == 1
+    assert seen == {"workspaces": [tmp_path / "a", tmp_path / "b"], "max_parallel": 4}
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert lines[0]["session_name"] == "a"
+    assert lines[1] == {"workspace": str(tmp_path / "b"), "error": "No workspace file found"}
+
+
 def test_main_run_requires_separator(capsys: pytest.CaptureFixture[str]) -> None:
     rc = cli.main(["run", "workspace/.tmuxp.yaml", "--tag", "build", "echo", "ok"])
 
@@ -109,6 +145,28 @@ def test_main_ls_jobs_prints_json_array(monkeypatch: pytest.MonkeyPatch, capsys:
     assert '"job_id": "abc123"' in out
 
 
+def test_main_ls_jobs_passes_filters(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    seen: dict[str, object] = {}
+
+    def fake_list_jobs(workspace, server, **filters):
+        seen.update(filters)
+        return []
+
+    monkeypatch.setattr("muxdantic.cli.list_jobs", fake_list_jobs)
+
+    rc = cli.main(["ls-jobs", ".", "--tag", "build", "--state", "exited", "--older-than", "15m"])
+
+    assert rc == 0
+    assert seen == {"tag": "build", "state": "exited", "older_than": 900.0}
+
+
+def test_main_ls_jobs_rejects_bad_age(capsys: pytest.CaptureFixture[str]) -> None:
+    rc = cli.main(["ls-jobs", ".", "--newer-than", "soon"])
+
+    assert rc == 2
+    assert "--newer-than" in capsys.readouterr().err
+
+
 def test_main_kill_and_subprocess_error_mapping(
     monkeypatch: pytest.MonkeyPatch,
     capsys: pytest.CaptureFixture[str],
@@ -125,3 +183,235 @@ def test_main_kill_and_subprocess_error_mapping(
     rc = cli.main(["kill", "workspace/.tmuxp.yaml", "--all-jobs"])
     assert rc == 1
     assert "tmux failed with exit code 1" in capsys.readouterr().err
+
+
+def test_main_capture_parses_offsets(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    captured: dict[str, object] = {}
+
+    def fake_capture(workspace, server, **kwargs):
+        captured.update(kwargs)
+        return CaptureResult(job_id="abc123", pane_id="%11", lines=["ok"], history_size=4)
+
+    monkeypatch.setattr("muxdantic.cli.capture", fake_capture)
+
+    rc = cli.main(["capture", "workspace/.tmuxp.yaml", "--job-id", "abc123", "--start", "-20", "--end", "-"])
+
+    assert rc == 0
+    assert captured == {"job_id": "abc123", "start": -20, "end": "-", "since_last": False}
+    assert '"lines": ["ok"]' in capsys.readouterr().out
+
+    rc = cli.main(["capture", "workspace/.tmuxp.yaml", "--job-id", "abc123", "--start", "top"])
+    assert rc == 2
+    assert "--start must be an integer" in capsys.readouterr().err
+
+
+def test_main_result_reads_sidecar_without_tmux(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    recorded = JobResult(
+        job_id="abc123",
+        cmd=["make", "test"],
+        exit_status=0,
+        started_at="2026-02-11T14:30:12Z",
+        ended_at="2026-02-11T14:30:14Z",
+        wall_time_s=2.0,
+        user_cpu_s=1.5,
+        sys_cpu_s=0.1,
+        max_rss_kb=20480,
+    )
+    monkeypatch.setattr("muxdantic.cli.read_result", lambda job_id: recorded if job_id == "abc123" else None)
+    monkeypatch.setattr("muxdantic.tmux.subprocess.run", lambda *args, **kwargs: pytest.fail("tmux was called"))
+
+    rc = cli.main(["result", "abc123"])
+    assert rc == 0
+    assert '"exit_status": 0' in capsys.readouterr().out
+
+    rc = cli.main(["result", "missing"])
+    assert rc == 2
+    assert "No result recorded" in capsys.readouterr().err
+
+
+def test_main_run_direct_launch_with_cwd_and_env(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    captured: dict[str, object] = {}
+
+    def fake_run(req):
+        captured["req"] = req
+        return JobRef(
+            job_id="abc123",
+            tag=req.tag,
+            ts_utc="20260211T143012Z",
+            session_name="dev",
+            window_id="@9",
+            window_name="job:build:20260211T143012Z:abc123",
+            pane_id="%11",
+        )
+
+    monkeypatch.setattr("muxdantic.cli.run", fake_run)
+
+    rc = cli.main(
+        ["run", ".", "--tag", "build", "--launch", "direct", "--cwd", "/srv", "-e", "A=1", "--env", "B=x=y", "--", "make"]
+    )
+
+    assert rc == 0
+    req = captured["req"]
+    assert req.launch == "direct"
+    assert req.cwd == Path("/srv")
+    assert req.env == {"A": "1", "B": "x=y"}
+
+    rc = cli.main(["run", ".", "--tag", "build", "--env", "NOPE", "--", "make"])
+    assert rc == 2
+    assert "KEY=VALUE" in capsys.readouterr().err
+
+    rc = cli.main(["run", ".", "--tag", "build", "--launch", "direct", "--pool-size", "2", "--", "make"])
+    assert rc == 2
+    assert "pool_size requires" in capsys.readouterr().err
+
+
+def test_main_run_graph_exit_code_reflects_graph_outcome(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    tmp_path: Path,
+) -> None:
+    graph_file = tmp_path / "graph.json"
+    graph_file.write_text('{"nodes": [{"name": "a", "cmd": ["true"]}]}', encoding="utf-8")
+    outcomes = iter([True, False])
+
+    def fake_run_graph(req):
+        assert req.max_parallel == 2
+        return GraphResult(succeeded=next(outcomes), nodes=[], wall_time_s=0.1, critical_path=[], critical_path_s=0.0)
+
+    monkeypatch.setattr("muxdantic.cli.run_graph", fake_run_graph)
+
+    assert cli.main(["run-graph", str(tmp_path), str(graph_file), "--max-parallel", "2"]) == 0
+    assert cli.main(["run-graph", str(tmp_path), str(graph_file), "--max-parallel", "2"]) == 1
+    assert '"succeeded": false' in capsys.readouterr().out
+
+
+def test_main_run_wait_returns_job_exit_status(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    job_ref = JobRef(
+        job_id="abc123",
+        tag="build",
+        ts_utc="20260211T143012Z",
+        session_name="dev",
+        window_id="@9",
+        window_name="job:build:20260211T143012Z:abc123",
+        pane_id="%11",
+    )
+
+    def fake_run(req):
+        assert req.wait is True
+        if req.timeout is not None:
+            raise MuxdanticTimeoutError("Timed out after 1s waiting for job abc123", job_ref=job_ref)
+        return job_ref.model_copy(update={"exit_status": 7})
+
+    monkeypatch.setattr("muxdantic.cli.run", fake_run)
+
+    rc = cli.main(["run", ".", "--tag", "build", "--wait", "--", "make"])
+    assert rc == 7
+    assert '"exit_status": 7' in capsys.readouterr().out
+
+    rc = cli.main(["run", ".", "--tag", "build", "--wait", "--timeout", "1", "--", "make"])
+    captured = capsys.readouterr()
+    assert rc == 124
+    assert '"job_id": "abc123"' in captured.out
+    assert "Timed out" in captured.err
+
+    rc = cli.main(["run", ".", "--tag", "build", "--timeout", "1", "--", "make"])
+    assert rc == 2
+    assert "timeout requires wait" in capsys.readouterr().err
+
+
+def test_main_ls_jobs_fans_out_over_repeated_servers(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    def fake_list_jobs(workspace, server):
+        if server.socket_name == "down":
+            raise MuxdanticSubprocessError(program="tmux", args=["list-windows"], returncode=1, stderr="no server")
+        return []
+
+    monkeypatch.setattr("muxdantic.cli.list_jobs", fake_list_jobs)
+
+    rc = cli.main(["ls-jobs", ".", "-L", "tenant-a", "-L", "down", "--max-parallel", "2"])
+
+    assert rc == 1
+    out = capsys.readouterr().out
+    assert '"results": {"tenant-a": []}' in out
+    assert '"down": "tmux failed with exit code 1' in out
+
+
+def test_main_kill_single_server_keeps_plain_output(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    seen: list[TmuxServerArgs] = []
+
+    def fake_kill(workspace, server, *, job_id, tag, all_jobs):
+        seen.append(server)
+        return KillResult(killed=["@9"])
+
+    monkeypatch.setattr("muxdantic.cli.kill", fake_kill)
+
+    rc = cli.main(["kill", ".", "--all-jobs", "-L", "tenant-a"])
+
+    assert rc == 0
+    assert seen == [TmuxServerArgs(socket_name="tenant-a")]
+    assert capsys.readouterr().out == '{"killed": ["@9"]}\n'
+
+
+def test_main_logs_to_jsonl_converts_raw_log(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    raw_log = tmp_path / "abc123.log"
+    raw_log.write_bytes(b"one\ntwo\n")
+
+    rc = cli.main(["logs", "--to-jsonl", str(raw_log)])
+
+    assert rc == 0
+    assert capsys.readouterr().out == (
+        '{"ts": null, "job_id": "abc123", "line": "one"}\n{"ts": null, "job_id": "abc123", "line": "two"}\n'
+    )
+
+    assert cli.main(["logs", "--to-jsonl", str(tmp_path / "missing.log")]) == 2
+
+
+def test_main_logs_tail_prints_last_records(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    (log_dir / "abc.jsonl").write_text(
+        "".join(json.dumps({"ts": "2026-02-11T14:30:12Z", "job_id": "abc", "line": f"l{i}"}) + "\n" for i in range(5)),
+        encoding="utf-8",
+    )
+
+    rc = cli.main(["logs", "--tail", "2", "--log-dir", str(log_dir), "--job-id", "abc"])
+
+    assert rc == 0
+    assert [json.loads(line)["line"] for line in capsys.readouterr().out.splitlines()] == ["l3", "l4"]
+    assert cli.main(["logs", "--tail", "2", "--log-file", str(log_dir / "missing.jsonl")]) == 2
+    assert cli.main(["logs", "--tail", "0", "--log-file", str(log_dir / "abc.jsonl")]) == 2
+
+
+def test_main_logs_grep_streams_ndjson(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    seen: dict[str, object] = {}
+
+    def fake_grep_logs(log_dir, pattern, *, tag, since, workers):
+        seen.update(log_dir=log_dir, pattern=pattern, tag=tag, since=since, workers=workers)
+        yield {"file": "logs/a.jsonl", "tag": "build", "ts": "2026-02-11T14:30:12Z", "job_id": "a", "line": "boom"}
+
+    monkeypatch.setattr("muxdantic.cli.grep_logs", fake_grep_logs)
+
+    rc = cli.main(["logs", "grep", "boom", "--log-dir", "logs", "--tag", "build", "--workers", "4"])
+
+    assert rc == 0
+    assert seen == {"log_dir": Path("logs"), "pattern": "boom", "tag": "build", "since": None, "workers": 4}
+    assert capsys.readouterr().out.count("\n") == 1
+
+
+def test_main_stats_writes_prometheus_textfile(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setattr("muxdantic.cli.read_sink_stats", lambda *, max_age: [])
+    monkeypatch.setattr("muxdantic.cli.list_jobs", lambda workspace, server: [])
+    output = tmp_path / "muxdantic.prom"
+
+    rc = cli.main(["stats", ".", "--format", "prometheus", "--output", str(output)])
+
+    assert rc == 0
+    assert capsys.readouterr().out == ""
+    assert output.read_text(encoding="utf-8").startswith("# HELP muxdantic_jobs ")
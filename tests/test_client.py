@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from muxdantic.client import Muxdantic
+from muxdantic.errors import MuxdanticSubprocessError
+from muxdantic.models import JobRef, RunRequest, TmuxServerArgs
+
+
+@pytest.fixture
+def client_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> dict[str, list]:
+    calls: dict[str, list] = {"load": [], "ensure": [], "has_session": [], "run": []}
+    workspace = tmp_path / ".tmuxp.yaml"
+
+    monkeypatch.setattr("muxdantic.client.resolve_workspace", lambda path: workspace)
+
+    def fake_load(path: Path) -> dict:
+        calls["load"].append(path)
+        return {"session_name": "dev"}
+
+    def fake_run(req: RunRequest, *, session_name: str | None = None) -> JobRef:
+        calls["run"].append((req.cmd, session_name))
+        return JobRef(
+            job_id=f"job{len(calls['run'])}",
+            tag=req.tag,
+            ts_utc="20260211T143012Z",
+            session_name=session_name,
+            window_id="@9",
+            window_name="job:build:20260211T143012Z:x",
+            pane_id="%11",
+        )
+
+    monkeypatch.setattr("muxdantic.client.load_tmuxp_config", fake_load)
+    monkeypatch.setattr("muxdantic.client.ensure", lambda req: calls["ensure"].append(req.workspace))
+    monkeypatch.setattr(
+        "muxdantic.client.has_session",
+        lambda name, server: calls["has_session"].append(name) or True,
+    )
+    monkeypatch.setattr("muxdantic.client.run", fake_run)
+    return calls
+
+
+def test_client_resolves_workspace_once_and_revalidates_after_ttl(client_env: dict[str, list], tmp_path: Path) -> None:
+    now = [100.0]
+    mux = Muxdantic(tmp_path, TmuxServerArgs(socket_name="ci"), revalidate_after=5.0, clock=lambda: now[0])
+
+    mux.run(["make"], tag="build")
+    now[0] += 1
+    mux.run(["make", "test"], tag="build")
+    now[0] += 10
+    mux.run(["make", "lint"], tag="build")
+
+    assert len(client_env["load"]) == 1
+    assert len(client_env["ensure"]) == 1
+    assert client_env["has_session"] == ["dev"]
+    assert [session for _, session in client_env["run"]] == ["dev", "dev", "dev"]
+
+
+def test_client_reensures_after_tmux_failure(
+    client_env: dict[str, list], monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    mux = Muxdantic(tmp_path, clock=lambda: 0.0)
+    mux.run(["make"], tag="build")
+
+    def failing_run(req: RunRequest, *, session_name: str | None = None) -> JobRef:
+        raise MuxdanticSubprocessError(program="tmux", args=["new-window"], returncode=1, stderr="can't find session")
+
+    monkeypatch.setattr("muxdantic.client.run", failing_run)
+    with pytest.raises(MuxdanticSubprocessError):
+        mux.run(["make"], tag="build")
+
+    with pytest.raises(MuxdanticSubprocessError):
+        mux.run(["make"], tag="build")
+
+    assert len(client_env["ensure"]) == 2
+
+
+def test_client_run_many_keeps_input_order(client_env: dict[str, list], tmp_path: Path) -> None:
+    mux = Muxdantic(tmp_path)
+
+    refs = mux.run_many([["a"], ["b"], ["c"]], tag="batch", max_parallel=3)
+
+    assert len(refs) == 3
+    assert sorted(cmd for cmd, _ in client_env["run"]) == [["a"], ["b"], ["c"]]
+    assert len(client_env["ensure"]) == 1
+
+
+def test_client_list_and_kill_reuse_session(
+    client_env: dict[str, list], monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    seen: list[dict] = []
+    monkeypatch.setattr(
+        "muxdantic.client.list_jobs",
+        lambda workspace, server, **kwargs: seen.append(kwargs) or [],
+    )
+    monkeypatch.setattr(
+        "muxdantic.client.kill",
+        lambda workspace, server, **kwargs: seen.append(kwargs) or None,
+    )
+    mux = Muxdantic(tmp_path)
+
+    mux.list_jobs(tag="build")
+    mux.kill(tag="build")
+
+    assert seen == [
+        {"session_name": "dev", "tag": "build"},
+        {"job_id": None, "tag": "build", "all_jobs": False, "session_name": "dev"},
+    ]
+    assert len(client_env["load"]) == 1
@@ -11,7 +11,7 @@ from muxdantic.tmux import list_windows
 def test_dev_step_03_tmux_wrapper_parsing(monkeypatch: pytest.MonkeyPatch) -> None:
     called: dict[str, list[str]] = {}
 
-    def fake_run(cmd: list[str], *, capture_output: bool, text: bool) -> subprocess.CompletedProcess[str]:
+    def fake_run(cmd: list[str], *, capture_output: bool, text: bool, timeout: float | None = None) -> subprocess.CompletedProcess[str]:
         called["cmd"] = cmd
         return subprocess.CompletedProcess(cmd, 0, stdout="@7\tjob:build\n", stderr="")
 
@@ -6,6 +6,7 @@ import pytest
 
 from muxdantic.jobs import kill, list_jobs, run
 from muxdantic.models import JobRef, KillResult, RunRequest, TmuxServerArgs
+from muxdantic.tmux import JobPaneRow
 
 
 def test_dev_step_05_end_to_end_contract(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
@@ -26,8 +27,10 @@ def test_dev_step_05_end_to_end_contract(monkeypatch: pytest.MonkeyPatch, tmp_pa
         lambda session_name, window_name, server: ("@9", window_name, "%11"),
     )
     monkeypatch.setattr(
-        "muxdantic.jobs.set_window_option",
-        lambda window_id, option, value, server: recorded.update({"remain": (window_id, option, value)}),
+        "muxdantic.jobs.set_window_options",
+        lambda window_id, options, server: recorded.update(
+            {"remain": (window_id, "remain-on-exit", options["remain-on-exit"]), "options": options}
+        ),
     )
     monkeypatch.setattr(
         "muxdantic.jobs.send_keys",
@@ -39,16 +42,19 @@ def test_dev_step_05_end_to_end_contract(monkeypatch: pytest.MonkeyPatch, tmp_pa
     assert isinstance(job_ref, JobRef)
     assert job_ref.window_name == "job:build:20260211T143012Z:abc123"
     assert recorded["remain"] == ("@9", "remain-on-exit", "failed")
+    assert recorded["options"]["@mux_job_id"] == "abc123"
+    assert recorded["options"]["@mux_cmd"] == '["python", "-V"]'
     assert recorded["send"] == ("%11", "exec python -V")
 
     monkeypatch.setattr("muxdantic.jobs.resolve_workspace", lambda p: workspace)
     monkeypatch.setattr("muxdantic.jobs.load_tmuxp_config", lambda p: {"session_name": "dev"})
     monkeypatch.setattr("muxdantic.jobs.extract_session_name", lambda cfg: "dev")
     monkeypatch.setattr(
-        "muxdantic.jobs.list_windows",
-        lambda session, server: [("@9", "job:build:20260211T143012Z:abc123")],
+        "muxdantic.jobs.list_job_panes",
+        lambda session, server, filter_expr=None: [
+            JobPaneRow("@9", "job:build:20260211T143012Z:abc123", "%11", 0, None, None, {"@mux_job_id": ""})
+        ],
     )
-    monkeypatch.setattr("muxdantic.jobs.list_panes", lambda target, server: [("%11", 0, None, None)])
 
     jobs = list_jobs(workspace, TmuxServerArgs())
     assert len(jobs) == 1
@@ -5,8 +5,9 @@ from pathlib import Path
 
 import pytest
 
-from muxdantic.models import EnsureRequest, TmuxServerArgs
-from muxdantic.ensure import ensure
+from muxdantic.models import EnsureRequest, EnsureResult, TmuxServerArgs
+from muxdantic.ensure import ensure, ensure_many
+from muxdantic.errors import MuxdanticUsageError
 
 
 def test_ensure_existing_session_does_not_load(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
@@ -73,3 +74,71 @@ def test_ensure_missing_session_loads_tmuxp(monkeypatch: pytest.MonkeyPatch, tmp
     assert result.session_name == "backend"
     assert result.created is True
     assert calls["tmuxp"] == [(["load", "-d", "--yes", str(workspace)], req.server)]
+
+
+def test_ensure_many_streams_results_and_errors(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    def fake_ensure(req: EnsureRequest) -> EnsureResult:
+        if req.workspace.name == "broken":
+            raise MuxdanticUsageError(f"Workspace path does not exist: {req.workspace}")
+        if req.workspace.name == "bad-yaml":
+            raise ValueError("mapping values are not allowed here")
+        return EnsureResult(workspace=req.workspace, session_name=req.workspace.name, created=True)
+
+    monkeypatch.setattr("muxdantic.ensure.ensure", fake_ensure)
+    workspaces = [tmp_path / "api", tmp_path / "broken", tmp_path / "bad-yaml", tmp_path / "web"]
+
+    outcomes = dict(ensure_many(workspaces, TmuxServerArgs(), max_parallel=2))
+
+    assert outcomes[tmp_path / "api"].session_name == "api"
+    assert outcomes[tmp_path / "web"].created is True
+    assert isinstance(outcomes[tmp_path / "broken"], MuxdanticUsageError)
+    assert str(outcomes[tmp_path / "bad-yaml"]) == "mapping values are not allowed here"
+
+
+def test_ensure_native_loader_skips_tmuxp(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    workspace = tmp_path / ".tmuxp.yaml"
+    cfg = {"session_name": "backend", "windows": [{"window_name": "shell"}]}
+    loaded: list[object] = []
+
+    monkeypatch.setattr("muxdantic.ensure.resolve_workspace", lambda p: workspace)
+    monkeypatch.setattr("muxdantic.ensure.load_tmuxp_config", lambda p: cfg)
+    monkeypatch.setattr("muxdantic.ensure.has_session", lambda n, s: False)
+    monkeypatch.setattr("muxdantic.ensure.session_lock", contextmanager(lambda server, name: iter([None])))
+    monkeypatch.setattr("muxdantic.ensure.tmuxp", lambda args, server: pytest.fail("tmuxp should not run"))
+    monkeypatch.setattr("muxdantic.ensure.load_native", lambda c, w, s: loaded.append((c, w)) or True)
+
+    result = ensure(EnsureRequest(workspace=workspace, loader="native"))
+
+    assert result.created is True
+    assert loaded == [(cfg, workspace)]
+
+
+def test_ensure_session_cache_hit_skips_lock_and_has_session(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    workspace = tmp_path / ".tmuxp.yaml"
+    monkeypatch.setattr("muxdantic.ensure.resolve_workspace", lambda p: workspace)
+    monkeypatch.setattr("muxdantic.ensure.load_tmuxp_config", lambda p: {"session_name": "app"})
+    monkeypatch.setattr("muxdantic.ensure.session_cached", lambda server, name: name == "app")
+    monkeypatch.setattr("muxdantic.ensure.session_lock", lambda server, name: pytest.fail("lock taken"))
+    monkeypatch.setattr("muxdantic.ensure.has_session", lambda name, server: pytest.fail("has-session forked"))
+
+    result = ensure(EnsureRequest(workspace=workspace, session_cache=True))
+
+    assert result.created is False
+
+
+def test_ensure_session_cache_miss_records_session(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    workspace = tmp_path / ".tmuxp.yaml"
+    remembered: list[tuple[str, int]] = []
+    monkeypatch.setattr("muxdantic.ensure.resolve_workspace", lambda p: workspace)
+    monkeypatch.setattr("muxdantic.ensure.load_tmuxp_config", lambda p: {"session_name": "app"})
+    monkeypatch.setattr("muxdantic.ensure.session_cached", lambda server, name: False)
+    monkeypatch.setattr("muxdantic.ensure.session_lock", contextmanager(lambda server, name: iter([None])))
+    monkeypatch.setattr("muxdantic.ensure.has_session", lambda name, server: pytest.fail("has-session forked"))
+    monkeypatch.setattr("muxdantic.ensure.session_server_pid", lambda name, server: 4242)
+    monkeypatch.setattr(
+        "muxdantic.ensure.remember_session", lambda server, name, pid: remembered.append((name, pid))
+    )
+
+    ensure(EnsureRequest(workspace=workspace, session_cache=True))
+
+    assert remembered == [("app", 4242)]
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from muxdantic.errors import MuxdanticSubprocessError, MuxdanticUsageError
+from muxdantic.fanout import fan_out, glob_servers, read_server_file, select_servers, server_label
+from muxdantic.models import TmuxServerArgs
+
+
+def test_fan_out_isolates_per_server_errors() -> None:
+    def operation(server: TmuxServerArgs) -> list[str]:
+        if server.socket_name == "broken":
+            raise MuxdanticSubprocessError(program="tmux", args=["list-windows"], returncode=1, stderr="no server")
+        return [server_label(server)]
+
+    servers = [
+        TmuxServerArgs(socket_name="tenant-a"),
+        TmuxServerArgs(socket_name="broken"),
+        TmuxServerArgs(socket_path="/run/tmux/b"),
+    ]
+    result = fan_out(servers, operation)
+
+    assert result.results == {"tenant-a": ["tenant-a"], "/run/tmux/b": ["/run/tmux/b"]}
+    assert list(result.errors) == ["broken"]
+    assert "no server" in result.errors["broken"]
+
+
+def test_fan_out_records_unexpected_exceptions_per_server() -> None:
+    def operation(server: TmuxServerArgs) -> str:
+        if server.socket_name == "stale":
+            raise OSError("[Errno 111] Connection refused")
+        if server.socket_name == "bad-output":
+            raise ValueError("invalid literal for int()")
+        return "ok"
+
+    servers = [
+        TmuxServerArgs(socket_name="stale"),
+        TmuxServerArgs(socket_name="bad-output"),
+        TmuxServerArgs(socket_name="healthy"),
+    ]
+    result = fan_out(servers, operation)
+
+    assert result.results == {"healthy": "ok"}
+    assert result.errors == {
+        "stale": "[Errno 111] Connection refused",
+        "bad-output": "invalid literal for int()",
+    }
+
+
+def test_fan_out_bounds_parallelism() -> None:
+    lock = threading.Lock()
+    in_flight = {"now": 0, "peak": 0}
+
+    def operation(server: TmuxServerArgs) -> None:
+        with lock:
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        time.sleep(0.02)
+        with lock:
+            in_flight["now"] -= 1
+
+    servers = [TmuxServerArgs(socket_name=f"t{i}") for i in range(9)]
+    result = fan_out(servers, operation, max_parallel=3)
+
+    assert len(result.results) == 9
+    assert 1 < in_flight["peak"] <= 3
+
+
+def test_fan_out_rejects_zero_parallelism() -> None:
+    with pytest.raises(MuxdanticUsageError, match="max_parallel"):
+        fan_out([TmuxServerArgs()], lambda server: None, max_parallel=0)
+
+
+def test_glob_servers_matches_only_sockets(tmp_path: Path) -> None:
+    listeners = []
+    for name in ("tenant-a", "tenant-b", "other"):
+        sock = socket.socket(socket.AF_UNIX)
+        sock.bind(str(tmp_path / name))
+        listeners.append(sock)
+    (tmp_path / "tenant-notes").write_text("not a socket", encoding="utf-8")
+
+    try:
+        servers = glob_servers("tenant-*", directory=tmp_path)
+    finally:
+        for sock in listeners:
+            sock.close()
+
+    assert [server.socket_path for server in servers] == [str(tmp_path / "tenant-a"), str(tmp_path / "tenant-b")]
+
+
+def test_read_server_file_and_select_servers_dedupe(tmp_path: Path) -> None:
+    server_file = tmp_path / "servers.txt"
+    server_file.write_text("# tenants\ntenant-a\n\n/run/tmux/b  # shared\ntenant-c\n", encoding="utf-8")
+
+    assert read_server_file(server_file) == [
+        TmuxServerArgs(socket_name="tenant-a"),
+        TmuxServerArgs(socket_path="/run/tmux/b"),
+        TmuxServerArgs(socket_name="tenant-c"),
+    ]
+
+    servers = select_servers(socket_names=["tenant-c", "tenant-a"], server_file=server_file)
+    assert [server_label(server) for server in servers] == ["tenant-c", "tenant-a", "/run/tmux/b"]
+
+
+def test_read_server_file_missing_is_usage_error(tmp_path: Path) -> None:
+    with pytest.raises(MuxdanticUsageError, match="server file"):
+        read_server_file(tmp_path / "missing.txt")
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from muxdantic.errors import MuxdanticUsageError
+from muxdantic.graph import critical_path, load_graph_file
+from muxdantic.jobs import run_graph
+from muxdantic.models import GraphRequest, JobRef, JobResult, TmuxServerArgs
+
+
+def _graph(nodes: list[dict], **kwargs) -> GraphRequest:
+    return GraphRequest(workspace=Path("w"), nodes=nodes, **kwargs)
+
+
+def test_graph_request_rejects_cycles_unknown_and_duplicate_nodes() -> None:
+    with pytest.raises(ValidationError, match="cycle"):
+        _graph([{"name": "a", "cmd": ["x"], "depends_on": ["b"]}, {"name": "b", "cmd": ["x"], "depends_on": ["a"]}])
+    with pytest.raises(ValidationError, match="unknown nodes: nope"):
+        _graph([{"name": "a", "cmd": ["x"], "depends_on": ["nope"]}])
+    with pytest.raises(ValidationError, match="duplicate node names: a"):
+        _graph([{"name": "a", "cmd": ["x"]}, {"name": "a", "cmd": ["y"]}])
+    with pytest.raises(ValidationError, match="mutually exclusive"):
+        _graph([{"name": "a", "cmd": ["x"], "keep": True, "rm": True}])
+
+
+def test_graph_node_builds_notifying_run_request() -> None:
+    graph = _graph([{"name": "Unit Tests", "cmd": ["pytest"], "env": {"CI": "1"}}])
+
+    req = graph.nodes[0].to_run_request(Path("w"), TmuxServerArgs(socket_name="mx"))
+
+    assert req.tag == "unit-tests"
+    assert req.notify is True
+    assert req.env == {"CI": "1"}
+    assert req.server.socket_name == "mx"
+
+
+def test_load_graph_file_accepts_mapping_nodes(tmp_path: Path) -> None:
+    graph_file = tmp_path / "graph.yaml"
+    graph_file.write_text(
+        "max_parallel: 3\n"
+        "nodes:\n"
+        "  build: {cmd: [make]}\n"
+        "  test: {cmd: [make, test], depends_on: [build]}\n",
+        encoding="utf-8",
+    )
+
+    graph = load_graph_file(graph_file, tmp_path, TmuxServerArgs())
+    assert [node.name for node in graph.nodes] == ["build", "test"]
+    assert graph.max_parallel == 3
+
+    assert load_graph_file(graph_file, tmp_path, TmuxServerArgs(), max_parallel=1).max_parallel == 1
+
+    graph_file.write_text("nodes: {a: {cmd: [x], depends_on: [a]}}\n", encoding="utf-8")
+    with pytest.raises(MuxdanticUsageError, match="cycle"):
+        load_graph_file(graph_file, tmp_path, TmuxServerArgs())
+
+
+def test_critical_path_follows_last_finishing_dependency() -> None:
+    depends_on = {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]}
+    spans = {"a": (0.0, 1.0), "b": (1.0, 5.0), "c": (1.0, 2.0), "d": (5.0, 6.0)}
+
+    assert critical_path(depends_on, spans) == (["a", "b", "d"], 6.0)
+    assert critical_path(depends_on, {}) == ([], 0.0)
+
+
+def _result(job_id: str, exit_status: int) -> JobResult:
+    return JobResult(
+        job_id=job_id,
+        cmd=["x"],
+        exit_status=exit_status,
+        started_at="2026-02-11T14:30:12Z",
+        ended_at="2026-02-11T14:30:13Z",
+        wall_time_s=1.0,
+        user_cpu_s=0.0,
+        sys_cpu_s=0.0,
+        max_rss_kb=1,
+    )
+
+
+def test_run_graph_respects_dependencies_parallelism_and_failures(monkeypatch: pytest.MonkeyPatch) -> None:
+    exit_codes = {"a": 0, "b": 0, "c": 3, "d": 0, "e": 0}
+    launched: list[str] = []
+
+    def fake_run(req):
+        assert req.notify is True
+        launched.append(req.tag)
+        return JobRef(
+            job_id=f"id-{req.tag}",
+            tag=req.tag,
+            ts_utc="20260211T143012Z",
+            session_name="dev",
+            window_id="@1",
+            window_name=f"job:{req.tag}:20260211T143012Z:id",
+            pane_id="%1",
+        )
+
+    def fake_wait_job(job_id: str, server: TmuxServerArgs) -> JobResult:
+        name = job_id.removeprefix("id-")
+        return _result(job_id, exit_codes[name])
+
+    monkeypatch.setattr("muxdantic.jobs.run", fake_run)
+    monkeypatch.setattr("muxdantic.jobs.wait_job", fake_wait_job)
+
+    graph = _graph(
+        [
+            {"name": "a", "cmd": ["x"]},
+            {"name": "b", "cmd": ["x"], "depends_on": ["a"]},
+            {"name": "c", "cmd": ["x"], "depends_on": ["a"]},
+            {"name": "d", "cmd": ["x"], "depends_on": ["c"]},
+            {"name": "e", "cmd": ["x"], "depends_on": ["b"]},
+        ],
+        max_parallel=1,
+    )
+
+    result = run_graph(graph)
+
+    assert launched[0] == "a"
+    assert sorted(launched) == ["a", "b", "c", "e"]
+    assert launched.index("b") < launched.index("e")
+    statuses = {node.name: node.status for node in result.nodes}
+    assert statuses == {"a": "succeeded", "b": "succeeded", "c": "failed", "d": "skipped", "e": "succeeded"}
+    assert result.succeeded is False
+    assert {node.name: node.exit_status for node in result.nodes}["c"] == 3
+    assert result.critical_path[0] == "a"
+
+
+def test_run_graph_fails_node_whose_launch_raises(monkeypatch: pytest.MonkeyPatch) -> None:
+    launched: list[str] = []
+
+    def fake_run(req) -> JobRef:
+        if req.tag == "b":
+            raise MuxdanticUsageError("cwd does not exist: /nope")
+        launched.append(req.tag)
+        return JobRef(
+            job_id=f"id-{req.tag}",
+            tag=req.tag,
+            ts_utc="20260211T143012Z",
+            session_name="dev",
+            window_id="@1",
+            window_name=f"job:{req.tag}:20260211T143012Z:id",
+            pane_id="%1",
+        )
+
+    monkeypatch.setattr("muxdantic.jobs.run", fake_run)
+    monkeypatch.setattr("muxdantic.jobs.wait_job", lambda job_id, server: _result(job_id, 0))
+
+    graph = _graph(
+        [
+            {"name": "a", "cmd": ["x"]},
+            {"name": "b", "cmd": ["x"]},
+            {"name": "c", "cmd": ["x"], "depends_on": ["b"]},
+            {"name": "d", "cmd": ["x"], "depends_on": ["a"]},
+        ],
+        max_parallel=2,
+    )
+
+    result = run_graph(graph)
+
+    nodes = {node.name: node for node in result.nodes}
+    assert {name: node.status for name, node in nodes.items()} == {
+        "a": "succeeded",
+        "b": "failed",
+        "c": "skipped",
+        "d": "succeeded",
+    }
+    assert nodes["b"].error == "cwd does not exist: /nope" and nodes["b"].job_id is None
+    assert sorted(launched) == ["a", "d"]
+    assert result.succeeded is False
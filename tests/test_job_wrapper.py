@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import shlex
+import sys
+from pathlib import Path
+
+import pytest
+
+from muxdantic.job_wrapper import main as wrapper_main
+from muxdantic.jobs import run
+from muxdantic.models import RunRequest, TmuxServerArgs
+from muxdantic.results import build_wrapper_argv, log_sidecar_path_for, read_result, result_path_for
+
+
+def test_wrapper_records_exit_status_and_rusage(tmp_path: Path) -> None:
+    cache_file = result_path_for("abc123", cache_root=tmp_path)
+    log_sidecar = log_sidecar_path_for(tmp_path / "logs" / "abc123.jsonl")
+
+    rc = wrapper_main(
+        [
+            "--job-id",
+            "abc123",
+            "--result-file",
+            str(cache_file),
+            "--result-file",
+            str(log_sidecar),
+            "--",
+            sys.executable,
+            "-c",
+            "raise SystemExit(3)",
+        ]
+    )
+
+    assert rc == 3
+    assert log_sidecar == tmp_path / "logs" / "abc123.result.json"
+    assert json.loads(log_sidecar.read_text(encoding="utf-8")) == json.loads(cache_file.read_text(encoding="utf-8"))
+
+    result = read_result("abc123", cache_root=tmp_path)
+    assert result is not None
+    assert result.exit_status == 3
+    assert result.signal is None
+    assert result.cmd[1:] == ["-c", "raise SystemExit(3)"]
+    assert result.wall_time_s >= 0
+    assert result.max_rss_kb > 0
+
+
+def test_wrapper_reports_missing_command_as_127(tmp_path: Path) -> None:
+    result_file = tmp_path / "missing.json"
+
+    rc = wrapper_main(["--job-id", "abc123", "--result-file", str(result_file), "--", str(tmp_path / "nope")])
+
+    assert rc == 127
+    assert json.loads(result_file.read_text(encoding="utf-8"))["exit_status"] == 127
+
+
+def test_wrapper_signals_notify_channel_after_writing_result(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    result_file = tmp_path / "abc123.json"
+    signalled: list[tuple[str, list[str], bool]] = []
+
+    monkeypatch.setattr(
+        "muxdantic.job_wrapper._signal_channel",
+        lambda channel, tmux_args: signalled.append((channel, tmux_args, result_file.exists())),
+    )
+
+    rc = wrapper_main(
+        [
+            "--job-id",
+            "abc123",
+            "--result-file",
+            str(result_file),
+            "--notify-channel",
+            "muxdantic-job-abc123",
+            "-L",
+            "mx",
+            "--",
+            sys.executable,
+            "-c",
+            "pass",
+        ]
+    )
+
+    assert rc == 0
+    assert signalled == [("muxdantic-job-abc123", ["-L", "mx"], True)]
+
+
+def test_read_result_missing_is_none(tmp_path: Path) -> None:
+    assert read_result("nothing", cache_root=tmp_path) is None
+
+
+def test_run_record_result_wraps_command(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    req = RunRequest(
+        workspace=tmp_path / ".tmuxp.yaml",
+        tag="build",
+        cmd=["make", "test"],
+        log_dir=tmp_path / "logs",
+        record_result=True,
+    )
+    sent: dict[str, str] = {}
+
+    monkeypatch.setattr(
+        "muxdantic.jobs.ensure",
+        lambda ensure_req: type("EnsureResult", (), {"session_name": "dev"})(),
+    )
+    monkeypatch.setattr("muxdantic.jobs._generate_job_id", lambda: "abc123")
+    monkeypatch.setattr("muxdantic.jobs.new_window", lambda session_name, window_name, server: ("@9", window_name, "%11"))
+    monkeypatch.setattr("muxdantic.jobs.set_window_options", lambda *args: None)
+    monkeypatch.setattr("muxdantic.logging.pipe_pane", lambda *args: None)
+    monkeypatch.setattr("muxdantic.jobs.send_keys", lambda pane_id, string, server: sent.update(keys=string))
+
+    job_ref = run(req)
+
+    expected = build_wrapper_argv(
+        "abc123",
+        ["make", "test"],
+        [result_path_for("abc123"), tmp_path / "logs" / "abc123.result.json"],
+    )
+    assert sent["keys"] == f"exec {shlex.join(expected)}"
+    assert job_ref.result_file == result_path_for("abc123")
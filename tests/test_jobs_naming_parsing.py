@@ -4,9 +4,11 @@ from pathlib import Path
 
 import pytest
 
+from muxdantic.errors import MuxdanticSubprocessError
 from muxdantic.jobs import list_jobs
 from muxdantic.models import TmuxServerArgs
 from muxdantic.tags import build_job_window_name, parse_job_window_name
+from muxdantic.tmux import JOB_OPTIONS, JobPaneRow
 
 
 def test_job_window_name_roundtrip() -> None:
@@ -19,18 +21,17 @@ def test_list_jobs_parses_tmux_tabular_data(monkeypatch: pytest.MonkeyPatch, tmp
     monkeypatch.setattr("muxdantic.jobs.resolve_workspace", lambda p: tmp_path / ".tmuxp.yaml")
     monkeypatch.setattr("muxdantic.jobs.load_tmuxp_config", lambda p: {"session_name": "dev"})
     monkeypatch.setattr("muxdantic.jobs.extract_session_name", lambda cfg: "dev")
+    no_options = dict.fromkeys(JOB_OPTIONS, "")
     monkeypatch.setattr(
-        "muxdantic.jobs.list_windows",
-        lambda session, server: [
-            ("@1", "editor"),
-            ("@2", "job:build:20260211T143012Z:abc123"),
-            ("@3", "job:broken-name"),
+        "muxdantic.jobs.list_job_panes",
+        lambda session, server, filter_expr=None: [
+            JobPaneRow("@1", "editor", "%10", 0, None, None, no_options),
+            JobPaneRow("@2", "job:build:20260211T143012Z:abc123", "%9", 1, 2, 1700000000, no_options),
+            JobPaneRow("@2", "job:build:20260211T143012Z:abc123", "%12", 0, None, None, no_options),
+            JobPaneRow("@3", "job:broken-name", "%11", 0, None, None, no_options),
         ],
     )
-    monkeypatch.setattr(
-        "muxdantic.jobs.list_panes",
-        lambda target, server: [("%9", 1, 2, 1700000000)] if target == "@2" else [("%10", 0, None, None)],
-    )
+    monkeypatch.setattr("muxdantic.jobs.read_result", lambda job_id: None)
 
     jobs = list_jobs(tmp_path, TmuxServerArgs())
 
@@ -46,5 +47,138 @@ def test_list_jobs_parses_tmux_tabular_data(monkeypatch: pytest.MonkeyPatch, tmp
         "pane_dead": 1,
         "pane_dead_status": 2,
         "pane_dead_time": 1700000000,
+        "pane_pid": None,
         "state": "exited",
+        "cmd": None,
+        "log_file": None,
+        "workspace": None,
+        "requester": None,
+        "key": None,
+        "server": None,
+        "result": None,
+        "stats": None,
     }
+
+
+def test_list_jobs_reads_window_user_options(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr("muxdantic.jobs.resolve_workspace", lambda p: tmp_path / ".tmuxp.yaml")
+    monkeypatch.setattr("muxdantic.jobs.load_tmuxp_config", lambda p: {"session_name": "dev"})
+    monkeypatch.setattr("muxdantic.jobs.extract_session_name", lambda cfg: "dev")
+    monkeypatch.setattr("muxdantic.jobs.read_result", lambda job_id: None)
+    options = {
+        "@mux_job_id": "abc123",
+        "@mux_tag": "build",
+        "@mux_ts": "20260211T143012Z",
+        "@mux_log": "/var/log/jobs/abc123.jsonl",
+        "@mux_cmd": '["make", "-j4"]',
+        "@mux_workspace": "/srv/app/.tmuxp.yaml",
+        "@mux_requester": "ci",
+    }
+    monkeypatch.setattr(
+        "muxdantic.jobs.list_job_panes",
+        lambda session, server, filter_expr=None: [JobPaneRow("@2", "renamed-by-user", "%9", 0, None, None, options)],
+    )
+
+    [job] = list_jobs(tmp_path, TmuxServerArgs())
+
+    assert (job.job_id, job.tag, job.window_name) == ("abc123", "build", "renamed-by-user")
+    assert job.cmd == ["make", "-j4"]
+    assert job.log_file == Path("/var/log/jobs/abc123.jsonl")
+    assert (job.workspace, job.requester) == ("/srv/app/.tmuxp.yaml", "ci")
+
+
+def _job_row(window_id: str, tag: str, ts_utc: str, job_id: str, pane_dead: int = 0) -> JobPaneRow:
+    options = dict.fromkeys(JOB_OPTIONS, "")
+    options.update({"@mux_job_id": job_id, "@mux_tag": tag, "@mux_ts": ts_utc})
+    return JobPaneRow(window_id, build_job_window_name(tag, ts_utc, job_id), "%1", pane_dead, None, None, options)
+
+
+def test_list_jobs_pushes_predicates_into_tmux_filter(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr("muxdantic.jobs.resolve_workspace", lambda p: tmp_path / ".tmuxp.yaml")
+    monkeypatch.setattr("muxdantic.jobs.load_tmuxp_config", lambda p: {"session_name": "dev"})
+    monkeypatch.setattr("muxdantic.jobs.extract_session_name", lambda cfg: "dev")
+    monkeypatch.setattr("muxdantic.jobs.read_result", lambda job_id: None)
+    filters: list[str | None] = []
+
+    def fake_list_job_panes(session: str, server: TmuxServerArgs, filter_expr: str | None = None) -> list[JobPaneRow]:
+        filters.append(filter_expr)
+        return [_job_row("@2", "ci-build", "20260211T143012Z", "abc123")]
+
+    monkeypatch.setattr("muxdantic.jobs.list_job_panes", fake_list_job_panes)
+
+    jobs = list_jobs(tmp_path, TmuxServerArgs(), tag="CI Build", state="running", older_than=60)
+
+    assert [job.job_id for job in jobs] == ["abc123"]
+    [expr] = filters
+    assert expr is not None and expr.startswith("#{&&:#{||:#{==:#{session_name},dev},#{m:dev-jobs-*,#{session_name}}},")
+    assert "#{&&:#{||:#{@mux_job_id},#{m:job:*,#{window_name}}}," in expr
+    assert "#{==:#{@mux_tag},ci-build}" in expr
+    assert "#{m:job:ci-build:*,#{window_name}}" in expr
+    assert "#{==:#{pane_dead},0}" in expr
+    assert "#{<=:#{@mux_ts}," in expr
+
+
+def test_list_jobs_falls_back_to_python_filtering(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr("muxdantic.jobs.resolve_workspace", lambda p: tmp_path / ".tmuxp.yaml")
+    monkeypatch.setattr("muxdantic.jobs.load_tmuxp_config", lambda p: {"session_name": "dev"})
+    monkeypatch.setattr("muxdantic.jobs.extract_session_name", lambda cfg: "dev")
+    monkeypatch.setattr("muxdantic.jobs.read_result", lambda job_id: None)
+    filters: list[str | None] = []
+
+    def fake_list_job_panes(session: str, server: TmuxServerArgs, filter_expr: str | None = None) -> list[JobPaneRow]:
+        filters.append(filter_expr)
+        if filter_expr is not None:
+            raise MuxdanticSubprocessError(
+                program="tmux", args=["list-panes"], returncode=1, stderr="list-panes: unknown option -- f\n"
+            )
+        return [
+            _job_row("@2", "build", "20260211T143012Z", "abc123"),
+            _job_row("@3", "lint", "20260211T143013Z", "def456"),
+            _job_row("@4", "build", "20260211T143014Z", "fed789", pane_dead=1),
+        ]
+
+    monkeypatch.setattr("muxdantic.jobs.list_job_panes", fake_list_job_panes)
+
+    jobs = list_jobs(tmp_path, TmuxServerArgs(), tag="build", state="running")
+
+    assert [job.job_id for job in jobs] == ["abc123"]
+    assert filters[1] is None
+
+
+def test_list_jobs_reraises_other_tmux_failures(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr("muxdantic.jobs.resolve_workspace", lambda p: tmp_path / ".tmuxp.yaml")
+    monkeypatch.setattr("muxdantic.jobs.load_tmuxp_config", lambda p: {"session_name": "dev"})
+    monkeypatch.setattr("muxdantic.jobs.extract_session_name", lambda cfg: "dev")
+
+    def fake_list_job_panes(session: str, server: TmuxServerArgs, filter_expr: str | None = None) -> list[JobPaneRow]:
+        raise MuxdanticSubprocessError(
+            program="tmux", args=["list-panes"], returncode=1, stderr="can't find session: dev\n"
+        )
+
+    monkeypatch.setattr("muxdantic.jobs.list_job_panes", fake_list_job_panes)
+
+    with pytest.raises(MuxdanticSubprocessError):
+        list_jobs(tmp_path, TmuxServerArgs(), tag="build")
+
+
+def test_list_jobs_spans_shard_sessions(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr("muxdantic.jobs.resolve_workspace", lambda p: tmp_path / ".tmuxp.yaml")
+    monkeypatch.setattr("muxdantic.jobs.load_tmuxp_config", lambda p: {"session_name": "dev"})
+    monkeypatch.setattr("muxdantic.jobs.extract_session_name", lambda cfg: "dev")
+    monkeypatch.setattr("muxdantic.jobs.read_result", lambda job_id: None)
+    sessions: list[str | None] = []
+
+    def fake_list_job_panes(session: str | None, server: TmuxServerArgs, filter_expr: str | None = None):
+        sessions.append(session)
+        return [
+            _job_row("@2", "build", "20260211T143012Z", "abc123")._replace(session_name="dev"),
+            _job_row("@5", "build", "20260211T143013Z", "def456")._replace(session_name="dev-jobs-1"),
+            _job_row("@7", "build", "20260211T143014Z", "fed789")._replace(session_name="other"),
+        ]
+
+    monkeypatch.setattr("muxdantic.jobs.list_job_panes", fake_list_job_panes)
+
+    jobs = list_jobs(tmp_path, TmuxServerArgs())
+
+    assert sessions == [None]
+    assert [(job.job_id, job.session_name) for job in jobs] == [("abc123", "dev"), ("def456", "dev-jobs-1")]
@@ -3,7 +3,7 @@ from __future__ import annotations
 import re
 from pathlib import Path
 
-from muxdantic.locking import lock_filename, lock_key, lock_path_for, session_lock
+from muxdantic.locking import lock_filename, lock_key, lock_path_for, session_lock, unique_lock
 from muxdantic.models import TmuxServerArgs
 
 
@@ -29,3 +29,13 @@ def test_session_lock_creates_lock_file(tmp_path: Path) -> None:
     with session_lock(server, "api", lock_root=tmp_path) as lock_file:
         assert lock_file.exists()
         assert lock_file.parent == tmp_path
+
+
+def test_unique_lock_is_separate_per_key(tmp_path: Path) -> None:
+    server = TmuxServerArgs(socket_name="dev")
+
+    with unique_lock(server, "api", "tag=build", lock_root=tmp_path) as build_lock:
+        with unique_lock(server, "api", "tag=lint", lock_root=tmp_path) as lint_lock:
+            assert build_lock != lint_lock
+        with session_lock(server, "api", lock_root=tmp_path) as session_file:
+            assert session_file != build_lock
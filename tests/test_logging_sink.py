@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import functools
 import io
 import json
+import os
 import re
 from pathlib import Path
 
-from muxdantic.logging_sink import stream_jsonl
+import pytest
+
+from muxdantic.logging import build_sink_command, marks_path_for, raw_to_jsonl_records
+from muxdantic import logging_sink
+from muxdantic.logging_sink import RingBuffer, collapse_cr, stream_jsonl, stream_raw, strip_ansi
 
 
 ISO_UTC_Z_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?Z$")
@@ -21,3 +27,190 @@ def test_stream_jsonl_writes_line_records(tmp_path: Path) -> None:
     assert [row["line"] for row in rows] == ["first line", "  keep spaces  ", "last-no-newline"]
     assert all(row["job_id"] == "abc123" for row in rows)
     assert all(ISO_UTC_Z_RE.match(row["ts"]) for row in rows)
+
+
+def test_stream_raw_copies_bytes_and_records_marks(tmp_path: Path) -> None:
+    log_path = tmp_path / "logs" / "job.log"
+    marks_path = tmp_path / "logs" / "job.marks.jsonl"
+    read_fd, write_fd = os.pipe()
+    payload = b"plain\nprog 1\rprog 2\r\x1b[32mdone\x1b[0m\n\xff partial"
+    os.write(write_fd, payload)
+    os.close(write_fd)
+
+    try:
+        stream_raw(job_id="abc123", output_file=log_path, marks_file=marks_path, in_fd=read_fd)
+    finally:
+        os.close(read_fd)
+
+    assert log_path.read_bytes() == payload
+    marks = [json.loads(line) for line in marks_path.read_text(encoding="utf-8").splitlines()]
+    assert marks[0]["job_id"] == "abc123"
+    assert marks[0]["offset"] == 0
+    assert ISO_UTC_Z_RE.match(marks[0]["ts"])
+
+
+def test_raw_to_jsonl_records_matches_sink_format(tmp_path: Path) -> None:
+    log_path = tmp_path / "job.log"
+    log_path.write_bytes(b"first\nsecond\r\nthird\nlast")
+    marks_file = marks_path_for(log_path)
+    marks_file.write_text(
+        '{"job_id": "abc123", "offset": 0, "ts": "2026-02-11T14:30:12Z"}\n'
+        '{"job_id": "abc123", "offset": 14, "ts": "2026-02-11T14:30:13Z"}\n'
+        '{"job_id": "abc1',
+        encoding="utf-8",
+    )
+
+    records = list(raw_to_jsonl_records(log_path))
+
+    assert records == [
+        {"ts": "2026-02-11T14:30:12Z", "job_id": "abc123", "line": "first"},
+        {"ts": "2026-02-11T14:30:12Z", "job_id": "abc123", "line": "second\r"},
+        {"ts": "2026-02-11T14:30:13Z", "job_id": "abc123", "line": "third"},
+        {"ts": "2026-02-11T14:30:13Z", "job_id": "abc123", "line": "last"},
+    ]
+
+
+def test_strip_ansi_and_collapse_cr() -> None:
+    assert strip_ansi("\x1b[1;32mPASSED\x1b[0m \x1b]0;title\x07done\x1b(B\x07") == "PASSED done"
+    assert strip_ansi("tab\tkept\r") == "tab\tkept\r"
+    assert collapse_cr("10%\r55%\r100% done\r") == "100% done"
+    assert collapse_cr("downloading\rok") == "okwnloading"
+    assert collapse_cr("plain") == "plain"
+
+
+def test_collapse_cr_honours_erase_line_sequences() -> None:
+    assert collapse_cr("long text here\r\x1b[2K10%") == "10%"
+    assert collapse_cr("long text here\r10%\x1b[K") == "10%"
+    assert collapse_cr("long text here\r\x1b[0K10%\r\x1b[2K55%") == "55%"
+    assert collapse_cr("abc\x1b[K") == "abc"
+
+
+def test_stream_jsonl_collapses_before_stripping_erase_line(tmp_path: Path) -> None:
+    log_path = tmp_path / "job.jsonl"
+    stdin = io.StringIO("\x1b[32mlong text here\x1b[0m\r\x1b[2K\x1b[1m10%\x1b[0m\n\x1b[32mlong text\x1b[0m\rok\n")
+
+    stream_jsonl(
+        job_id="abc123",
+        output_file=log_path,
+        stdin=stdin,
+        strip_ansi_codes=True,
+        collapse_carriage_returns=True,
+    )
+
+    rows = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert [row["line"] for row in rows] == ["10%", "okng text"]
+
+
+def test_stream_jsonl_filters_and_rate_limits(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = iter([0.0, 0.0, 0.1, 0.2, 0.3, 1.5])
+    monkeypatch.setattr(
+        "muxdantic.logging_sink._RateLimiter",
+        functools.partial(logging_sink._RateLimiter, clock=lambda: next(clock)),
+    )
+    log_path = tmp_path / "job.jsonl"
+    stdin = io.StringIO("\x1b[33mone\x1b[0m\n1%\r50%\r99%\rtwo\nthree\nfour\nfive\n")
+
+    stream_jsonl(
+        job_id="abc123",
+        output_file=log_path,
+        stdin=stdin,
+        strip_ansi_codes=True,
+        collapse_carriage_returns=True,
+        rate_limit=2,
+    )
+
+    rows = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert [row["line"] for row in rows] == ["one", "two", "five"]
+    assert "skipped" not in rows[1]
+    assert rows[2]["skipped"] == 2
+
+
+def test_stream_jsonl_reports_lines_skipped_at_the_end(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        "muxdantic.logging_sink._RateLimiter",
+        functools.partial(logging_sink._RateLimiter, clock=lambda: 0.0),
+    )
+    for buffer_lines in (None, 16):
+        log_path = tmp_path / f"job-{buffer_lines}.jsonl"
+        stream_jsonl(
+            job_id="abc123",
+            output_file=log_path,
+            stdin=io.StringIO("one\ntwo\nthree\nfour\n"),
+            rate_limit=1,
+            buffer_lines=buffer_lines,
+        )
+
+        rows = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+        assert rows[0]["line"] == "one"
+        assert rows[1] == {"ts": rows[1]["ts"], "job_id": "abc123", "skipped": 3}
+
+
+def test_build_sink_command_passes_filter_flags(tmp_path: Path) -> None:
+    command = build_sink_command("abc123", tmp_path / "job.jsonl", strip_ansi=True, collapse_cr=True, rate_limit=50)
+
+    assert command.endswith(" --strip-ansi --collapse-cr --rate-limit 50")
+
+
+@pytest.mark.parametrize(
+    ("overflow", "kept"),
+    [("drop-oldest", ["c", "d"]), ("drop-newest", ["a", "b"])],
+)
+def test_ring_buffer_overflow_policies(overflow: str, kept: list[str]) -> None:
+    buffer = RingBuffer(2, overflow)
+    for line in ("a", "b", "c", "d"):
+        buffer.put({"line": line})
+
+    assert [record["line"] for _, record in buffer.take_all()] == kept
+    assert (buffer.dropped_lines, buffer.dropped_bytes) == (2, 4)
+    buffer.close()
+    assert buffer.take_all() is None
+
+
+def test_stream_jsonl_buffered_writes_summary(tmp_path: Path) -> None:
+    log_path = tmp_path / "job.jsonl"
+
+    stream_jsonl(
+        job_id="abc123",
+        output_file=log_path,
+        stdin=io.StringIO("".join(f"line {i}\n" for i in range(100))),
+        buffer_lines=1000,
+        overflow="block",
+    )
+
+    rows = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert [row["line"] for row in rows[:-1]] == [f"line {i}" for i in range(100)]
+    assert rows[-1]["summary"] == {"lines": 100, "dropped_lines": 0, "dropped_bytes": 0, "overflow": "block"}
+
+
+def test_stream_jsonl_publishes_sink_stats(tmp_path: Path) -> None:
+    stats_path = tmp_path / "stats" / "abc123.json"
+
+    stream_jsonl(
+        job_id="abc123",
+        output_file=tmp_path / "job.jsonl",
+        stdin=io.StringIO("one\ntwo\n"),
+        stats_file=stats_path,
+    )
+
+    stats = json.loads(stats_path.read_text(encoding="utf-8"))
+    assert stats["closed"] is True
+    assert (stats["lines_read"], stats["lines_written"], stats["flush_count"]) == (2, 2, 2)
+    assert stats["bytes_written"] == (tmp_path / "job.jsonl").stat().st_size
+    assert stats["dropped_lines"] == 0
+
+
+def test_stream_jsonl_buffered_stats_measure_lag_per_batch(tmp_path: Path) -> None:
+    stats_path = tmp_path / "stats" / "abc123.json"
+
+    stream_jsonl(
+        job_id="abc123",
+        output_file=tmp_path / "job.jsonl",
+        stdin=io.StringIO("".join(f"line {i}\n" for i in range(600))),
+        buffer_lines=1000,
+        stats_file=stats_path,
+    )
+
+    stats = json.loads(stats_path.read_text(encoding="utf-8"))
+    assert (stats["lines_read"], stats["lines_written"]) == (600, 600)
+    assert 1 <= stats["flush_count"] <= 600
+    assert 0 <= stats["lag_s"] < 60
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import gzip
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from muxdantic.errors import MuxdanticUsageError
+from muxdantic.logging import log_segments, tail_records, write_log_meta
+from muxdantic.logsearch import grep_logs, merge_logs, parse_since, select_logs
+
+
+def _record(ts: str, job_id: str, line: str) -> str:
+    return json.dumps({"ts": ts, "job_id": job_id, "line": line}, ensure_ascii=False) + "\n"
+
+
+@pytest.fixture
+def log_dir(tmp_path: Path) -> Path:
+    build = tmp_path / "aaa.jsonl"
+    write_log_meta(build, {"job_id": "aaa", "tag": "build"})
+    with gzip.open(tmp_path / "aaa.jsonl.2.gz", "wt", encoding="utf-8") as handle:
+        handle.write(_record("2026-02-11T10:00:00Z", "aaa", "error: oldest"))
+    (tmp_path / "aaa.jsonl.1").write_text(_record("2026-02-11T11:00:00Z", "aaa", "fine"), encoding="utf-8")
+    build.write_text(
+        _record("2026-02-11T12:00:00.5Z", "aaa", 'error: "quoted" ünïcode')
+        + _record("2026-02-11T12:00:01Z", "aaa", "no match here")
+        + '{"ts": "2026-02-11T12:00:02Z", "job_id": "aaa", "line": "error: trunc',
+        encoding="utf-8",
+    )
+
+    lint = tmp_path / "bbb.jsonl"
+    write_log_meta(lint, {"job_id": "bbb", "tag": "lint"})
+    lint.write_text(_record("2026-02-11T12:30:00Z", "bbb", "error: lint"), encoding="utf-8")
+
+    (tmp_path / "ccc.marks.jsonl").write_text('{"offset": 0, "ts": "error"}\n', encoding="utf-8")
+    return tmp_path
+
+
+def test_log_segments_orders_rotated_oldest_first(log_dir: Path) -> None:
+    assert [segment.name for segment in log_segments(log_dir / "aaa.jsonl")] == [
+        "aaa.jsonl.2.gz",
+        "aaa.jsonl.1",
+        "aaa.jsonl",
+    ]
+
+
+def test_select_logs_filters_by_tag_metadata(log_dir: Path) -> None:
+    assert [entry["job_id"] for entry in select_logs(log_dir)] == ["aaa", "bbb"]
+    assert [entry["job_id"] for entry in select_logs(log_dir, tag="Lint")] == ["bbb"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_grep_logs_matches_lines_across_segments(log_dir: Path, workers: int) -> None:
+    matches = list(grep_logs(log_dir, "error:", workers=workers))
+
+    assert sorted(match["line"] for match in matches) == ['error: "quoted" ünïcode', "error: lint", "error: oldest"]
+    by_line = {match["line"]: match for match in matches}
+    assert by_line["error: oldest"]["file"].endswith("aaa.jsonl.2.gz")
+    assert by_line["error: lint"]["tag"] == "lint"
+
+
+def test_grep_logs_escaped_pattern_tag_and_since(log_dir: Path) -> None:
+    assert [match["line"] for match in grep_logs(log_dir, '"quoted" ü', workers=1)] == ['error: "quoted" ünïcode']
+
+    since = datetime(2026, 2, 11, 11, 30, tzinfo=timezone.utc)
+    matches = list(grep_logs(log_dir, "error", tag="build", since=since, workers=1))
+    assert [match["job_id"] for match in matches] == ["aaa"]
+
+
+def test_grep_logs_skips_lines_that_are_not_records(tmp_path: Path) -> None:
+    log_file = tmp_path / "aaa.jsonl"
+    write_log_meta(log_file, {"job_id": "aaa", "tag": "build"})
+    log_file.write_text(
+        '["error: list"]\n"error: string"\n404\n' + _record("2026-02-11T12:00:00Z", "aaa", "error: 404"),
+        encoding="utf-8",
+    )
+
+    assert [match["line"] for match in grep_logs(tmp_path, "error", workers=1)] == ["error: 404"]
+    assert [match["line"] for match in grep_logs(tmp_path, "404", workers=1)] == ["error: 404"]
+
+
+def test_parse_since_accepts_relative_and_iso() -> None:
+    now = datetime(2026, 2, 11, 12, 0, tzinfo=timezone.utc)
+
+    assert parse_since("90m", now=now) == datetime(2026, 2, 11, 10, 30, tzinfo=timezone.utc)
+    assert parse_since("2026-02-11T09:00:00Z") == datetime(2026, 2, 11, 9, 0, tzinfo=timezone.utc)
+    with pytest.raises(MuxdanticUsageError, match="--since"):
+        parse_since("yesterday")
+
+
+def test_merge_logs_interleaves_by_timestamp(log_dir: Path) -> None:
+    merged = [(record["job_id"], record["ts"]) for record in merge_logs(log_dir)]
+
+    assert merged == [
+        ("aaa", "2026-02-11T10:00:00Z"),
+        ("aaa", "2026-02-11T11:00:00Z"),
+        ("aaa", "2026-02-11T12:00:00.5Z"),
+        ("aaa", "2026-02-11T12:00:01Z"),
+        ("bbb", "2026-02-11T12:30:00Z"),
+    ]
+
+
+def test_merge_logs_same_tag_with_since(tmp_path: Path) -> None:
+    for job_id, seconds in (("j1", (0, 3, 4)), ("j2", (1, 2, 5))):
+        log_file = tmp_path / f"{job_id}.jsonl"
+        write_log_meta(log_file, {"job_id": job_id, "tag": "fan"})
+        log_file.write_text(
+            "".join(_record(f"2026-02-11T12:00:0{second}Z", job_id, f"{job_id}-{second}") for second in seconds),
+            encoding="utf-8",
+        )
+
+    since = datetime(2026, 2, 11, 12, 0, 2, tzinfo=timezone.utc)
+    lines = [record["line"] for record in merge_logs(tmp_path, tag="fan", since=since)]
+
+    assert lines == ["j2-2", "j1-3", "j1-4", "j2-5"]
+
+
+@pytest.mark.parametrize("block_size", [7, 64 * 1024])
+def test_tail_records_reads_back_across_segments(log_dir: Path, block_size: int) -> None:
+    log_file = log_dir / "aaa.jsonl"
+
+    lines = [record["line"] for record in tail_records(log_file, 3, block_size=block_size)]
+    assert lines == ["fine", 'error: "quoted" ünïcode', "no match here"]
+
+    # More than the log holds: every record, including the gzip segment, oldest first.
+    lines = [record["line"] for record in tail_records(log_file, 10, block_size=block_size)]
+    assert lines == ["error: oldest", "fine", 'error: "quoted" ünïcode', "no match here"]
+
+    assert tail_records(log_file, 0) == []
+    assert tail_records(log_dir / "missing.jsonl", 5) == []
+
+
+def test_tail_records_reads_only_the_end_of_a_large_log(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    log_file = tmp_path / "big.jsonl"
+    log_file.write_text(
+        "".join(_record("2026-02-11T12:00:00Z", "big", f"line {index}") for index in range(20000)),
+        encoding="utf-8",
+    )
+    reads: list[int] = []
+    real_open = Path.open
+
+    def counting_open(self: Path, *args, **kwargs):
+        handle = real_open(self, *args, **kwargs)
+        real_read = handle.read
+        handle.read = lambda size=-1: reads.append(size) or real_read(size)
+        return handle
+
+    monkeypatch.setattr(Path, "open", counting_open)
+
+    records = tail_records(log_file, 2, block_size=4096)
+
+    assert [record["line"] for record in records] == ["line 19998", "line 19999"]
+    assert reads == [4096]
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+from muxdantic.cache import write_json_atomic
+from muxdantic.logging import write_log_meta
+from muxdantic.metrics import build_report, read_sink_stats, render_prometheus
+from muxdantic.models import JobInfo
+
+
+def _stats(job_id: str, log_file: Path, updated_at: str, **fields) -> dict:
+    base = {
+        "job_id": job_id,
+        "log_file": str(log_file),
+        "pid": 4242,
+        "started_at": "2026-02-11T14:00:00Z",
+        "updated_at": updated_at,
+        "closed": False,
+        "lines_read": 1500,
+        "lines_written": 1500,
+        "bytes_written": 123456789,
+        "lines_per_sec": 12.5,
+        "flush_count": 300,
+        "flush_latency_avg_ms": 0.25,
+        "flush_latency_max_ms": 8.0,
+        "lag_s": 0.002,
+        "buffered_lines": 0,
+        "dropped_lines": 0,
+        "dropped_bytes": 0,
+        "skipped_lines": 0,
+    }
+    base.update(fields)
+    return base
+
+
+def _job(job_id: str, tag: str, state: str) -> JobInfo:
+    return JobInfo(
+        job_id=job_id,
+        tag=tag,
+        ts_utc="20260211T143012Z",
+        session_name="dev",
+        window_id="@9",
+        window_name=f"job:{tag}:20260211T143012Z:{job_id}",
+        pane_id="%11",
+        pane_dead=0 if state == "running" else 1,
+        state=state,
+    )
+
+
+def test_read_sink_stats_skips_stale_and_attaches_tag(tmp_path: Path) -> None:
+    log_file = tmp_path / "logs" / "abc123.jsonl"
+    write_log_meta(log_file, {"job_id": "abc123", "tag": "build"})
+    stats_dir = tmp_path / "cache" / "sink-stats"
+    write_json_atomic(stats_dir / "abc123.json", _stats("abc123", log_file, "2026-02-11T14:30:00Z"))
+    write_json_atomic(stats_dir / "old.json", _stats("old", tmp_path / "old.jsonl", "2026-02-10T14:30:00Z"))
+    (stats_dir / "corrupt.json").write_text("{", encoding="utf-8")
+
+    now = datetime(2026, 2, 11, 14, 30, 30, tzinfo=timezone.utc)
+    sinks = read_sink_stats(max_age=3600, cache_root=tmp_path / "cache", now=now)
+
+    assert [(sink.job_id, sink.tag) for sink in sinks] == [("abc123", "build")]
+
+
+def test_render_prometheus_counts_jobs_and_sinks(tmp_path: Path) -> None:
+    log_file = tmp_path / "abc123.jsonl"
+    write_log_meta(log_file, {"job_id": "abc123", "tag": 'we"ird'})
+    write_json_atomic(tmp_path / "sink-stats" / "abc123.json", _stats("abc123", log_file, "2026-02-11T14:30:00Z"))
+    jobs = [_job("a", "build", "running"), _job("b", "build", "running"), _job("c", "lint", "exited")]
+
+    report = build_report(jobs, read_sink_stats(cache_root=tmp_path))
+    text = render_prometheus(report)
+
+    assert [(count.state, count.tag, count.count) for count in report.jobs] == [
+        ("exited", "lint", 1),
+        ("running", "build", 2),
+    ]
+    assert 'muxdantic_jobs{state="running",tag="build"} 2\n' in text
+    assert 'muxdantic_sink_up{job_id="abc123",tag="we\\"ird"} 1\n' in text
+    assert 'muxdantic_sink_bytes_written_total{job_id="abc123",tag="we\\"ird"} 123456789\n' in text
+    assert 'muxdantic_sink_flush_latency_max_seconds{job_id="abc123",tag="we\\"ird"} 0.008\n' in text
+    assert "# TYPE muxdantic_sink_lag_seconds gauge\n" in text
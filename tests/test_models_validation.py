@@ -33,3 +33,24 @@ def test_run_request_sanitizes_tag() -> None:
 def test_sanitize_tag_rejects_empty() -> None:
     with pytest.raises(ValueError, match="at least one alphanumeric"):
         sanitize_tag("---")
+
+
+def test_run_request_validates_env_names_and_direct_pool() -> None:
+    with pytest.raises(ValidationError, match="environment variable"):
+        RunRequest(workspace=Path("w"), tag="x", cmd=["echo"], env={"A=B": "1"})
+
+    with pytest.raises(ValidationError, match="pool_size requires"):
+        RunRequest(workspace=Path("w"), tag="x", cmd=["echo"], launch="direct", pool_size=2)
+
+
+def test_run_request_rejects_line_filters_for_raw_logs() -> None:
+    with pytest.raises(ValidationError, match="require log_format='jsonl'"):
+        RunRequest(workspace=Path("w"), tag="x", cmd=["echo"], log_format="raw", log_collapse_cr=True)
+
+    with pytest.raises(ValidationError):
+        RunRequest(workspace=Path("w"), tag="x", cmd=["echo"], log_rate_limit=0)
+
+
+def test_run_request_unique_key_requires_unique() -> None:
+    with pytest.raises(ValidationError, match="unique_key requires unique"):
+        RunRequest(workspace=Path("w"), tag="x", cmd=["echo"], unique_key="deploy")
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from muxdantic.errors import MuxdanticSubprocessError
+from muxdantic.models import TmuxServerArgs
+from muxdantic.native_loader import load_native, plan_session
+from muxdantic.tmux import chain
+
+
+def test_plan_session_translates_windows_panes_and_layouts(tmp_path: Path) -> None:
+    cfg = {
+        "session_name": "dev",
+        "start_directory": "src",
+        "shell_command_before": ["source .env"],
+        "windows": [
+            {
+                "window_name": "edit",
+                "layout": "main-vertical",
+                "panes": ["vim", {"shell_command": ["make watch", "echo done;"], "start_directory": "/var/log"}],
+            },
+            {"window_name": "shell", "panes": [None]},
+        ],
+    }
+
+    commands = plan_session(cfg, tmp_path / ".tmuxp.yaml")
+
+    src = str(tmp_path / "src")
+    assert commands == [
+        ["new-session", "-d", "-s", "dev", "-n", "edit", "-c", src],
+        ["send-keys", "-t", "=dev:", "-l", "--", "source .env"],
+        ["send-keys", "-t", "=dev:", "Enter"],
+        ["send-keys", "-t", "=dev:", "-l", "--", "vim"],
+        ["send-keys", "-t", "=dev:", "Enter"],
+        ["split-window", "-t", "=dev:", "-c", "/var/log"],
+        ["select-layout", "-t", "=dev:", "main-vertical"],
+        ["send-keys", "-t", "=dev:", "-l", "--", "source .env"],
+        ["send-keys", "-t", "=dev:", "Enter"],
+        ["send-keys", "-t", "=dev:", "-l", "--", "make watch"],
+        ["send-keys", "-t", "=dev:", "Enter"],
+        ["send-keys", "-t", "=dev:", "-l", "--", "echo done;"],
+        ["send-keys", "-t", "=dev:", "Enter"],
+        ["select-pane", "-t", "=dev:.+"],
+        ["new-window", "-t", "=dev:", "-n", "shell", "-c", src],
+        ["send-keys", "-t", "=dev:", "-l", "--", "source .env"],
+        ["send-keys", "-t", "=dev:", "Enter"],
+        ["select-pane", "-t", "=dev:.+"],
+        ["select-window", "-t", "=dev:^"],
+    ]
+
+
+def test_plan_session_defaults_to_the_current_directory(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    cwd = tmp_path / "cwd"
+    cwd.mkdir()
+    monkeypatch.chdir(cwd)
+    cfg = {"session_name": "dev", "windows": [{"window_name": "a"}, {"window_name": "b"}]}
+
+    commands = plan_session(cfg, tmp_path / "workspaces" / ".tmuxp.yaml")
+
+    assert commands is not None
+    assert commands[0] == ["new-session", "-d", "-s", "dev", "-n", "a", "-c", str(cwd)]
+    assert commands[2] == ["new-window", "-t", "=dev:", "-n", "b", "-c", str(cwd)]
+
+
+@pytest.mark.parametrize(
+    "cfg",
+    [
+        {"session_name": "dev", "windows": [{"window_name": "a"}], "options": {"mouse": "on"}},
+        {"session_name": "dev", "windows": [{"window_name": "a", "focus": True}]},
+        {"session_name": "dev", "windows": [{"panes": [{"shell_command": "ls", "sleep_before": 1}]}]},
+        {"session_name": "dev", "windows": [{"panes": [{"shell_command": [{"cmd": "ls", "enter": False}]}]}]},
+        {"session_name": "dev", "windows": []},
+    ],
+)
+def test_plan_session_rejects_configs_that_need_tmuxp(cfg: dict, tmp_path: Path) -> None:
+    assert plan_session(cfg, tmp_path / ".tmuxp.yaml") is None
+
+
+def test_load_native_runs_one_tmux_chain(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    workspace = tmp_path / ".tmuxp.yaml"
+    cfg = {"session_name": "dev", "windows": [{"window_name": "a"}, {"window_name": "b"}]}
+    calls: list[list[str]] = []
+    monkeypatch.setattr("muxdantic.native_loader.tmux", lambda args, server: calls.append(args) or "")
+    monkeypatch.setattr("muxdantic.native_loader.tmuxp", lambda args, server: pytest.fail("tmuxp should not run"))
+
+    monkeypatch.setattr("muxdantic.native_loader.uuid4", lambda: type("UUID", (), {"hex": "f00d"})())
+
+    assert load_native(cfg, workspace, TmuxServerArgs()) is True
+    new_session, *rest = plan_session(cfg, workspace)
+    assert calls == [
+        chain(
+            new_session,
+            ["set-option", "-t", "=dev:", "@mux_loading", "f00d"],
+            *rest,
+            ["set-option", "-u", "-t", "=dev:", "@mux_loading"],
+        )
+    ]
+
+
+def test_load_native_falls_back_to_tmuxp(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    workspace = tmp_path / ".tmuxp.yaml"
+    server = TmuxServerArgs(socket_name="dev")
+    loads: list[tuple[list[str], TmuxServerArgs]] = []
+    monkeypatch.setattr("muxdantic.native_loader.tmux", lambda args, server: pytest.fail("tmux should not run"))
+    monkeypatch.setattr("muxdantic.native_loader.tmuxp", lambda args, server: loads.append((args, server)) or "")
+
+    cfg = {"session_name": "dev", "before_script": "./setup.sh", "windows": [{"window_name": "a"}]}
+
+    assert load_native(cfg, workspace, server) is False
+    assert loads == [(["load", "-d", "--yes", str(workspace)], server)]
+
+
+def test_load_native_kills_half_built_session(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    calls: list[list[str]] = []
+
+    def fake_tmux(args: list[str], server: TmuxServerArgs) -> str:
+        calls.append(args)
+        if args[0] == "new-session":
+            raise MuxdanticSubprocessError(program="tmux", args=args, returncode=1, stderr="unknown layout: bogus")
+        return ""
+
+    monkeypatch.setattr("muxdantic.native_loader.tmux", fake_tmux)
+    monkeypatch.setattr("muxdantic.native_loader.uuid4", lambda: type("UUID", (), {"hex": "f00d"})())
+    monkeypatch.setattr("muxdantic.native_loader.session_option", lambda name, option, server: "f00d")
+    cfg = {"session_name": "dev", "windows": [{"layout": "bogus", "panes": ["a", "b"]}]}
+
+    with pytest.raises(MuxdanticSubprocessError):
+        load_native(cfg, tmp_path / ".tmuxp.yaml", TmuxServerArgs())
+
+    assert calls[-1] == ["kill-session", "-t", "=dev"]
+
+
+def test_load_native_keeps_session_it_did_not_create(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    calls: list[list[str]] = []
+
+    def fake_tmux(args: list[str], server: TmuxServerArgs) -> str:
+        calls.append(args)
+        raise MuxdanticSubprocessError(program="tmux", args=args, returncode=1, stderr="duplicate session: dev")
+
+    monkeypatch.setattr("muxdantic.native_loader.tmux", fake_tmux)
+    monkeypatch.setattr("muxdantic.native_loader.session_option", lambda name, option, server: None)
+    cfg = {"session_name": "dev", "windows": [{"window_name": "a"}]}
+
+    with pytest.raises(MuxdanticSubprocessError, match="duplicate session"):
+        load_native(cfg, tmp_path / ".tmuxp.yaml", TmuxServerArgs())
+
+    assert len(calls) == 1 and calls[0][0] == "new-session"
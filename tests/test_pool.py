@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+import pytest
+
+from muxdantic.errors import MuxdanticSubprocessError
+from muxdantic.models import TmuxServerArgs
+from muxdantic.pool import claim_pool_window, fill_pool, pool_session_name
+
+
+@contextmanager
+def _fake_lock(server: TmuxServerArgs, session_name: str):
+    yield
+
+
+@pytest.fixture
+def pool_tmux(monkeypatch: pytest.MonkeyPatch) -> dict[str, list]:
+    state: dict[str, list] = {"panes": [], "events": []}
+
+    def fake_list_session_panes(session_name: str, server: TmuxServerArgs):
+        if not state["panes"]:
+            raise MuxdanticSubprocessError(program="tmux", args=["list-panes"], returncode=1, stderr="no session")
+        return state["panes"]
+
+    monkeypatch.setattr("muxdantic.pool.session_lock", _fake_lock)
+    monkeypatch.setattr("muxdantic.pool.list_session_panes", fake_list_session_panes)
+    monkeypatch.setattr("muxdantic.pool.has_session", lambda name, server: bool(state["panes"]))
+    monkeypatch.setattr("muxdantic.pool.session_path", lambda name, server: "/work")
+    monkeypatch.setattr(
+        "muxdantic.pool.new_session",
+        lambda name, window_name, server, *, start_directory: state["events"].append(("new-session", name, start_directory)),
+    )
+    monkeypatch.setattr(
+        "muxdantic.pool.new_window",
+        lambda name, window_name, server, *, start_directory: state["events"].append(("new-window", name, start_directory)),
+    )
+    monkeypatch.setattr("muxdantic.pool.kill_window", lambda window_id, server: state["events"].append(("kill", window_id)))
+    monkeypatch.setattr(
+        "muxdantic.pool.move_window",
+        lambda window_id, target, name, server: state["events"].append(("move", window_id, target, name)),
+    )
+    return state
+
+
+def test_fill_pool_creates_companion_session_then_windows(pool_tmux: dict[str, list]) -> None:
+    added = fill_pool("dev", 3, TmuxServerArgs())
+
+    assert added == 3
+    assert pool_tmux["events"] == [
+        ("new-session", "dev-pool", "/work"),
+        ("new-window", "dev-pool", "/work"),
+        ("new-window", "dev-pool", "/work"),
+    ]
+
+
+def test_fill_pool_replaces_dead_windows_only(pool_tmux: dict[str, list]) -> None:
+    pool_tmux["panes"] = [
+        ("@2", "pool:aaa", "%2", 0),
+        ("@3", "pool:bbb", "%3", 1),
+        ("@4", "scratch", "%4", 0),
+    ]
+
+    added = fill_pool("dev", 2, TmuxServerArgs())
+
+    assert added == 1
+    assert pool_tmux["events"] == [("kill", "@3"), ("new-window", "dev-pool", "/work")]
+
+
+def test_claim_pool_window_moves_and_renames(pool_tmux: dict[str, list]) -> None:
+    assert pool_session_name("dev") == "dev-pool"
+    assert claim_pool_window("dev", "job:build:20260211T143012Z:abc123", TmuxServerArgs()) is None
+
+    pool_tmux["panes"] = [("@2", "pool:aaa", "%2", 0)]
+    claimed = claim_pool_window("dev", "job:build:20260211T143012Z:abc123", TmuxServerArgs())
+
+    assert claimed == ("@2", "%2")
+    assert pool_tmux["events"] == [("move", "@2", "dev", "job:build:20260211T143012Z:abc123")]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from muxdantic.jobs import attach_stats
+from muxdantic.models import JobInfo
+from muxdantic.procstats import ProcSnapshot, proc_available, process_tree, scan_proc, tree_stats
+
+
+def _write_stat(root: Path, pid: int, ppid: int, *, comm: str, utime: int, stime: int, threads: int, rss: int) -> None:
+    fields = ["S", str(ppid)] + ["0"] * 9 + [str(utime), str(stime)] + ["0"] * 4 + [str(threads), "0", "0", "0", str(rss)]
+    (root / str(pid)).mkdir(parents=True, exist_ok=True)
+    (root / str(pid) / "stat").write_text(f"{pid} ({comm}) {' '.join(fields)} 0 0\n", encoding="utf-8")
+
+
+def test_scan_proc_builds_parent_index_and_tolerates_odd_comm(tmp_path: Path) -> None:
+    _write_stat(tmp_path, 10, 1, comm="bash", utime=1, stime=1, threads=1, rss=100)
+    _write_stat(tmp_path, 11, 10, comm="py (worker) x", utime=5, stime=2, threads=4, rss=200)
+    _write_stat(tmp_path, 12, 11, comm="cc1", utime=3, stime=0, threads=1, rss=50)
+    _write_stat(tmp_path, 20, 1, comm="other", utime=9, stime=9, threads=1, rss=10)
+    (tmp_path / "self").mkdir()
+
+    snapshot = scan_proc(proc_root=tmp_path)
+
+    assert snapshot.entries[11].ppid == 10
+    assert snapshot.entries[11].cpu_ticks == 7
+    assert snapshot.entries[11].threads == 4
+    assert sorted(snapshot.children[1]) == [10, 20]
+    assert sorted(process_tree(snapshot, 10)) == [10, 11, 12]
+    assert process_tree(snapshot, 999) == []
+
+
+def test_tree_stats_sums_cpu_delta_rss_and_threads(tmp_path: Path) -> None:
+    _write_stat(tmp_path, 10, 1, comm="bash", utime=1, stime=1, threads=1, rss=100)
+    _write_stat(tmp_path, 11, 10, comm="job", utime=5, stime=0, threads=4, rss=200)
+    before = scan_proc(proc_root=tmp_path)
+    _write_stat(tmp_path, 11, 10, comm="job", utime=5 + 50, stime=0, threads=4, rss=300)
+    _write_stat(tmp_path, 12, 11, comm="child", utime=10, stime=0, threads=2, rss=100)
+    after = scan_proc(proc_root=tmp_path)
+    after = ProcSnapshot(taken_at=before.taken_at + 1.0, entries=after.entries, children=after.children)
+
+    stats = tree_stats(before, after, 10)
+
+    assert stats is not None
+    ticks_per_s = os.sysconf("SC_CLK_TCK")
+    assert stats.cpu_percent == round(100.0 * 60 / ticks_per_s, 1)
+    assert stats.rss_kb == 500 * os.sysconf("SC_PAGE_SIZE") // 1024
+    assert stats.threads == 7
+    assert stats.processes == 3
+    assert tree_stats(before, after, 999) is None
+
+
+@pytest.mark.skipif(not proc_available(), reason="requires a /proc filesystem")
+def test_attach_stats_reads_pane_pids_from_the_listing(monkeypatch: pytest.MonkeyPatch) -> None:
+    jobs = [
+        JobInfo(
+            job_id=job_id,
+            tag="build",
+            ts_utc="20260211T143012Z",
+            session_name="dev",
+            window_id=f"@{n}",
+            window_name=f"job:build:20260211T143012Z:{job_id}",
+            pane_id=f"%{n}",
+            pane_dead=dead,
+            pane_pid=pid,
+            state="exited" if dead else "running",
+        )
+        for n, (job_id, dead, pid) in enumerate([("aaa", 0, os.getpid()), ("bbb", 1, 1)], start=1)
+    ]
+    monkeypatch.setattr("muxdantic.tmux.tmux", lambda args, server: pytest.fail("no extra tmux call"))
+
+    with_stats = attach_stats(jobs, interval=0.01)
+
+    assert with_stats[0].stats is not None
+    assert with_stats[0].stats.processes >= 1
+    assert with_stats[1].stats is None
@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+from muxdantic.capabilities import TmuxCapabilities
+from muxdantic.errors import MuxdanticSubprocessError, MuxdanticTimeoutError
+from muxdantic.jobs import run, wait_job
+from muxdantic.models import EnsureResult, JobInfo, JobResult, RunRequest, TmuxServerArgs
+from muxdantic.tmux import JobPaneRow
+
+
+@pytest.fixture
+def recorded(monkeypatch: pytest.MonkeyPatch) -> list[tuple]:
+    events: list[tuple] = []
+
+    monkeypatch.setattr(
+        "muxdantic.jobs.ensure",
+        lambda ensure_req: type("EnsureResult", (), {"session_name": "dev"})(),
+    )
+    monkeypatch.setattr("muxdantic.jobs._generate_job_id", lambda: "abc123")
+    monkeypatch.setattr("muxdantic.jobs._now_utc_ts", lambda: "20260211T143012Z")
+
+    def fake_new_window(session_name, window_name, server, **options):
+        events.append(("new-window", options))
+        return "@9", window_name, "%11"
+
+    monkeypatch.setattr("muxdantic.jobs.new_window", fake_new_window)
+    monkeypatch.setattr(
+        "muxdantic.jobs.set_window_options",
+        lambda window_id, options, server: events.append(("set-option", "remain-on-exit", options["remain-on-exit"])),
+    )
+    monkeypatch.setattr(
+        "muxdantic.logging.pipe_pane",
+        lambda pane_id, cmd, server: events.append(("pipe-pane", pane_id)),
+    )
+    def fake_new_job_window(session_name, window_name, server, *, command, options, pipe_command, **spawn):
+        events.append(("new-job-window", command, options["remain-on-exit"], pipe_command is not None, spawn))
+        return "@9", "%11"
+
+    monkeypatch.setattr("muxdantic.jobs.new_job_window", fake_new_job_window)
+    monkeypatch.setattr(
+        "muxdantic.jobs.send_keys",
+        lambda pane_id, string, server: events.append(("send-keys", string)),
+    )
+    monkeypatch.setattr(
+        "muxdantic.jobs.claim_pool_window",
+        lambda session_name, window_name, server: ("@4", "%4"),
+    )
+    monkeypatch.setattr("muxdantic.jobs.fill_pool", lambda session_name, size, server: 1)
+    return events
+
+
+def test_direct_launch_configures_window_in_one_call(recorded: list[tuple], tmp_path: Path) -> None:
+    req = RunRequest(
+        workspace=tmp_path,
+        tag="build",
+        cmd=["make", "-j4"],
+        launch="direct",
+        cwd=Path("/srv"),
+        env={"CI": "1"},
+        log_dir=tmp_path / "logs",
+    )
+
+    run(req)
+
+    assert recorded == [
+        ("new-job-window", ["make", "-j4"], "failed", True, {"start_directory": "/srv", "environment": {"CI": "1"}}),
+    ]
+
+
+def test_send_keys_launch_passes_cwd_and_env_to_new_window(recorded: list[tuple], tmp_path: Path) -> None:
+    run(RunRequest(workspace=tmp_path, tag="build", cmd=["make"], cwd=Path("/srv"), env={"CI": "1"}))
+
+    assert recorded[0] == ("new-window", {"start_directory": "/srv", "environment": {"CI": "1"}})
+    assert recorded[-1] == ("send-keys", "exec make")
+
+
+def test_tmux_without_spawn_environment_gets_env_on_command_line(
+    recorded: list[tuple], monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr("muxdantic.jobs.tmux_capabilities", lambda: TmuxCapabilities("2.9a"))
+
+    run(RunRequest(workspace=tmp_path, tag="build", cmd=["make"], cwd=Path("/srv"), env={"CI": "1"}))
+    run(RunRequest(workspace=tmp_path, tag="build", cmd=["make"], launch="direct", env={"CI": "1"}))
+
+    assert recorded[0] == ("new-window", {"start_directory": "/srv"})
+    assert ("send-keys", "exec env CI=1 make") in recorded
+    assert recorded[-1] == ("new-job-window", ["env", "CI=1", "make"], "failed", False, {})
+
+
+def test_pool_window_applies_cwd_and_env_in_typed_command(recorded: list[tuple], tmp_path: Path) -> None:
+    run(RunRequest(workspace=tmp_path, tag="build", cmd=["make", "all"], cwd=Path("/my srv"), env={"CI": "1"}, pool_size=2))
+
+    assert recorded[-1] == ("send-keys", "cd '/my srv' && exec env CI=1 make all")
+
+
+def test_shard_cap_places_window_in_shard_session(
+    recorded: list[tuple], monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    sessions: list[str] = []
+
+    @contextmanager
+    def fake_shard_lock(server, session_name):
+        recorded.append(("lock", session_name))
+        yield
+
+    def fake_new_window(session_name, window_name, server, **options):
+        sessions.append(session_name)
+        return "@9", window_name, "%11"
+
+    monkeypatch.setattr("muxdantic.jobs.shard_lock", fake_shard_lock)
+    monkeypatch.setattr("muxdantic.jobs.ensure_shard", lambda session_name, cap, server: f"{session_name}-jobs-{cap}")
+    monkeypatch.setattr("muxdantic.jobs.new_window", fake_new_window)
+
+    ref = run(RunRequest(workspace=tmp_path, tag="build", cmd=["make"], shard_cap=3))
+
+    assert recorded[0] == ("lock", "dev")
+    assert sessions == ["dev-jobs-3"]
+    assert ref.session_name == "dev-jobs-3"
+
+
+def test_run_unique_returns_running_job_without_new_window(
+    recorded: list[tuple], monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    locks: list[str] = []
+    queries: list[dict] = []
+
+    @contextmanager
+    def fake_unique_lock(server, session_name, key):
+        locks.append(key)
+        yield
+
+    def fake_list_jobs(workspace, server, **filters):
+        queries.append(filters)
+        return [
+            JobInfo(
+                job_id="old123",
+                tag="build",
+                ts_utc="20260211T140000Z",
+                session_name="dev",
+                window_id="@3",
+                window_name="job:build:20260211T140000Z:old123",
+                pane_id="%3",
+                pane_dead=0,
+                state="running",
+            )
+        ]
+
+    monkeypatch.setattr("muxdantic.jobs.unique_lock", fake_unique_lock)
+    monkeypatch.setattr("muxdantic.jobs.list_jobs", fake_list_jobs)
+
+    ref = run(RunRequest(workspace=tmp_path, tag="build", cmd=["make"], unique=True))
+
+    assert (ref.job_id, ref.window_id, ref.deduplicated) == ("old123", "@3", True)
+    assert locks == ["tag=build"]
+    assert queries == [{"tag": "build", "state": "running", "session_name": "dev"}]
+    assert recorded == []
+
+
+def test_run_unique_key_starts_job_and_records_key(
+    recorded: list[tuple], monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    locks: list[str] = []
+    options: dict[str, str] = {}
+
+    @contextmanager
+    def fake_unique_lock(server, session_name, key):
+        locks.append(key)
+        yield
+
+    monkeypatch.setattr("muxdantic.jobs.unique_lock", fake_unique_lock)
+    monkeypatch.setattr("muxdantic.jobs.list_jobs", lambda workspace, server, **filters: [])
+    monkeypatch.setattr(
+        "muxdantic.jobs.set_window_options",
+        lambda window_id, opts, server: options.update(opts),
+    )
+
+    ref = run(RunRequest(workspace=tmp_path, tag="build", cmd=["make"], unique=True, unique_key="deploy-42"))
+
+    assert ref.job_id == "abc123" and not ref.deduplicated
+    assert locks == ["key=deploy-42"]
+    assert options["@mux_key"] == "deploy-42"
+
+
+def _result(**fields) -> JobResult:
+    base = {
+        "job_id": "abc123",
+        "cmd": ["make"],
+        "exit_status": 0,
+        "started_at": "2026-02-11T14:30:12Z",
+        "ended_at": "2026-02-11T14:30:13Z",
+        "wall_time_s": 1.0,
+        "user_cpu_s": 0.5,
+        "sys_cpu_s": 0.1,
+        "max_rss_kb": 1024,
+    }
+    base.update(fields)
+    return JobResult(**base)
+
+
+def test_run_wait_blocks_on_job_channel_and_reports_exit_status(
+    recorded: list[tuple],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    waited: list[tuple] = []
+
+    def fake_wait_job(job_id, server, *, timeout=None):
+        waited.append((job_id, timeout))
+        return _result(exit_status=None, signal=15)
+
+    monkeypatch.setattr("muxdantic.jobs.wait_job", fake_wait_job)
+
+    job_ref = run(RunRequest(workspace=tmp_path, tag="build", cmd=["make"], wait=True, timeout=30))
+
+    assert waited == [("abc123", 30)]
+    assert job_ref.exit_status == 143
+    assert "--notify-channel muxdantic-job-abc123" in recorded[-1][1]
+
+
+def test_run_wait_timeout_carries_job_ref(recorded: list[tuple], monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    def fake_wait_job(job_id, server, *, timeout=None):
+        raise MuxdanticTimeoutError("channel timed out")
+
+    monkeypatch.setattr("muxdantic.jobs.wait_job", fake_wait_job)
+
+    with pytest.raises(MuxdanticTimeoutError, match="waiting for job abc123") as excinfo:
+        run(RunRequest(workspace=tmp_path, tag="build", cmd=["make"], wait=True, timeout=0.5))
+
+    assert excinfo.value.job_ref.job_id == "abc123"
+    assert excinfo.value.exit_code == 124
+
+
+def _pane_row(*, dead: int) -> JobPaneRow:
+    return JobPaneRow("@9", "job:build:20260211T143012Z:abc123", "%11", dead, 2 if dead else None, None, {}, "dev")
+
+
+def test_wait_job_without_signal_ends_when_pane_dies(monkeypatch: pytest.MonkeyPatch) -> None:
+    rows = iter([[_pane_row(dead=0)], [_pane_row(dead=1)]])
+    slices: list[float | None] = []
+
+    def lost_signal(channel, server, *, timeout=None):
+        slices.append(timeout)
+        raise MuxdanticTimeoutError("no signal")
+
+    monkeypatch.setattr("muxdantic.jobs.read_result", lambda job_id: None)
+    monkeypatch.setattr("muxdantic.jobs.wait_for", lost_signal)
+    monkeypatch.setattr("muxdantic.jobs.list_job_panes", lambda session, server, **kw: next(rows))
+
+    assert wait_job("abc123", TmuxServerArgs(), poll_interval=0.01) is None
+    assert slices == [0.01, 0.01]
+
+
+def test_wait_job_ends_when_window_is_gone_and_times_out_otherwise(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("muxdantic.jobs.read_result", lambda job_id: None)
+    monkeypatch.setattr(
+        "muxdantic.jobs.wait_for",
+        lambda channel, server, *, timeout=None: (_ for _ in ()).throw(MuxdanticTimeoutError("no signal")),
+    )
+
+    monkeypatch.setattr("muxdantic.jobs.list_job_panes", lambda session, server, **kw: [])
+    assert wait_job("abc123", TmuxServerArgs(), poll_interval=0.01) is None
+
+    monkeypatch.setattr("muxdantic.jobs.list_job_panes", lambda session, server, **kw: [_pane_row(dead=0)])
+    with pytest.raises(MuxdanticTimeoutError, match="waiting for job abc123"):
+        wait_job("abc123", TmuxServerArgs(), timeout=0.05, poll_interval=0.01)
+
+
+def test_run_unique_wait_on_deduplicated_job_uses_pane_exit_status(
+    recorded: list[tuple], monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    @contextmanager
+    def fake_unique_lock(server, session_name, key):
+        yield
+
+    existing = JobInfo(
+        job_id="abc123",
+        tag="build",
+        ts_utc="20260211T143012Z",
+        session_name="dev",
+        window_id="@9",
+        window_name="job:build:20260211T143012Z:abc123",
+        pane_id="%11",
+        pane_dead=0,
+        state="running",
+    )
+    rows = iter([[_pane_row(dead=1)], [_pane_row(dead=1)]])
+    monkeypatch.setattr("muxdantic.jobs.unique_lock", fake_unique_lock)
+    monkeypatch.setattr("muxdantic.jobs.list_jobs", lambda workspace, server, **filters: [existing])
+    monkeypatch.setattr("muxdantic.jobs.read_result", lambda job_id: None)
+    monkeypatch.setattr(
+        "muxdantic.jobs.wait_for",
+        lambda channel, server, *, timeout=None: (_ for _ in ()).throw(MuxdanticTimeoutError("no signal")),
+    )
+    monkeypatch.setattr("muxdantic.jobs.list_job_panes", lambda session, server, **kw: next(rows))
+
+    ref = run(RunRequest(workspace=tmp_path, tag="build", cmd=["make"], unique=True, wait=True))
+
+    assert (ref.job_id, ref.deduplicated, ref.exit_status) == ("abc123", True, 2)
+    assert recorded == []
+
+
+def test_run_restarts_job_when_cached_session_was_killed(
+    recorded: list[tuple], monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    ensures = iter([False, True])
+    forgotten: list[TmuxServerArgs] = []
+    monkeypatch.setattr(
+        "muxdantic.jobs.ensure",
+        lambda ensure_req: EnsureResult(workspace=tmp_path, session_name="dev", created=next(ensures)),
+    )
+    monkeypatch.setattr("muxdantic.jobs.forget_server", forgotten.append)
+    starts = iter([MuxdanticSubprocessError(program="tmux", args=[], returncode=1, stderr="can't find session"), None])
+
+    def fake_new_job_window(session_name, window_name, server, **kwargs):
+        if (error := next(starts)) is not None:
+            raise error
+        return "@9", "%11"
+
+    monkeypatch.setattr("muxdantic.jobs.new_job_window", fake_new_job_window)
+    req = RunRequest(workspace=tmp_path, tag="build", cmd=["make"], launch="direct", session_cache=True)
+
+    ref = run(req)
+
+    assert ref.window_id == "@9"
+    assert forgotten == [req.server]
+
+
+def test_run_reraises_when_session_was_not_stale(
+    recorded: list[tuple], monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(
+        "muxdantic.jobs.ensure",
+        lambda ensure_req: EnsureResult(workspace=tmp_path, session_name="dev", created=False),
+    )
+    monkeypatch.setattr("muxdantic.jobs.forget_server", lambda server: None)
+    attempts: list[str] = []
+
+    def failing_new_job_window(session_name, window_name, server, **kwargs):
+        attempts.append(window_name)
+        raise MuxdanticSubprocessError(program="tmux", args=[], returncode=1, stderr="create window failed")
+
+    monkeypatch.setattr("muxdantic.jobs.new_job_window", failing_new_job_window)
+
+    with pytest.raises(MuxdanticSubprocessError, match="create window failed"):
+        run(RunRequest(workspace=tmp_path, tag="build", cmd=["make"], launch="direct", session_cache=True))
+    assert len(attempts) == 1
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from muxdantic.errors import MuxdanticUsageError
+from muxdantic.models import JobInfo, JobRef, RunRequest, TmuxServerArgs
+from muxdantic.serverpool import choose_server, gather_jobs, pool_servers, run_in_pool
+
+
+def _job(job_id: str) -> JobInfo:
+    return JobInfo(
+        job_id=job_id,
+        tag="build",
+        ts_utc="20260211T143012Z",
+        session_name="dev",
+        window_id="@9",
+        window_name=f"job:build:20260211T143012Z:{job_id}",
+        pane_id="%11",
+        pane_dead=0,
+        state="running",
+    )
+
+
+def test_pool_servers_derive_socket_names_and_paths() -> None:
+    assert [s.socket_name for s in pool_servers(TmuxServerArgs(socket_name="ci"), 3)] == ["ci-0", "ci-1", "ci-2"]
+    assert [s.socket_name for s in pool_servers(TmuxServerArgs(), 2)] == ["default-0", "default-1"]
+    assert [s.socket_path for s in pool_servers(TmuxServerArgs(socket_path="/run/tmux/ci"), 2)] == [
+        "/run/tmux/ci-0",
+        "/run/tmux/ci-1",
+    ]
+
+
+def test_choose_server_hash_is_stable_per_tag() -> None:
+    servers = pool_servers(TmuxServerArgs(socket_name="ci"), 4)
+
+    def no_loads() -> dict[str, int]:
+        raise AssertionError("hash placement must not query load")
+
+    first = choose_server(servers, placement="hash", tag="Build", loads=no_loads)
+    assert choose_server(servers, placement="hash", tag="build", loads=no_loads) == first
+
+
+def test_choose_server_least_loaded_prefers_lowest_index_on_ties() -> None:
+    servers = pool_servers(TmuxServerArgs(socket_name="ci"), 3)
+
+    chosen = choose_server(servers, placement="least-loaded", tag="x", loads=lambda: {"ci-0": 2, "ci-1": 1})
+
+    assert chosen.socket_name == "ci-2"
+    assert choose_server(servers, placement="least-loaded", tag="x", loads=lambda: {}).socket_name == "ci-0"
+
+
+def test_gather_jobs_skips_stopped_servers_and_labels_jobs(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("muxdantic.serverpool.is_running", lambda server: server.socket_name != "ci-1")
+    servers = pool_servers(TmuxServerArgs(socket_name="ci"), 3)
+    listed: list[str] = []
+
+    def lister(server: TmuxServerArgs) -> list[JobInfo]:
+        listed.append(server.socket_name)
+        return [_job(f"job{server.socket_name[-1]}")]
+
+    jobs, errors = gather_jobs(servers, lister)
+
+    assert sorted(listed) == ["ci-0", "ci-2"]
+    assert [(job.job_id, job.server) for job in jobs] == [("job0", "ci-0"), ("job2", "ci-2")]
+    assert errors == {}
+
+
+def test_gather_jobs_reports_failing_members_without_losing_the_rest(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("muxdantic.serverpool.is_running", lambda server: True)
+    servers = pool_servers(TmuxServerArgs(socket_name="ci"), 3)
+
+    def lister(server: TmuxServerArgs) -> list[JobInfo]:
+        if server.socket_name == "ci-1":
+            raise ConnectionRefusedError("[Errno 111] Connection refused")
+        return [_job(f"job{server.socket_name[-1]}")]
+
+    jobs, errors = gather_jobs(servers, lister)
+
+    assert [(job.job_id, job.server) for job in jobs] == [("job0", "ci-0"), ("job2", "ci-2")]
+    assert errors == {"ci-1": "[Errno 111] Connection refused"}
+
+
+def test_run_in_pool_runs_on_least_loaded_member(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr("muxdantic.serverpool.is_running", lambda server: server.socket_name != "ci-2")
+    queries: list[dict] = []
+
+    def fake_list_jobs(workspace: Path, server: TmuxServerArgs, **filters: object) -> list[JobInfo]:
+        queries.append(filters)
+        # ci-1 only holds exited windows kept by --keep; the state filter leaves it empty.
+        return [_job("a")] if server.socket_name == "ci-0" else []
+
+    monkeypatch.setattr("muxdantic.serverpool.list_jobs", fake_list_jobs)
+    targets: list[TmuxServerArgs] = []
+
+    def fake_run(req: RunRequest) -> JobRef:
+        targets.append(req.server)
+        return JobRef(
+            job_id="abc123",
+            tag=req.tag,
+            ts_utc="20260211T143012Z",
+            session_name="dev",
+            window_id="@9",
+            window_name="job:build:20260211T143012Z:abc123",
+            pane_id="%11",
+        )
+
+    monkeypatch.setattr("muxdantic.serverpool.run", fake_run)
+
+    ref = run_in_pool(
+        RunRequest(workspace=tmp_path, server=TmuxServerArgs(socket_name="ci"), tag="build", cmd=["make"]),
+        2,
+    )
+
+    assert targets == [TmuxServerArgs(socket_name="ci-1")]
+    assert ref.server == "ci-1"
+    assert queries == [{"state": "running"}, {"state": "running"}]
+
+
+def test_run_in_pool_rejects_unique_runs(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr("muxdantic.serverpool.run", lambda req: pytest.fail("must not start a job"))
+    req = RunRequest(workspace=tmp_path, server=TmuxServerArgs(socket_name="ci"), tag="build", cmd=["make"], unique=True)
+
+    with pytest.raises(MuxdanticUsageError, match="--unique"):
+        run_in_pool(req, 3)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from muxdantic import tmux as tmux_module
+from muxdantic.errors import MuxdanticSubprocessError
+from muxdantic.models import TmuxServerArgs
+from muxdantic.jobs import kill, list_jobs
+from muxdantic.session_cache import (
+    forget_on_stale,
+    forget_server,
+    remember_session,
+    session_cache_path,
+    session_cached,
+)
+
+
+def _write_stat(proc_root: Path, pid: int, start: int) -> None:
+    fields = ["S", "1", *["0"] * 17, str(start), "0"]
+    (proc_root / str(pid)).mkdir(parents=True, exist_ok=True)
+    (proc_root / str(pid) / "stat").write_text(f"{pid} (tmux: server) {' '.join(fields)}\n", encoding="utf-8")
+
+
+@pytest.fixture
+def env(tmp_path: Path) -> tuple[TmuxServerArgs, dict[str, Path]]:
+    socket = tmp_path / "sock"
+    socket.write_text("", encoding="utf-8")
+    roots = {"cache_root": tmp_path / "cache", "proc_root": tmp_path / "proc"}
+    _write_stat(roots["proc_root"], 4242, 1000)
+    return TmuxServerArgs(socket_path=str(socket)), roots
+
+
+def test_remembered_sessions_hit_until_the_server_changes(env) -> None:
+    server, roots = env
+
+    assert session_cached(server, "dev", **roots) is False
+    remember_session(server, "dev", 4242, **roots)
+    remember_session(server, "api", 4242, **roots)
+
+    assert session_cached(server, "dev", **roots) is True
+    assert session_cached(server, "api", **roots) is True
+    assert session_cached(server, "web", **roots) is False
+
+    # Same pid reused by a restarted server: the start time no longer matches.
+    _write_stat(roots["proc_root"], 4242, 2000)
+    assert session_cached(server, "dev", **roots) is False
+
+
+def test_new_socket_inode_invalidates(env) -> None:
+    server, roots = env
+    remember_session(server, "dev", 4242, **roots)
+
+    # A restarted server binds a fresh socket file at the same path.
+    replacement = Path(server.socket_path).with_name("new-sock")
+    replacement.write_text("", encoding="utf-8")
+    replacement.replace(server.socket_path)
+
+    assert session_cached(server, "dev", **roots) is False
+
+
+def test_remember_on_new_server_drops_old_sessions(env) -> None:
+    server, roots = env
+    remember_session(server, "dev", 4242, **roots)
+    _write_stat(roots["proc_root"], 5151, 3000)
+
+    remember_session(server, "api", 5151, **roots)
+
+    assert session_cached(server, "api", **roots) is True
+    assert session_cached(server, "dev", **roots) is False
+
+
+def test_forget_server_removes_entry(env) -> None:
+    server, roots = env
+    remember_session(server, "dev", 4242, **roots)
+
+    forget_server(server, cache_root=roots["cache_root"])
+    forget_server(server, cache_root=roots["cache_root"])
+
+    assert not session_cache_path(server, cache_root=roots["cache_root"]).exists()
+    assert session_cached(server, "dev", **roots) is False
+
+
+def test_session_server_pid_checks_session_and_reads_pid_in_one_call(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[list[str]] = []
+
+    def fake_run(program: str, args: list[str], server: TmuxServerArgs) -> str:
+        calls.append(args)
+        if args[2] == "=gone":
+            raise MuxdanticSubprocessError(program=program, args=args, returncode=1, stderr="can't find session: gone")
+        return "4242\n"
+
+    monkeypatch.setattr(tmux_module, "_run_program", fake_run)
+    server = TmuxServerArgs(socket_name="dev")
+
+    assert tmux_module.session_server_pid("dev", server) == 4242
+    assert tmux_module.session_server_pid("gone", server) is None
+    assert calls[0] == ["has-session", "-t", "=dev", ";", "display-message", "-p", "#{pid}"]
+
+
+def test_forget_on_stale_only_drops_entry_for_gone_server_or_session(env) -> None:
+    server, roots = env
+    remember_session(server, "dev", 4242, **roots)
+
+    with pytest.raises(MuxdanticSubprocessError):
+        with forget_on_stale(server, cache_root=roots["cache_root"]):
+            raise MuxdanticSubprocessError(program="tmux", args=[], returncode=1, stderr="can't find pane: %3")
+    assert session_cached(server, "dev", **roots) is True
+
+    with pytest.raises(MuxdanticSubprocessError):
+        with forget_on_stale(server, cache_root=roots["cache_root"]):
+            raise MuxdanticSubprocessError(program="tmux", args=[], returncode=1, stderr="can't find session: dev")
+    assert session_cached(server, "dev", **roots) is False
+
+
+def test_list_jobs_and_kill_forget_server_that_went_away(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    forgotten: list[TmuxServerArgs] = []
+    server = TmuxServerArgs(socket_name="dev")
+
+    def no_server(*args: object, **kwargs: object) -> list:
+        raise MuxdanticSubprocessError(
+            program="tmux", args=["list-panes"], returncode=1, stderr="no server running on /tmp/tmux-0/dev"
+        )
+
+    monkeypatch.setattr("muxdantic.jobs.list_job_panes", no_server)
+    monkeypatch.setattr("muxdantic.session_cache.forget_server", lambda server, cache_root=None: forgotten.append(server))
+
+    with pytest.raises(MuxdanticSubprocessError):
+        list_jobs(tmp_path, server, session_name="app")
+    with pytest.raises(MuxdanticSubprocessError):
+        kill(tmp_path, server, job_id=None, tag=None, all_jobs=True, session_name="app")
+
+    assert forgotten == [server, server]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pytest
+
+from muxdantic.errors import MuxdanticSubprocessError
+from muxdantic.models import TmuxServerArgs
+from muxdantic.shards import ensure_shard, shard_index, shard_window_counts
+
+
+@pytest.fixture
+def shard_tmux(monkeypatch: pytest.MonkeyPatch) -> dict[str, list]:
+    state: dict[str, list] = {"windows": [], "events": []}
+
+    def fake_list_all_windows(server: TmuxServerArgs, *, filter_expr: str | None = None):
+        state["events"].append(("list-windows", filter_expr))
+        return state["windows"]
+
+    monkeypatch.setattr("muxdantic.shards.list_all_windows", fake_list_all_windows)
+    monkeypatch.setattr("muxdantic.shards.session_path", lambda name, server: "/work")
+    monkeypatch.setattr(
+        "muxdantic.shards.new_session",
+        lambda name, window_name, server, *, start_directory: state["events"].append(
+            ("new-session", name, window_name, start_directory)
+        ),
+    )
+    return state
+
+
+def test_shard_index_only_matches_own_shards() -> None:
+    assert shard_index("dev-jobs-3", "dev") == 3
+    assert shard_index("dev-jobs-x", "dev") is None
+    assert shard_index("devel-jobs-1", "dev") is None
+    assert shard_index("dev", "dev") is None
+
+
+def test_ensure_shard_creates_first_shard_lazily(shard_tmux: dict[str, list]) -> None:
+    assert ensure_shard("dev", 2, TmuxServerArgs()) == "dev-jobs-0"
+    assert shard_tmux["events"] == [
+        ("list-windows", "#{m:dev-jobs-*,#{session_name}}"),
+        ("new-session", "dev-jobs-0", "shard", "/work"),
+    ]
+
+
+def test_ensure_shard_fills_lowest_shard_then_rolls_over(shard_tmux: dict[str, list]) -> None:
+    shard_tmux["windows"] = [
+        ("dev-jobs-0", "@1", "shard"),
+        ("dev-jobs-0", "@2", "job:build:20260211T143012Z:aaa"),
+        ("dev-jobs-0", "@3", "job:build:20260211T143013Z:bbb"),
+        ("dev-jobs-1", "@4", "shard"),
+        ("dev-jobs-1", "@5", "job:build:20260211T143014Z:ccc"),
+    ]
+    assert ensure_shard("dev", 2, TmuxServerArgs()) == "dev-jobs-1"
+
+    shard_tmux["windows"].append(("dev-jobs-1", "@6", "job:build:20260211T143015Z:ddd"))
+    assert ensure_shard("dev", 2, TmuxServerArgs()) == "dev-jobs-2"
+    assert shard_tmux["events"][-1] == ("new-session", "dev-jobs-2", "shard", "/work")
+
+
+def test_shard_window_counts_falls_back_without_filter_support(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str | None] = []
+
+    def fake_list_all_windows(server: TmuxServerArgs, *, filter_expr: str | None = None):
+        calls.append(filter_expr)
+        if filter_expr is not None:
+            raise MuxdanticSubprocessError(
+                program="tmux", args=["list-windows"], returncode=1, stderr="list-windows: unknown option -- f\n"
+            )
+        return [("dev", "@1", "main"), ("dev-jobs-0", "@2", "shard"), ("dev-jobs-0", "@3", "job:a:20260211T143012Z:a")]
+
+    monkeypatch.setattr("muxdantic.shards.list_all_windows", fake_list_all_windows)
+
+    assert shard_window_counts("dev", TmuxServerArgs()) == {0: 1}
+    assert calls[1] is None
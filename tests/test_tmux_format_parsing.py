@@ -4,15 +4,24 @@ import subprocess
 
 import pytest
 
-from muxdantic.errors import MuxdanticSubprocessError
+from muxdantic.errors import MuxdanticSubprocessError, MuxdanticTimeoutError
 from muxdantic.models import TmuxServerArgs
-from muxdantic.tmux import list_panes, list_windows, tmux, tmuxp
+from muxdantic.tmux import (
+    list_job_panes,
+    list_panes,
+    list_windows,
+    new_job_window,
+    set_window_options,
+    tmux,
+    tmuxp,
+    wait_for,
+)
 
 
 def test_tmux_applies_server_args(monkeypatch: pytest.MonkeyPatch) -> None:
     seen: dict[str, list[str]] = {}
 
-    def fake_run(cmd: list[str], *, capture_output: bool, text: bool) -> subprocess.CompletedProcess[str]:
+    def fake_run(cmd: list[str], *, capture_output: bool, text: bool, timeout: float | None = None) -> subprocess.CompletedProcess[str]:
         seen["cmd"] = cmd
         assert capture_output is True
         assert text is True
@@ -28,7 +37,7 @@ def test_tmux_applies_server_args(monkeypatch: pytest.MonkeyPatch) -> None:
 def test_tmuxp_load_passes_server_args_through(monkeypatch: pytest.MonkeyPatch) -> None:
     seen: dict[str, list[str]] = {}
 
-    def fake_run(cmd: list[str], *, capture_output: bool, text: bool) -> subprocess.CompletedProcess[str]:
+    def fake_run(cmd: list[str], *, capture_output: bool, text: bool, timeout: float | None = None) -> subprocess.CompletedProcess[str]:
         seen["cmd"] = cmd
         assert capture_output is True
         assert text is True
@@ -62,7 +71,7 @@ def test_tmuxp_rejects_empty_args() -> None:
         tmuxp([], TmuxServerArgs())
 
 def test_tmuxp_nonzero_raises_subprocess_error(monkeypatch: pytest.MonkeyPatch) -> None:
-    def fake_run(cmd: list[str], *, capture_output: bool, text: bool) -> subprocess.CompletedProcess[str]:
+    def fake_run(cmd: list[str], *, capture_output: bool, text: bool, timeout: float | None = None) -> subprocess.CompletedProcess[str]:
         return subprocess.CompletedProcess(cmd, 1, stdout="", stderr="bad things")
 
     monkeypatch.setattr(subprocess, "run", fake_run)
@@ -72,7 +81,7 @@ def test_tmuxp_nonzero_raises_subprocess_error(monkeypatch: pytest.MonkeyPatch)
 
 
 def test_list_windows_parses_tab_output(monkeypatch: pytest.MonkeyPatch) -> None:
-    def fake_run(cmd: list[str], *, capture_output: bool, text: bool) -> subprocess.CompletedProcess[str]:
+    def fake_run(cmd: list[str], *, capture_output: bool, text: bool, timeout: float | None = None) -> subprocess.CompletedProcess[str]:
         return subprocess.CompletedProcess(cmd, 0, stdout="@1\tdev\n@2\tjob:build\n", stderr="")
 
     monkeypatch.setattr(subprocess, "run", fake_run)
@@ -82,10 +91,117 @@ def test_list_windows_parses_tab_output(monkeypatch: pytest.MonkeyPatch) -> None
 
 
 def test_list_panes_parses_optional_int_fields(monkeypatch: pytest.MonkeyPatch) -> None:
-    def fake_run(cmd: list[str], *, capture_output: bool, text: bool) -> subprocess.CompletedProcess[str]:
+    def fake_run(cmd: list[str], *, capture_output: bool, text: bool, timeout: float | None = None) -> subprocess.CompletedProcess[str]:
         return subprocess.CompletedProcess(cmd, 0, stdout="%9\t0\t\t\n%10\t1\t23\t1700000000\n", stderr="")
 
     monkeypatch.setattr(subprocess, "run", fake_run)
 
     panes = list_panes("@2", TmuxServerArgs())
     assert panes == [("%9", 0, None, None), ("%10", 1, 23, 1700000000)]
+
+
+def test_wait_for_maps_subprocess_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen: list[tuple[list[str], float]] = []
+
+    def fake_run(cmd: list[str], *, capture_output: bool, text: bool, timeout: float) -> subprocess.CompletedProcess[str]:
+        seen.append((cmd, timeout))
+        raise subprocess.TimeoutExpired(cmd, timeout)
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    with pytest.raises(MuxdanticTimeoutError, match="muxdantic-job-abc"):
+        wait_for("muxdantic-job-abc", TmuxServerArgs(socket_name="mx"), timeout=2.5)
+
+    assert seen == [(["tmux", "-L", "mx", "wait-for", "muxdantic-job-abc"], 2.5)]
+
+
+def test_set_window_options_chains_one_invocation(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen: list[list[str]] = []
+
+    def fake_run(cmd: list[str], *, capture_output: bool, text: bool, timeout: float | None = None) -> subprocess.CompletedProcess[str]:
+        seen.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    set_window_options("@9", {"remain-on-exit": "failed", "@mux_job_id": "abc123"}, TmuxServerArgs())
+
+    assert seen == [
+        ["tmux"]
+        + ["set-option", "-w", "-t", "@9", "remain-on-exit", "failed"]
+        + [";"]
+        + ["set-option", "-w", "-t", "@9", "@mux_job_id", "abc123"]
+    ]
+
+
+def test_new_job_window_configures_window_in_same_invocation(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen: list[list[str]] = []
+
+    def fake_run(cmd: list[str], *, capture_output: bool, text: bool, timeout: float | None = None) -> subprocess.CompletedProcess[str]:
+        seen.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout="@9\t%11\n", stderr="")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr("muxdantic.tmux.uuid4", lambda: type("U", (), {"hex": "tmp"})())
+
+    ids = new_job_window(
+        "dev",
+        "job:a.b:20260211T143012Z:abc123",
+        TmuxServerArgs(),
+        command=["sh", "-c", "echo hi;"],
+        options={"remain-on-exit": "failed"},
+        pipe_command="sink",
+    )
+
+    assert ids == ("@9", "%11")
+    assert seen == [
+        ["tmux"]
+        + ["new-window", "-d", "-P", "-F", "#{window_id}\t#{pane_id}", "-t", "dev", "-n", "mux-tmp"]
+        + ["--", "sh", "-c", "echo hi\\;", ";"]
+        + ["set-option", "-w", "-t", "dev:=mux-tmp", "remain-on-exit", "failed", ";"]
+        + ["pipe-pane", "-o", "-t", "dev:=mux-tmp", "sink", ";"]
+        + ["rename-window", "-t", "dev:=mux-tmp", "job:a.b:20260211T143012Z:abc123"]
+    ]
+
+    new_job_window(
+        "dev", "job", TmuxServerArgs(), command=["my tool"], options={}, start_directory="/srv", environment={"A": "1"}
+    )
+    # A lone argument is run by tmux through ``sh -c`` and must stay a single word.
+    assert seen[1][seen[1].index("mux-tmp") + 1 :] == ["-c", "/srv", "-e", "A=1", "--", "'my tool'", ";"] + [
+        "rename-window",
+        "-t",
+        "dev:=mux-tmp",
+        "job",
+    ]
+
+
+def test_list_job_panes_parses_user_options(monkeypatch: pytest.MonkeyPatch) -> None:
+    row = "\t".join(["@9", "job:build:20260211T143012Z:abc123", "%11", "1", "2", "1700000000", "dev", "4242"])
+    options = "\t".join(["abc123", "build", "20260211T143012Z", "", '["make"]', "/srv", "ci", ""])
+
+    def fake_run(cmd: list[str], *, capture_output: bool, text: bool, timeout: float | None = None) -> subprocess.CompletedProcess[str]:
+        assert cmd[:5] == ["tmux", "list-panes", "-s", "-t", "dev"]
+        assert "#{@mux_cmd}" in cmd[-1]
+        return subprocess.CompletedProcess(cmd, 0, stdout=f"{row}\t{options}\n", stderr="")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    [pane] = list_job_panes("dev", TmuxServerArgs())
+
+    assert (pane.window_id, pane.pane_id, pane.pane_dead, pane.pane_dead_status) == ("@9", "%11", 1, 2)
+    assert (pane.session_name, pane.pane_pid) == ("dev", 4242)
+    assert pane.options["@mux_log"] == ""
+    assert pane.options["@mux_requester"] == "ci"
+
+
+def test_list_job_panes_passes_filter(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen: list[list[str]] = []
+
+    def fake_run(cmd: list[str], *, capture_output: bool, text: bool, timeout: float | None = None) -> subprocess.CompletedProcess[str]:
+        seen.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    assert list_job_panes("dev", TmuxServerArgs(), filter_expr="#{==:#{pane_dead},0}") == []
+    assert seen[0][-2:] == ["-f", "#{==:#{pane_dead},0}"]
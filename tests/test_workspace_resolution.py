@@ -6,7 +6,7 @@ from pathlib import Path
 import pytest
 
 from muxdantic.errors import MuxdanticUsageError
-from muxdantic.workspace import extract_session_name, load_tmuxp_config, resolve_workspace
+from muxdantic.workspace import expand_workspaces, extract_session_name, load_tmuxp_config, resolve_workspace
 
 
 def test_resolve_workspace_directory_none_found(tmp_path: Path) -> None:
@@ -47,3 +47,15 @@ def test_extract_session_name_tolerates_session_alias() -> None:
 
     with pytest.raises(MuxdanticUsageError, match="session_name"):
         extract_session_name({})
+
+
+def test_expand_workspaces_globs_directories_and_dedupes(tmp_path: Path) -> None:
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "notes.txt").write_text("x", encoding="utf-8")
+
+    expanded = expand_workspaces([str(tmp_path / "b"), str(tmp_path / "*")])
+
+    assert expanded == [tmp_path / "b", tmp_path / "a"]
+    with pytest.raises(MuxdanticUsageError, match="No workspaces match"):
+        expand_workspaces([str(tmp_path / "missing-*")])